@@ -1,6 +1,8 @@
 import pygame
 import math
-from PIL import Image
+from lazy_animations import PREFETCH_ATTACK, is_ready, lazy_gif_frames
+from render_scale import canvas_draw
+from sprite_keying import KEY_ATTACK
 import os
 
 class AdanAttack:
@@ -43,56 +45,26 @@ class AdanAttack:
             try:
                 print(f"📥 Cargando ataque {direction} desde archivo local...")
                 
-                # Cargar el GIF desde archivo local
-                gif = Image.open(url)
-                frames = []
-                
-                # Extraer todos los frames del GIF
+                # Extraer todos los frames del GIF (compartidos si ya se cargaron antes)
                 try:
-                    frame_count = getattr(gif, 'n_frames', 1)  # Usar getattr para evitar error
-                    for frame_num in range(frame_count):
-                        gif.seek(frame_num)
-                        frame = gif.copy().convert("RGBA")
-                        
-                        # Procesar cada pixel para eliminar fondos blancos/grises
-                        pixels = frame.load()
-                        if pixels:  # Verificar que pixels no sea None
-                            for y in range(frame.height):
-                                for x in range(frame.width):
-                                    try:
-                                        r, g, b, a = pixels[x, y]
-                                        # Eliminar fondos blancos, grises claros y similares
-                                        if r > 200 and g > 200 and b > 200:
-                                            pixels[x, y] = (r, g, b, 0)  # Hacer transparente
-                                        elif abs(r - g) < 30 and abs(r - b) < 30 and abs(g - b) < 30 and r > 180:
-                                            pixels[x, y] = (r, g, b, 0)  # Eliminar grises claros
-                                    except (IndexError, TypeError):
-                                        continue  # Ignorar errores de píxeles
-                        
-                        # Convertir PIL image a superficie de Pygame
-                        frame_data = frame.tobytes()
-                        pygame_surface = pygame.image.fromstring(frame_data, frame.size, "RGBA")
-                        
-                        # Aplicar transparencia adicional y suavizado
-                        pygame_surface = pygame_surface.convert_alpha()
-                        pygame_surface.set_colorkey((255, 255, 255))
-                        
-                        # Escalar 56% más grande (30% + 20% adicional)
-                        original_size = pygame_surface.get_size()
-                        new_size = (int(original_size[0] * 1.56), int(original_size[1] * 1.56))
-                        pygame_surface = pygame.transform.scale(pygame_surface, new_size)
-                        
-                        frames.append(pygame_surface)
+                    # Eliminar fondos blancos y grises claros, escalar 56% más grande (30% + 20% adicional)
+                    # Se decodifica en segundo plano; si se usa antes, se completa en ese momento
+                    frames = lazy_gif_frames(url, rule=KEY_ATTACK, scale=1.56, colorkey=(255, 255, 255),
+                                             priority=PREFETCH_ATTACK)
                         
                 except (AttributeError, OSError, Exception) as e:
                     print(f"⚠️ Error procesando frames: {e}")
                     # Crear frame de respaldo
+                    frames = []
                     backup_surface = pygame.Surface((100, 100), pygame.SRCALPHA)
                     backup_surface.fill((0, 255, 255, 128))  # Cian semitransparente
                     frames.append(backup_surface)
                 
                 self.attack_animations[direction] = frames
-                print(f"✅ Cargada animación de ataque '{direction}': {len(frames)} frames")
+                if is_ready(frames):
+                    print(f"✅ Cargada animación de ataque '{direction}': {len(frames)} frames")
+                else:
+                    print(f"⏳ Animación de ataque '{direction}' diferida (prefetch en segundo plano)")
                 
             except Exception as e:
                 print(f"❌ Error cargando ataque {direction}: {e}")
@@ -265,19 +237,19 @@ class AdanAttack:
         print(f"🏹 Adán lanzó proyectil")
         return True
     
-    def update(self, enemies):
+    def update(self, enemies, collision_manager=None):
         current_time = pygame.time.get_ticks()
         dt = 1/60
         
         # Actualizar animación de ataque
         self.update_attack_animation()
         
+        # Mover todos los proyectiles en una sola pasada contra el mapa
+        self.move_projectiles(dt, collision_manager)
+        
         for projectile in self.projectiles[:]:
             if not projectile['active']:
                 continue
-                
-            projectile['x'] += projectile['dx'] * projectile['speed'] * dt
-            projectile['y'] += projectile['dy'] * projectile['speed'] * dt
             
             projectile_rect = pygame.Rect(projectile['x'] - 5, projectile['y'] - 5, 10, 10)
             for enemy in enemies:
@@ -298,6 +270,27 @@ class AdanAttack:
         self.melee_attacks = [attack for attack in self.melee_attacks 
                             if current_time - attack['start_time'] < attack['duration']]
     
+    def move_projectiles(self, dt, collision_manager=None):
+        """Mueve los proyectiles activos; los que chocan con una pared se desactivan"""
+        active = [p for p in self.projectiles if p['active']]
+        if not active:
+            return
+        velocities = [(p['dx'] * p['speed'] * dt, p['dy'] * p['speed'] * dt) for p in active]
+        
+        if collision_manager is None:
+            for projectile, (vx, vy) in zip(active, velocities):
+                projectile['x'] += vx
+                projectile['y'] += vy
+            return
+        
+        # Rectángulo de 10x10 centrado en el proyectil
+        positions = [(p['x'] - 5, p['y'] - 5) for p in active]
+        resolved, hits = collision_manager.move_aabbs(positions, (10, 10), velocities)
+        for projectile, (x, y), (hit_x, hit_y) in zip(active, resolved, hits):
+            projectile['x'], projectile['y'] = float(x) + 5, float(y) + 5
+            if hit_x or hit_y:
+                projectile['active'] = False
+    
     def draw(self, screen, camera_x, camera_y):
         current_time = pygame.time.get_ticks()
         
@@ -321,8 +314,8 @@ class AdanAttack:
                 x = int(projectile['x'] - camera_x)
                 y = int(projectile['y'] - camera_y)
                 # Efecto de brillo para proyectiles
-                pygame.draw.circle(screen, (255, 150, 100), (x, y), 7)
-                pygame.draw.circle(screen, (255, 200, 150), (x, y), 5)
-                pygame.draw.circle(screen, (255, 255, 200), (x, y), 3)
+                canvas_draw.circle(screen, (255, 150, 100), (x, y), 7)
+                canvas_draw.circle(screen, (255, 200, 150), (x, y), 5)
+                canvas_draw.circle(screen, (255, 255, 200), (x, y), 3)
         
         # Efectos de ataque cuerpo a cuerpo eliminados para mejor visibilidad
\ No newline at end of file
@@ -0,0 +1,293 @@
+#!/usr/bin/env python3
+"""
+ASSET BUNDLE - La Tierra de las Manzanas
+Paquete de assets compilado de antemano para que el arranque no decodifique
+ninguna imagen:
+- Animaciones ya recortadas, escaladas y volteadas (los mismos parámetros que
+  piden los cargadores), empaquetadas en páginas de atlas por animación
+- Imágenes (fondos, objetos) en formato BGRA, el de la pantalla en escritorio
+- Manifiesto JSON con el hash de contenido de cada archivo de origen y la
+  tabla de frames (página, x, y, ancho, alto)
+- En el juego el paquete se abre con mmap y las superficies se crean
+  directamente sobre los búferes mapeados (sin copiar ni decodificar). El
+  mapa es copy-on-write: una superficie que se modifica copia solo las
+  páginas que toca y nunca escribe en el archivo
+Si un archivo de origen cambió, sus entradas se ignoran y se usa la carga
+normal (caché en disco o decodificación) hasta volver a compilar.
+
+Uso:
+    python asset_bundle.py compilar [destino]
+    python asset_bundle.py info [paquete]
+"""
+
+import glob
+import hashlib
+import json
+import mmap
+import os
+import struct
+import sys
+import time
+import pygame
+from typing import Dict, List, Optional, Tuple
+from config import *
+
+BUNDLE_MAGIC = b"MZAB"
+BUNDLE_VERSION = 1
+BUNDLE_HEADER = struct.Struct("<4sHI")  # magic, versión, largo del manifiesto
+BUNDLE_ALIGN = 16  # Alineación de cada página dentro del paquete
+PIXEL_FORMAT = "BGRA"
+
+
+def bundle_key(key: Tuple) -> str:
+    """Clave de una animación en el manifiesto (la de la caché de sprites, como texto)"""
+    return repr(key)
+
+
+def file_digest(path: str) -> str:
+    """Hash del contenido de un archivo"""
+    with open(path, "rb") as f:
+        return hashlib.sha1(f.read()).hexdigest()
+
+
+def _aligned(offset: int) -> int:
+    return (offset + BUNDLE_ALIGN - 1) // BUNDLE_ALIGN * BUNDLE_ALIGN
+
+
+class AssetBundle:
+    """Paquete de assets abierto con mmap"""
+
+    def __init__(self, path: str = ASSET_BUNDLE_PATH):
+        """
+        Abre el paquete y lee su manifiesto.
+
+        Raises:
+            OSError, ValueError: si el archivo no existe o no es un paquete válido
+        """
+        self.path = path
+        self._file = open(path, "rb")
+        try:
+            # ACCESS_COPY y no ACCESS_READ: escribir en una superficie de solo lectura mata el proceso (SIGSEGV)
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_COPY)
+            magic, version, manifest_length = BUNDLE_HEADER.unpack_from(self._map, 0)
+            if magic != BUNDLE_MAGIC or version != BUNDLE_VERSION:
+                raise ValueError("paquete de otra versión")
+            manifest_end = BUNDLE_HEADER.size + manifest_length
+            self.manifest = json.loads(self._map[BUNDLE_HEADER.size:manifest_end].decode("utf-8"))
+        except Exception:
+            self._file.close()
+            raise
+        self._view = memoryview(self._map)
+        self._data_start = _aligned(manifest_end)
+        self._pages: Dict[Tuple[int, int, int], pygame.Surface] = {}
+        self._fresh: Dict[str, bool] = {}
+        self.hits = 0
+        self.stale = 0
+
+    def _is_fresh(self, source_path: str) -> bool:
+        """Indica si el archivo de origen sigue igual que al compilar"""
+        fresh = self._fresh.get(source_path)
+        if fresh is None:
+            info = self.manifest["sources"].get(source_path)
+            try:
+                stat = os.stat(source_path)
+                # Validación rápida por fecha y tamaño; si no coinciden se compara el contenido
+                fresh = info is not None and (
+                    (stat.st_mtime_ns, stat.st_size) == (info["mtime_ns"], info["size"]) or
+                    file_digest(source_path) == info["sha1"])
+            except OSError:
+                fresh = False
+            if not fresh:
+                print(f"⚠️ {source_path} cambió desde la compilación del paquete, se carga normalmente")
+            self._fresh[source_path] = fresh
+        return fresh
+
+    def _page(self, offset: int, width: int, height: int) -> pygame.Surface:
+        """Superficie creada sobre la región mapeada (sin copiar)"""
+        key = (offset, width, height)
+        page = self._pages.get(key)
+        if page is None:
+            start = self._data_start + offset
+            page = pygame.image.frombuffer(self._view[start:start + width * height * 4], (width, height),
+                                           PIXEL_FORMAT)
+            self._pages[key] = page
+        return page
+
+    def frames(self, key: Tuple, source_path: str) -> Optional[List[pygame.Surface]]:
+        """
+        Frames ya procesados de una animación.
+
+        Args:
+            key: Clave de la caché de sprites (FrameRequest.key)
+            source_path: GIF de origen
+
+        Returns:
+            Lista de subsuperficies de las páginas mapeadas, o None si no está o cambió el origen
+        """
+        entry = self.manifest["animations"].get(bundle_key(key))
+        if entry is None:
+            return None
+        if not self._is_fresh(source_path):
+            self.stale += 1
+            return None
+        pages = [self._page(*page) for page in entry["pages"]]
+        colorkey = tuple(entry["colorkey"]) if entry["colorkey"] else None
+        frames = []
+        for page_index, x, y, width, height in entry["frames"]:
+            frame = pages[page_index].subsurface((x, y, width, height))
+            if colorkey:
+                frame.set_colorkey(colorkey)
+            frames.append(frame)
+        self.hits += 1
+        return frames
+
+    def image(self, source_path: str) -> Optional[pygame.Surface]:
+        """
+        Imagen completa (fondo, objeto) lista para dibujar.
+
+        Returns:
+            Superficie, o None si no está en el paquete o cambió el origen
+        """
+        entry = self.manifest["images"].get(source_path)
+        if entry is None or not self._is_fresh(source_path):
+            return None
+        surface = self._page(*entry["page"])
+        if entry["opaque"] and pygame.display.get_surface() is not None:
+            # Mismo formato que la pantalla: convert es una copia directa, sin alfa por píxel
+            surface = surface.convert()
+        self.hits += 1
+        return surface
+
+    def describe(self) -> str:
+        """Resumen para la consola"""
+        return (f"📦 Paquete de assets {self.path}: {len(self.manifest['animations'])} animaciones, "
+                f"{len(self.manifest['images'])} imágenes, {len(self._map) / (1024 * 1024):.1f} MB")
+
+
+def compile_bundle(destination: str = ASSET_BUNDLE_PATH) -> None:
+    """Decodifica todos los assets y escribe el paquete de forma atómica"""
+    # Importación local: el paquete se lee desde sprite_cache, que no debe depender de esto
+    from asset_preloader import level_2_requests
+    from sprite_atlas import layout_frames
+    from sprite_cache import decode_gif_frames
+
+    start = time.perf_counter()
+    sources: Dict[str, Dict] = {}
+    animations: Dict[str, Dict] = {}
+    images: Dict[str, Dict] = {}
+    blobs: List[bytes] = []
+    offset = 0
+
+    def add_source(path: str) -> None:
+        stat = os.stat(path)
+        sources[path] = {"sha1": file_digest(path), "mtime_ns": stat.st_mtime_ns, "size": stat.st_size}
+
+    def add_page(surface: pygame.Surface) -> List[int]:
+        nonlocal offset
+        data = pygame.image.tobytes(surface, PIXEL_FORMAT)
+        padding = _aligned(len(data)) - len(data)
+        blobs.append(data + b"\0" * padding)
+        page = [offset, surface.get_width(), surface.get_height()]
+        offset += len(data) + padding
+        return page
+
+    # Animaciones: las mismas que piden los cargadores de ambos niveles
+    for request in level_2_requests(lazy=False):
+        if not os.path.exists(request.path):
+            print(f"⚠️ No existe {request.path}, se omite")
+            continue
+        frames = decode_gif_frames(*request)
+        positions, page_sizes = layout_frames([frame.get_size() for frame in frames])
+        pages = []
+        for width, height in page_sizes:
+            page = pygame.Surface((max(1, width), max(1, height)), pygame.SRCALPHA)
+            page.fill((0, 0, 0, 0))
+            pages.append(page)
+        table = []
+        for frame, (page_index, x, y) in zip(frames, positions):
+            # Sin colorkey para copiar todos los píxeles tal cual (se vuelve a aplicar al cargar)
+            colorkey = frame.get_colorkey()
+            frame.set_colorkey(None)
+            pages[page_index].blit(frame, (x, y), special_flags=pygame.BLEND_RGBA_MAX)
+            frame.set_colorkey(colorkey)
+            table.append([page_index, x, y, *frame.get_size()])
+        animations[bundle_key(request.key)] = {
+            "source": request.path,
+            "pages": [add_page(page) for page in pages],
+            "frames": table,
+            "colorkey": list(request.colorkey) if request.colorkey else None,
+        }
+        add_source(request.path)
+        print(f"🎞️ {request.path} ({len(frames)} frames)")
+
+    # Imágenes sueltas (fondos, objetos)
+    for path in sorted(glob.glob("assets/**/*.png", recursive=True)):
+        path = path.replace("\\", "/")
+        try:
+            surface = pygame.image.load(path)
+        except pygame.error as e:
+            print(f"⚠️ No se pudo leer {path}: {e}")
+            continue
+        # Opaca si no tiene alfa o si todos sus píxeles son totalmente opacos
+        width, height = surface.get_size()
+        opaque = surface.get_colorkey() is None and (
+            not surface.get_flags() & pygame.SRCALPHA or
+            pygame.mask.from_surface(surface, 254).count() == width * height)
+        images[path] = {"page": add_page(surface), "opaque": opaque}
+        add_source(path)
+        print(f"🖼️ {path} ({surface.get_width()}x{surface.get_height()})")
+
+    manifest = json.dumps({"version": BUNDLE_VERSION, "pixel_format": PIXEL_FORMAT, "sources": sources,
+                           "animations": animations, "images": images}).encode("utf-8")
+    header = BUNDLE_HEADER.pack(BUNDLE_MAGIC, BUNDLE_VERSION, len(manifest))
+    padding = _aligned(len(header) + len(manifest)) - len(header) - len(manifest)
+
+    os.makedirs(os.path.dirname(destination) or ".", exist_ok=True)
+    temp_path = destination + ".tmp"
+    with open(temp_path, "wb") as f:
+        f.write(header + manifest + b"\0" * padding)
+        for blob in blobs:
+            f.write(blob)
+    os.replace(temp_path, destination)
+
+    elapsed = (time.perf_counter() - start) * 1000
+    size_mb = os.path.getsize(destination) / (1024 * 1024)
+    print(f"✅ Paquete {destination}: {len(animations)} animaciones, {len(images)} imágenes, "
+          f"{size_mb:.1f} MB en {elapsed:.0f} ms")
+
+
+# Instancia global del paquete
+_asset_bundle = None
+_asset_bundle_checked = False
+
+def get_asset_bundle() -> Optional[AssetBundle]:
+    """Obtiene el paquete de assets (None si está desactivado, no se compiló o es inválido)"""
+    global _asset_bundle, _asset_bundle_checked
+    if not ASSET_BUNDLE or _asset_bundle_checked:
+        return _asset_bundle
+    _asset_bundle_checked = True
+    if os.path.exists(ASSET_BUNDLE_PATH):
+        try:
+            _asset_bundle = AssetBundle(ASSET_BUNDLE_PATH)
+            print(_asset_bundle.describe())
+        except (OSError, ValueError, struct.error) as e:
+            print(f"⚠️ Paquete de assets inválido, se usa la carga normal: {e}")
+    return _asset_bundle
+
+
+def main(argv: List[str]) -> None:
+    if argv and argv[0] == "compilar":
+        pygame.init()
+        pygame.display.set_mode((1, 1), pygame.HIDDEN)
+        compile_bundle(argv[1] if len(argv) > 1 else ASSET_BUNDLE_PATH)
+    elif argv and argv[0] == "info":
+        bundle = AssetBundle(argv[1] if len(argv) > 1 else ASSET_BUNDLE_PATH)
+        print(bundle.describe())
+        for path, info in sorted(bundle.manifest["sources"].items()):
+            print(f"   {info['sha1'][:12]} {path}")
+    else:
+        print(__doc__)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+ASSET PRELOADER - La Tierra de las Manzanas
+Precarga en paralelo las animaciones de un nivel antes de crear los personajes:
+- Las animaciones ya en memoria, en el paquete de assets o en la caché en
+  disco se resuelven al instante
+- El resto se decodifica (PIL + recorte) en un grupo de hilos; cada GIF se
+  decodifica una vez aunque se pida con distintas escalas o volteos
+- Las superficies se crean en el hilo principal con los búferes terminados
+- Cada animación terminada es una unidad de trabajo que se informa a la
+  pantalla de carga, así el progreso refleja el trabajo real
+Después los cargadores de siempre (CharacterBase, ataques, gusanos, chamán)
+encuentran sus frames en la caché de sprites y no decodifican nada.
+Con LAZY_ANIMATIONS solo se precarga lo que se ve en el primer frame; el
+resto lo decodifica el prefetch en segundo plano (lazy_animations).
+"""
+
+import os
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Callable, Dict, List, Optional, Tuple
+from config import *
+from sprite_cache import (FrameRequest, cached_gif_frames, decode_gif_buffers, get_sprite_cache,
+                          store_gif_frames, surfaces_from_buffers)
+from sprite_keying import KEY_ATTACK, KEY_CHAMAN, KEY_CHARACTER
+
+DIRECTIONS = ("up", "down", "left", "right")
+
+# Mismos parámetros que usa cada cargador al llamar a load_gif_frames
+WHITE = (255, 255, 255)
+CHARACTER_COLORKEY = (253, 253, 253)
+WORM_GIF = "assets/enemies/worm/worm gif.gif"
+
+
+def hero_requests(name: str, directions=DIRECTIONS, attacks: bool = True) -> List[FrameRequest]:
+    """Movimiento (CharacterBase) y ataques (JuanAttack/AdanAttack) de un héroe"""
+    base = f"assets/characters/{name}"
+    requests = [FrameRequest(f"{base}/animations/{d}.gif", KEY_CHARACTER, colorkey=CHARACTER_COLORKEY)
+                for d in directions]
+    if attacks:
+        requests += [FrameRequest(f"{base}/attacks/{d}.gif", KEY_ATTACK, scale=1.56, colorkey=WHITE)
+                     for d in DIRECTIONS]
+    return requests
+
+
+def worm_requests() -> List[FrameRequest]:
+    """Frames normales y volteados de WormEnemy (a su escala, WORM_SCALE)"""
+    return [FrameRequest(WORM_GIF, scale=WORM_SCALE, colorkey=WHITE),
+            FrameRequest(WORM_GIF, scale=WORM_SCALE, flip=True, colorkey=WHITE)]
+
+
+def chaman_requests(directions=DIRECTIONS, attacks: bool = True) -> List[FrameRequest]:
+    """Movimiento (ChamanCharacter) y ataques (ChamanAttack) del Chamán"""
+    base = "assets/characters/chaman"
+    requests = [FrameRequest(f"{base}/animations/{d}.gif", KEY_CHAMAN, size=(128, 128)) for d in directions]
+    if attacks:
+        requests += [FrameRequest(f"{base}/attacks/{d}.gif", KEY_CHAMAN, size=(128, 128)) for d in DIRECTIONS]
+    return requests
+
+
+def level_1_requests(lazy: bool = LAZY_ANIMATIONS) -> List[FrameRequest]:
+    """Animaciones que necesita el Nivel 1 (con lazy, solo las del primer frame)"""
+    if lazy:
+        # Dirección inicial "down": Juan la dibuja con la animación "up" (direcciones invertidas)
+        return (hero_requests("juan", ("up",), attacks=False) +
+                hero_requests("adan", ("down",), attacks=False) + worm_requests())
+    return hero_requests("juan") + hero_requests("adan") + worm_requests()
+
+
+def level_2_requests(lazy: bool = LAZY_ANIMATIONS) -> List[FrameRequest]:
+    """Animaciones que necesita el Nivel 2 (con lazy, solo las del primer frame)"""
+    if lazy:
+        return level_1_requests(lazy) + chaman_requests(("down",), attacks=False)
+    return level_1_requests(lazy) + chaman_requests()
+
+
+def request_label(request: FrameRequest) -> str:
+    """Texto corto para la pantalla de carga (p. ej. 'juan/attacks/up')"""
+    path = os.path.splitext(request.path)[0]
+    return "/".join(path.replace("\\", "/").split("/")[-3:])
+
+
+class AssetPreloader:
+    """Resuelve una lista de animaciones en paralelo informando el progreso"""
+
+    def __init__(self, requests: List[FrameRequest], workers: int = PRELOAD_WORKERS):
+        """
+        Args:
+            requests: Animaciones a precargar
+            workers: Hilos de decodificación (0 = según núcleos)
+        """
+        # Sin repetidos y conservando el orden
+        self.requests = list(dict.fromkeys(requests))
+        self.workers = workers or min(8, os.cpu_count() or 1)
+        self.completed = 0
+        self.decoded = 0
+        self.failed = 0
+
+    @property
+    def total_units(self) -> int:
+        """Unidades de trabajo (una por animación)"""
+        return len(self.requests)
+
+    def run(self, on_progress: Optional[Callable[[str], None]] = None) -> int:
+        """
+        Precarga todas las animaciones.
+
+        Args:
+            on_progress: Se llama en el hilo principal con la etiqueta de cada
+                animación terminada (también las que fallan)
+
+        Returns:
+            Cantidad de animaciones decodificadas desde el GIF
+        """
+        cache = get_sprite_cache()
+
+        # Lo que ya está en memoria, en el paquete de assets o en disco no necesita hilos
+        pending: Dict[Tuple, List[FrameRequest]] = {}
+        for request in self.requests:
+            if not cache.has(request.key) and cached_gif_frames(request) is None:
+                pending.setdefault(request.decode_key, []).append(request)
+                continue
+            self._complete(request, on_progress)
+
+        if not pending:
+            return 0
+
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            futures = {executor.submit(decode_gif_buffers, *decode_key): requests
+                       for decode_key, requests in pending.items()}
+            for future in as_completed(futures):
+                requests = futures[future]
+                try:
+                    buffers = future.result()
+                except Exception as e:
+                    # El cargador lo volverá a intentar y usará su frame de respaldo
+                    print(f"⚠️ No se pudo precargar {requests[0].path}: {e}")
+                    self.failed += len(requests)
+                    buffers = None
+                for request in requests:
+                    if buffers is not None:
+                        frames = surfaces_from_buffers(buffers, request.rule, request.scale,
+                                                       request.flip, request.colorkey)
+                        store_gif_frames(request, frames)
+                        self.decoded += 1
+                    self._complete(request, on_progress)
+        return self.decoded
+
+    def _complete(self, request: FrameRequest, on_progress: Optional[Callable[[str], None]]) -> None:
+        """Cuenta una unidad terminada y la informa"""
+        self.completed += 1
+        if on_progress:
+            on_progress(request_label(request))
@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+"""
+ASSET STORE - La Tierra de las Manzanas
+Almacén local de imágenes sueltas (fondos, objetos), sin red al arrancar:
+- Catálogo de nombres lógicos ("items/apple", "backgrounds/nivel2") con su
+  archivo en assets/ (si el repo lo trae) y su URL de origen
+- Índice direccionado por contenido: cada nombre apunta al hash sha1 de su
+  archivo; las descargas se guardan una sola vez por hash en objects/
+- El almacén se siembra solo con los archivos de assets/; lo que no está
+  en el repo se descarga aparte, fuera del juego:
+      python asset_store.py descargar
+- Cada imagen se decodifica una vez por (hash, tamaño) y la superficie se
+  comparte entre todos los que la piden (p. ej. todos los items iguales)
+Un nombre sin copia local devuelve None y cada nivel usa su sprite de respaldo.
+
+Uso:
+    python asset_store.py descargar
+    python asset_store.py info
+"""
+
+import hashlib
+import json
+import os
+import sys
+import pygame
+from PIL import Image
+from typing import Dict, Optional, Tuple
+from config import *
+from asset_bundle import file_digest, get_asset_bundle
+from background_loader import load_background
+
+# Nombre lógico -> (archivo en el repo o None, URL de origen)
+ASSET_CATALOG: Dict[str, Tuple[Optional[str], str]] = {
+    "items/apple": (None, "https://github.com/user-attachments/assets/8d98de91-3834-456d-8dac-484029df9a02"),
+    # La botella de assets/items es la poción de escudo
+    "items/potion": ("assets/items/item_sprite.png",
+                     "https://github.com/user-attachments/assets/5365c2ea-ad1e-4055-8d3b-de1547e10396"),
+    "backgrounds/nivel2": (None, "https://github.com/user-attachments/assets/591f8b6d-7a10-4cb5-ae8a-6997fd21ea65"),
+}
+
+INDEX_FILE = "index.json"
+OBJECTS_DIR = "objects"
+
+if hasattr(Image, 'Resampling'):
+    LANCZOS = Image.Resampling.LANCZOS
+else:
+    LANCZOS = Image.LANCZOS
+
+
+class AssetStore:
+    """Índice de imágenes locales por nombre lógico y hash de contenido"""
+
+    def __init__(self, root: str = ASSET_STORE_DIR):
+        self.root = root
+        self.index_path = os.path.join(root, INDEX_FILE)
+        # nombre -> {"sha1", "path", "mtime_ns", "size"}
+        self.index: Dict[str, Dict] = {}
+        try:
+            with open(self.index_path, "r", encoding="utf-8") as f:
+                self.index = json.load(f)
+        except (OSError, ValueError):
+            pass
+        self._surfaces: Dict[Tuple, pygame.Surface] = {}
+        self._missing = set()
+        self.decoded = 0
+        self.hits = 0
+
+    def _save_index(self) -> None:
+        """Escribe el índice de forma atómica"""
+        try:
+            os.makedirs(self.root, exist_ok=True)
+            temp_path = self.index_path + ".tmp"
+            with open(temp_path, "w", encoding="utf-8") as f:
+                json.dump(self.index, f, indent=1, sort_keys=True)
+            os.replace(temp_path, self.index_path)
+        except OSError as e:
+            print(f"⚠️ No se pudo guardar el índice de assets: {e}")
+
+    def _record(self, name: str, path: str, digest: Optional[str] = None) -> Dict:
+        """Registra (o revalida) el archivo de un nombre"""
+        stat = os.stat(path)
+        entry = self.index.get(name)
+        if (entry is None or entry["path"] != path or
+                (entry["mtime_ns"], entry["size"]) != (stat.st_mtime_ns, stat.st_size)):
+            entry = {"sha1": digest or file_digest(path), "path": path,
+                     "mtime_ns": stat.st_mtime_ns, "size": stat.st_size}
+            self.index[name] = entry
+            self._save_index()
+        return entry
+
+    def entry(self, name: str) -> Optional[Dict]:
+        """
+        Entrada del índice de un nombre (sembrándola desde assets/ si hace falta).
+
+        Returns:
+            Diccionario con sha1 y path, o None si no hay copia local
+        """
+        local_path = ASSET_CATALOG.get(name, (None, None))[0]
+        try:
+            # El archivo del repo tiene prioridad sobre una descarga anterior
+            if local_path and os.path.exists(local_path):
+                return self._record(name, local_path)
+            entry = self.index.get(name)
+            if entry and os.path.exists(entry["path"]):
+                return self._record(name, entry["path"], entry["sha1"])
+        except OSError as e:
+            print(f"⚠️ No se pudo leer {name}: {e}")
+        return None
+
+    def image(self, name: str, size: Optional[Tuple[int, int]] = None,
+              alpha: bool = True) -> Optional[pygame.Surface]:
+        """
+        Superficie de una imagen del almacén, compartida entre quienes la piden.
+
+        Args:
+            name: Nombre lógico (ver ASSET_CATALOG)
+            size: Tamaño final (None = original)
+            alpha: Conservar transparencia (False para fondos opacos)
+
+        Returns:
+            La superficie (no modificar: es compartida), o None si no hay copia local
+        """
+        entry = self.entry(name)
+        if entry is None:
+            if name not in self._missing:
+                self._missing.add(name)
+                print(f"📭 {name} no está en el almacén local, se usa el respaldo")
+            return None
+
+        key = (entry["sha1"], size, alpha)
+        surface = self._surfaces.get(key)
+        if surface is not None:
+            self.hits += 1
+            return surface
+
+        try:
+            surface = self._decode(entry["path"], size, alpha)
+        except Exception as e:
+            print(f"⚠️ No se pudo decodificar {name}: {e}")
+            return None
+        self._surfaces[key] = surface
+        self.decoded += 1
+        return surface
+
+    def _decode(self, path: str, size: Optional[Tuple[int, int]], alpha: bool) -> pygame.Surface:
+        """Decodifica una imagen (desde el paquete compilado si está)"""
+        if size is None and not alpha:
+            # Fondos: directo al formato de la pantalla
+            surface = load_background(path)
+            if surface is None:
+                raise ValueError("formato no soportado")
+            return surface
+
+        bundle = get_asset_bundle()
+        surface = bundle.image(path) if bundle and size is None else None
+        if surface is not None:
+            return surface
+
+        pil_image = Image.open(path)
+        pil_image = pil_image.convert('RGBA' if alpha else 'RGB')
+        if size is not None and pil_image.size != tuple(size):
+            pil_image = pil_image.resize(size, LANCZOS)
+        surface = pygame.image.fromstring(pil_image.tobytes(), pil_image.size, pil_image.mode)
+        if pygame.display.get_surface() is not None:
+            surface = surface.convert_alpha() if alpha else surface.convert()
+        return surface
+
+    def fetch(self, names=None) -> int:
+        """
+        Descarga al almacén los assets que no tienen copia local (solo herramienta,
+        nunca durante el juego).
+
+        Returns:
+            Cantidad de archivos descargados
+        """
+        import requests
+
+        downloaded = 0
+        for name in names or ASSET_CATALOG:
+            if self.entry(name) is not None:
+                print(f"✅ {name} ya está en el almacén")
+                continue
+            url = ASSET_CATALOG[name][1]
+            try:
+                print(f"📥 Descargando {name}...")
+                response = requests.get(url, timeout=30)
+                response.raise_for_status()
+            except Exception as e:
+                print(f"❌ No se pudo descargar {name}: {e}")
+                continue
+
+            digest = hashlib.sha1(response.content).hexdigest()
+            extension = os.path.splitext(response.url.split("?")[0])[1] or ".png"
+            object_path = os.path.join(self.root, OBJECTS_DIR, digest + extension).replace("\\", "/")
+            # Mismo contenido, mismo archivo: no se guarda dos veces
+            if not os.path.exists(object_path):
+                os.makedirs(os.path.dirname(object_path), exist_ok=True)
+                with open(object_path + ".tmp", "wb") as f:
+                    f.write(response.content)
+                os.replace(object_path + ".tmp", object_path)
+            self._record(name, object_path, digest)
+            downloaded += 1
+            print(f"✅ {name} -> {digest[:12]}")
+        return downloaded
+
+    def describe(self) -> str:
+        """Resumen para la consola"""
+        return (f"🗄️ Almacén de assets: {len(self._surfaces)} imágenes decodificadas, "
+                f"{self.hits} reutilizadas")
+
+
+# Instancia global del almacén
+_asset_store = None
+
+def get_asset_store() -> AssetStore:
+    """Obtiene la instancia global del almacén de assets"""
+    global _asset_store
+    if _asset_store is None:
+        _asset_store = AssetStore()
+    return _asset_store
+
+
+def main(argv) -> None:
+    store = get_asset_store()
+    if argv and argv[0] == "descargar":
+        store.fetch(argv[1:] or None)
+    elif argv and argv[0] == "info":
+        for name in ASSET_CATALOG:
+            entry = store.entry(name)
+            if entry:
+                print(f"   {entry['sha1'][:12]} {name} ({entry['path']})")
+            else:
+                print(f"   {'-' * 12} {name} (sin copia local)")
+    else:
+        print(__doc__)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+BACKGROUND LOADER - La Tierra de las Manzanas
+Carga de fondos grandes directamente al formato de la pantalla:
+- Paquete compilado (asset_bundle): píxeles crudos ya decodificados, solo
+  queda la conversión al formato de la pantalla
+- Si no: decodificación nativa de SDL_image (pygame.image.load) y convert(),
+  sin pasar por PIL -> tobytes() -> fromstring() (dos copias completas menos)
+- PIL solo como respaldo si SDL_image no soporta el formato
+Cada carga informa su origen, tiempo y memoria.
+"""
+
+import time
+import pygame
+from PIL import Image
+from typing import Optional
+from config import *
+from asset_bundle import get_asset_bundle
+
+
+def surface_megabytes(surface: pygame.Surface) -> float:
+    """Memoria de píxeles de una superficie en MB"""
+    return surface.get_pitch() * surface.get_height() / (1024 * 1024)
+
+
+def to_display_format(surface: pygame.Surface) -> pygame.Surface:
+    """Convierte al formato de la pantalla (opaco) si hay ventana y hace falta"""
+    display = pygame.display.get_surface()
+    if display is None:
+        return surface
+    if (surface.get_bitsize() == display.get_bitsize() and surface.get_masks()[:3] == display.get_masks()[:3]
+            and not surface.get_flags() & pygame.SRCALPHA):
+        return surface  # Ya está en el formato de la pantalla
+    return surface.convert()
+
+
+def decode_background(path: str, use_bundle: bool = True):
+    """
+    Decodifica un fondo sin informar nada (lo usan también los benchmarks).
+
+    Returns:
+        (superficie en formato de pantalla, origen); lanza excepción si no se puede leer
+    """
+    bundle = get_asset_bundle() if use_bundle else None
+    surface = bundle.image(path) if bundle else None
+    if surface is not None:
+        return to_display_format(surface), "paquete"
+
+    if pygame.image.get_extended():
+        return to_display_format(pygame.image.load(path)), "nativo"
+
+    # Respaldo: SDL_image sin soporte de PNG/JPG
+    pil_image = Image.open(path).convert('RGB')
+    surface = pygame.image.frombuffer(pil_image.tobytes(), pil_image.size, 'RGB')
+    return surface.convert() if pygame.display.get_surface() else surface.copy(), "PIL"
+
+
+def load_background(path: str) -> Optional[pygame.Surface]:
+    """
+    Carga un fondo opaco listo para blit.
+
+    Args:
+        path: Archivo de imagen
+
+    Returns:
+        Superficie en el formato de la pantalla, o None si no se pudo cargar
+        (cada nivel crea su fondo de respaldo)
+    """
+    start = time.perf_counter()
+    try:
+        surface, source = decode_background(path)
+    except (pygame.error, OSError, ValueError) as e:
+        print(f"❌ No se pudo cargar el fondo {path}: {e}")
+        return None
+    elapsed = (time.perf_counter() - start) * 1000
+    width, height = surface.get_size()
+    print(f"🖼️ Fondo {path}: {width}x{height} en {elapsed:.0f} ms ({source}, {surface_megabytes(surface):.1f} MB)")
+    return surface
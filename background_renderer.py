@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+BACKGROUND RENDERER - La Tierra de las Manzanas
+Dibujo del fondo del mundo por bloques:
+- La imagen del mundo se divide en bloques fijos (subsuperficies, sin copiar
+  píxeles) indexados por columna y fila
+- Cada frame se calculan solo los bloques que tocan la vista y se dibujan con
+  blits de rectángulo de origen (la parte visible de cada bloque)
+- El costo por frame depende del tamaño de la pantalla, no del mundo: un
+  nivel diez veces más ancho dibuja la misma cantidad de bloques
+- covers() indica si el fondo tapa toda la vista, para no limpiar la
+  pantalla antes de dibujarlo
+"""
+
+import pygame
+from typing import List, Tuple
+from config import *
+
+
+class ChunkedBackground:
+    """Fondo del mundo dividido en bloques con recorte por vista"""
+
+    def __init__(self, surface: pygame.Surface, chunk_size: int = BACKGROUND_CHUNK_SIZE):
+        """
+        Args:
+            surface: Imagen completa del mundo (ya en formato de pantalla)
+            chunk_size: Lado de cada bloque en píxeles
+        """
+        self.surface = surface
+        self.chunk_size = chunk_size
+        self.width, self.height = surface.get_size()
+        self.columns = (self.width + chunk_size - 1) // chunk_size
+        self.rows = (self.height + chunk_size - 1) // chunk_size
+        # Opaco: sin alfa por píxel ni colorkey (tapa lo que haya debajo)
+        self.opaque = not surface.get_flags() & pygame.SRCALPHA and surface.get_colorkey() is None
+
+        # chunks[fila][columna]
+        self.chunks: List[List[pygame.Surface]] = []
+        for row in range(self.rows):
+            y = row * chunk_size
+            height = min(chunk_size, self.height - y)
+            self.chunks.append([surface.subsurface((column * chunk_size, y,
+                                                    min(chunk_size, self.width - column * chunk_size), height))
+                                for column in range(self.columns)])
+
+    def covers(self, camera_x: int, camera_y: int, view_width: int, view_height: int) -> bool:
+        """Indica si el fondo tapa por completo la vista (no hace falta limpiar la pantalla)"""
+        return (self.opaque and camera_x >= 0 and camera_y >= 0 and
+                camera_x + view_width <= self.width and camera_y + view_height <= self.height)
+
+    def visible_range(self, camera_x: int, camera_y: int, view_width: int,
+                      view_height: int) -> Tuple[int, int, int, int]:
+        """Columnas y filas de bloques que tocan la vista: (primera col, última col + 1, primera fila, última fila + 1)"""
+        size = self.chunk_size
+        first_column = max(0, camera_x // size)
+        last_column = min(self.columns, (camera_x + view_width + size - 1) // size)
+        first_row = max(0, camera_y // size)
+        last_row = min(self.rows, (camera_y + view_height + size - 1) // size)
+        return first_column, last_column, first_row, last_row
+
+    def draw(self, screen: pygame.Surface, camera_x: int, camera_y: int) -> int:
+        """
+        Dibuja la parte visible del mundo (el punto camera_x, camera_y queda en 0, 0).
+
+        Returns:
+            Cantidad de blits realizados
+        """
+        return self.draw_area(screen, camera_x, camera_y, screen.get_rect())
+
+    def draw_area(self, screen: pygame.Surface, camera_x: int, camera_y: int, area: pygame.Rect) -> int:
+        """
+        Dibuja solo una región de la pantalla (p. ej. para borrar lo que se
+        dibujó encima en el frame anterior).
+
+        Returns:
+            Cantidad de blits realizados
+        """
+        camera_x, camera_y = int(camera_x), int(camera_y)
+        area = area.clip(screen.get_rect())
+        if not area.width or not area.height:
+            return 0
+        first_column, last_column, first_row, last_row = self.visible_range(
+            camera_x + area.x, camera_y + area.y, area.width, area.height)
+        size = self.chunk_size
+        view_right = camera_x + area.right
+        view_bottom = camera_y + area.bottom
+        camera_left = camera_x + area.x
+        camera_top = camera_y + area.y
+        blits = 0
+        for row in range(first_row, last_row):
+            chunk_y = row * size
+            top = max(camera_top, chunk_y)
+            bottom = min(view_bottom, chunk_y + size, self.height)
+            chunk_row = self.chunks[row]
+            for column in range(first_column, last_column):
+                chunk_x = column * size
+                left = max(camera_left, chunk_x)
+                right = min(view_right, chunk_x + size, self.width)
+                # Solo la parte visible del bloque (rectángulo de origen en coordenadas del bloque)
+                screen.blit(chunk_row[column], (left - camera_x, top - camera_y),
+                            (left - chunk_x, top - chunk_y, right - left, bottom - top))
+                blits += 1
+        return blits
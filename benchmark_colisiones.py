@@ -0,0 +1,235 @@
+#!/usr/bin/env python3
+"""
+BENCHMARK DE COLISIONES - La Tierra de las Manzanas
+Compara el recorrido lineal de bloques contra el hash espacial (con y sin
+fusión de celdas en rectángulos) y el mapa de ocupación con tabla de
+áreas sumadas:
+- Mapas sintéticos con cantidades crecientes de bloques
+- Mapas reales de Nivel 1 y Nivel 2
+- Movimiento en lote de muchos cuerpos (uno por uno frente a vectorizado),
+  verificando que ambos caminos den el mismo resultado
+Uso: python benchmark_colisiones.py
+"""
+
+import json
+import random
+import time
+
+import pygame
+
+from collision_grid import NUMPY_AVAILABLE, CollisionIndex, OccupancyGrid, SpatialHashGrid, merge_cells
+from config import *
+from utils import CollisionBlock
+
+QUERY_COUNT = 20000
+QUERY_SIZE = 100  # Igual que el rectángulo de can_move_to (64 * 1.56)
+SYNTHETIC_DENSITY = 0.05  # Fracción de celdas ocupadas en los mapas sintéticos
+MOVEMENT_REPETITIONS = 20
+MOVEMENT_TRIALS = 200  # Ticks aleatorios para comparar el lote con move_rect
+
+
+def linear_check(blocks, rect):
+    """Consulta original: recorrer todos los bloques"""
+    for block in blocks:
+        if rect.colliderect(block.rect):
+            return True
+    return False
+
+
+def make_synthetic_blocks(count, world_width, world_height):
+    """Genera bloques alineados a la grilla en posiciones únicas"""
+    cols = world_width // COLLISION_BLOCK_SIZE
+    rows = world_height // COLLISION_BLOCK_SIZE
+    cells = random.sample(range(cols * rows), min(count, cols * rows))
+    return [CollisionBlock((c % cols) * COLLISION_BLOCK_SIZE, (c // cols) * COLLISION_BLOCK_SIZE)
+            for c in cells]
+
+
+def merge_blocks(blocks):
+    """Fusiona los bloques alineados a la grilla en rectángulos maximales"""
+    size = COLLISION_BLOCK_SIZE
+    cells = {(int(b.x) // size, int(b.y) // size) for b in blocks}
+    return [CollisionBlock(col * size, row * size, width * size, height * size)
+            for col, row, width, height in merge_cells(cells)]
+
+
+def make_queries(world_width, world_height):
+    """Genera rectángulos de consulta aleatorios dentro del mundo"""
+    return [pygame.Rect(random.randint(0, world_width - QUERY_SIZE),
+                        random.randint(0, world_height - QUERY_SIZE),
+                        QUERY_SIZE, QUERY_SIZE)
+            for _ in range(QUERY_COUNT)]
+
+
+def time_queries(check, queries):
+    """Devuelve (microsegundos por consulta, cantidad de colisiones)"""
+    start = time.perf_counter()
+    hits = 0
+    for rect in queries:
+        if check(rect):
+            hits += 1
+    elapsed = time.perf_counter() - start
+    return elapsed / len(queries) * 1_000_000, hits
+
+
+def run_case(name, blocks, world_width, world_height):
+    """Mide las estrategias disponibles sobre el mismo conjunto de bloques"""
+    grid = SpatialHashGrid()
+    grid.rebuild(blocks)
+    merged_blocks = merge_blocks(blocks)
+    merged_grid = SpatialHashGrid()
+    merged_grid.rebuild(merged_blocks)
+    engines = [("lineal", lambda r: linear_check(blocks, r)), ("hash", grid.collides),
+               ("fusionado", merged_grid.collides)]
+    if NUMPY_AVAILABLE:
+        occupancy = OccupancyGrid(world_width, world_height)
+        occupancy.rebuild(blocks)
+        engines.append(("ocupación", occupancy.collides))
+
+    queries = make_queries(world_width, world_height)
+    # Las consultas en espacio libre son el peor caso del recorrido lineal
+    free_queries = [rect for rect in queries if not grid.collides(rect)] or queries
+
+    results = []
+    expected_hits = None
+    consistent = True
+    for engine_name, check in engines:
+        mixed_us, hits = time_queries(check, queries)
+        free_us, _ = time_queries(check, free_queries)
+        if expected_hits is None:
+            expected_hits = hits
+        consistent = consistent and hits == expected_hits
+        results.append(f"{engine_name} {mixed_us:8.2f}/{free_us:8.2f} µs")
+
+    status = "✅" if consistent else "❌"
+    print(f"{status} {name:<18} {len(blocks):>6} bloques → {len(merged_blocks):>5} rectángulos | "
+          + " | ".join(results))
+
+
+def run_movement_case(name, blocks, world_width, world_height, body_count):
+    """Mide resolver el movimiento de muchos cuerpos de 83x83 en un tick"""
+    index = CollisionIndex(world_width, world_height, block_factory=CollisionBlock)
+    index.rebuild(blocks)
+    positions, velocities = [], []
+    while len(positions) < body_count:
+        x = random.uniform(0, world_width - 83)
+        y = random.uniform(0, world_height - 83)
+        if not index.collides(pygame.Rect(x, y, 83, 83)):
+            positions.append((x, y))
+            velocities.append((random.uniform(-8, 8), random.uniform(-8, 8)))
+
+    start = time.perf_counter()
+    for _ in range(MOVEMENT_REPETITIONS):
+        for (x, y), (dx, dy) in zip(positions, velocities):
+            index.move_rect(x, y, 83, 83, dx, dy)
+    single_ms = (time.perf_counter() - start) / MOVEMENT_REPETITIONS * 1000
+
+    start = time.perf_counter()
+    for _ in range(MOVEMENT_REPETITIONS):
+        index.move_aabbs(positions, (83, 83), velocities)
+    batch_ms = (time.perf_counter() - start) / MOVEMENT_REPETITIONS * 1000
+
+    print(f"🐛 {name:<18} {body_count:>6} cuerpos | uno por uno {single_ms:8.3f} ms | "
+          f"en lote ({index.engine}) {batch_ms:8.3f} ms")
+
+
+def check_movement_case(name, blocks, world_width, world_height, trials=MOVEMENT_TRIALS, body_count=40):
+    """
+    Verifica que el movimiento en lote (vectorizado) y move_rect den el mismo
+    resultado: velocidades de hasta más de una celda (varios subpasos) y
+    cuerpos que parten libres o dentro de bloques.
+    """
+    index = CollisionIndex(world_width, world_height, block_factory=CollisionBlock)
+    if index.occupancy_grid is None:
+        print(f"⚠️ {name}: sin mapa de ocupación, el lote ya es move_rect")
+        return
+    index.rebuild(blocks)
+    speed = COLLISION_BLOCK_SIZE * 1.25
+    body_count = max(body_count, COLLISION_VECTOR_MIN_BODIES)
+    different = total = 0
+    worst = 0.0
+    for _ in range(trials):
+        positions = [(random.uniform(0, world_width - 83), random.uniform(0, world_height - 83))
+                     for _ in range(body_count)]
+        velocities = [(random.uniform(-speed, speed), random.uniform(-speed, speed)) for _ in range(body_count)]
+        resolved, hits = index.move_aabbs(positions, (83, 83), velocities)
+        for (x, y), (dx, dy), (batch_x, batch_y), batch_hits in zip(positions, velocities,
+                                                                     resolved.tolist(), hits.tolist()):
+            single_x, single_y, hit_x, hit_y = index.move_rect(x, y, 83, 83, dx, dy)
+            error = max(abs(single_x - batch_x), abs(single_y - batch_y))
+            total += 1
+            if error > 1e-6 or (hit_x, hit_y) != tuple(batch_hits):
+                different += 1
+                worst = max(worst, error)
+    status = "✅" if not different else "❌"
+    print(f"{status} {name:<18} lote = move_rect en {total - different}/{total} cuerpos"
+          + (f" (peor diferencia {worst:.2f}px)" if different else ""))
+
+
+def load_level1_blocks():
+    """Carga los bloques reales del Nivel 1 (save_data/collision_blocks.json)"""
+    with open("save_data/collision_blocks.json", "r", encoding="utf-8") as f:
+        data = json.load(f)
+    return [CollisionBlock(b["x"], b["y"]) for b in data.get("blocks", [])]
+
+
+def load_txt_blocks(filename):
+    """Carga bloques desde un archivo de texto x,y,w,h (ignora comentarios #)"""
+    blocks = []
+    with open(filename, "r", encoding="utf-8", errors="ignore") as f:
+        for line in f:
+            if line.strip() and not line.startswith("#"):
+                x, y, w, h = map(int, line.strip().split(','))
+                blocks.append(CollisionBlock(x, y, w, h))
+    return blocks
+
+
+def main():
+    random.seed(1234)
+    print("⏱️ BENCHMARK DE COLISIONES")
+    print("=" * 50)
+    print(f"Consultas por caso: {QUERY_COUNT} rectángulos de {QUERY_SIZE}x{QUERY_SIZE}")
+    print(f"Tamaño de celda del hash: {SPATIAL_HASH_CELL_SIZE}px")
+    print("Tiempos por consulta: mixto/espacio libre")
+    if not NUMPY_AVAILABLE:
+        print("⚠️ NumPy no disponible, se omite el mapa de ocupación")
+    print()
+
+    print(f"📈 Mapas sintéticos (alto 1080, ancho crece con los bloques, densidad {SYNTHETIC_DENSITY:.0%}):")
+    for count in (250, 1000, 2500, 10000, 40000):
+        rows = 1080 // COLLISION_BLOCK_SIZE
+        world_width = int(count / SYNTHETIC_DENSITY / rows) * COLLISION_BLOCK_SIZE
+        run_case(f"sintético {count}", make_synthetic_blocks(count, world_width, 1080), world_width, 1080)
+    print()
+
+    print("🗺️ Mapas reales:")
+    try:
+        run_case("Nivel 1 (json)", load_level1_blocks(), 1980, 1080)
+    except Exception as e:
+        print(f"⚠️ No se pudo cargar Nivel 1: {e}")
+    try:
+        run_case("Nivel 1 (txt)", load_txt_blocks("collision_data.txt"), 1980, 1080)
+    except Exception as e:
+        print(f"⚠️ No se pudo cargar collision_data.txt: {e}")
+    try:
+        run_case("Nivel 2 (txt)", load_txt_blocks("collision_data_nivel2.txt"), 5940, 1080)
+    except Exception as e:
+        print(f"⚠️ No se pudo cargar Nivel 2: {e}")
+    print()
+
+    print("🏃 Movimiento por tick:")
+    try:
+        level2_blocks = load_txt_blocks("collision_data_nivel2.txt")
+        for count in (10, 100, 1000):
+            run_movement_case("Nivel 2", level2_blocks, 5940, 1080, count)
+        check_movement_case("Nivel 2", level2_blocks, 5940, 1080)
+    except Exception as e:
+        print(f"⚠️ No se pudo medir el movimiento: {e}")
+    try:
+        check_movement_case("Nivel 1 (json)", load_level1_blocks(), 1980, 1080)
+    except Exception as e:
+        print(f"⚠️ No se pudo comparar el movimiento en Nivel 1: {e}")
+
+
+if __name__ == "__main__":
+    main()
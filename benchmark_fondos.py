@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+"""
+BENCHMARK DE FONDOS - La Tierra de las Manzanas
+Compara la carga de los fondos grandes:
+- Antes: PIL -> convert('RGB') -> tobytes() -> fromstring() -> convert()
+- Nativo: pygame.image.load (SDL_image) -> formato de la pantalla
+- Paquete: píxeles crudos del paquete compilado (si está compilado)
+Mide tiempo y pico de memoria (RSS) de cada método en un proceso aparte,
+para el fondo de 1980x1080 del Nivel 1 y el fondo ancho, y verifica que
+todos produzcan los mismos píxeles.
+También compara el dibujo por frame del fondo completo (fill + blit del
+mundo entero recortado por SDL) contra ChunkedBackground, con el fondo ancho
+y con un mundo cuatro veces más ancho.
+Uso: python benchmark_fondos.py
+"""
+
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame
+from PIL import Image
+
+from asset_bundle import get_asset_bundle
+from background_loader import decode_background
+from background_renderer import ChunkedBackground
+from config import *
+
+try:
+    import resource
+    RESOURCE_AVAILABLE = True
+except ImportError:  # Windows
+    RESOURCE_AVAILABLE = False
+
+WIDE_BACKGROUND = "assets/backgrounds/background.png"
+LEVEL_1_BACKGROUND = "assets/backgrounds/escenario.png"
+METHODS = ("pil", "nativo", "paquete")
+SCREEN_SIZE = (1920, 1080)
+DRAW_FRAMES = 300
+
+
+def legacy_background(path):
+    """Carga original de Background.load_background / load_background_from_local"""
+    pil_image = Image.open(path)
+    pil_image = pil_image.convert('RGB')
+    image_data = pil_image.tobytes()
+    surface = pygame.image.fromstring(image_data, pil_image.size, 'RGB')
+    return surface.convert()
+
+
+def load_with(method, path):
+    """Carga un fondo con uno de los métodos"""
+    if method == "pil":
+        return legacy_background(path)
+    surface, source = decode_background(path, use_bundle=method == "paquete")
+    if method == "paquete" and source != "paquete":
+        raise ValueError("no está en el paquete compilado")
+    return surface
+
+
+def peak_rss_mb():
+    """Pico de memoria residente del proceso en MB"""
+    try:
+        # En Linux ru_maxrss hereda el pico del proceso padre; VmHWM no
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def measure(method, path):
+    """Modo hijo: carga una vez e imprime 'ms pico_mb'"""
+    pygame.init()
+    pygame.display.set_mode((1, 1))
+    before = peak_rss_mb() if RESOURCE_AVAILABLE else 0.0
+    start = time.perf_counter()
+    load_with(method, path)
+    elapsed = (time.perf_counter() - start) * 1000
+    peak = peak_rss_mb() - before if RESOURCE_AVAILABLE else -1.0
+    print(f"{elapsed:.2f} {peak:.2f}")
+
+
+def run_case(name, path):
+    """Mide los tres métodos sobre un fondo en procesos separados"""
+    width, height = Image.open(path).size
+    print(f"🖼️ {name} ({width}x{height}, {width * height * 4 / (1024 * 1024):.1f} MB en pantalla)")
+
+    # Mismos píxeles con todos los métodos
+    reference = pygame.image.tobytes(legacy_background(path), "RGB")
+    results = {}
+    for method in METHODS:
+        try:
+            surface = load_with(method, path)
+        except (ValueError, pygame.error) as e:
+            print(f"   {method:8s} omitido: {e}")
+            continue
+        identical = pygame.image.tobytes(surface, "RGB") == reference
+        output = subprocess.run([sys.executable, __file__, "--medir", method, path],
+                                capture_output=True, text=True, check=True).stdout.split()
+        elapsed, peak = float(output[-2]), float(output[-1])
+        results[method] = elapsed
+        peak_text = f"{peak:6.1f} MB" if peak >= 0 else "    n/d"
+        print(f"   {method:8s} {elapsed:7.1f} ms | pico {peak_text} | "
+              f"{'idéntico' if identical else '⚠️ DISTINTO'}")
+
+    if "pil" in results and "nativo" in results:
+        best = min(ms for method, ms in results.items() if method != "pil")
+        print(f"   📊 x{results['pil'] / best:.1f} más rápido que PIL")
+
+
+def draw_cameras(world_width, world_height):
+    """Recorrido de cámara de izquierda a derecha y de arriba abajo"""
+    max_x = world_width - SCREEN_SIZE[0]
+    max_y = max(0, world_height - SCREEN_SIZE[1])
+    return [(max_x * i // (DRAW_FRAMES - 1), max_y * i // (DRAW_FRAMES - 1)) for i in range(DRAW_FRAMES)]
+
+
+def run_draw_case(name, world):
+    """Costo por frame: blit del mundo entero contra bloques visibles"""
+    screen = pygame.Surface(SCREEN_SIZE).convert()
+    reference = pygame.Surface(SCREEN_SIZE).convert()
+    renderer = ChunkedBackground(world)
+    cameras = draw_cameras(*world.get_size())
+
+    # Mismos píxeles en algunas cámaras del recorrido
+    for camera_x, camera_y in cameras[::50]:
+        reference.fill((15, 25, 15))
+        reference.blit(world, (-camera_x, -camera_y))
+        renderer.draw(screen, camera_x, camera_y)
+        if pygame.image.tobytes(screen, "RGB") != pygame.image.tobytes(reference, "RGB"):
+            print(f"   ⚠️ DISTINTO en la cámara ({camera_x}, {camera_y})")
+
+    start = time.perf_counter()
+    for camera_x, camera_y in cameras:
+        screen.fill((15, 25, 15))
+        screen.blit(world, (-camera_x, -camera_y))
+    full_us = (time.perf_counter() - start) * 1_000_000 / DRAW_FRAMES
+
+    blits = 0
+    start = time.perf_counter()
+    for camera_x, camera_y in cameras:
+        if not renderer.covers(camera_x, camera_y, *SCREEN_SIZE):
+            screen.fill((15, 25, 15))
+        blits += renderer.draw(screen, camera_x, camera_y)
+    chunked_us = (time.perf_counter() - start) * 1_000_000 / DRAW_FRAMES
+
+    width, height = world.get_size()
+    print(f"🗺️ {name} ({width}x{height})")
+    print(f"   Mundo entero  {full_us:8.0f} µs/frame")
+    print(f"   Por bloques   {chunked_us:8.0f} µs/frame ({blits / DRAW_FRAMES:.1f} blits) | "
+          f"x{full_us / chunked_us:.2f}")
+
+
+def main():
+    if len(sys.argv) == 4 and sys.argv[1] == "--medir":
+        measure(sys.argv[2], sys.argv[3])
+        return
+
+    pygame.init()
+    pygame.display.set_mode((1, 1))
+    print("⏱️ BENCHMARK DE FONDOS")
+    print("=" * 50)
+    if not RESOURCE_AVAILABLE:
+        print("⚠️ Sin módulo resource: no se mide el pico de memoria")
+    if get_asset_bundle() is None:
+        print("⚠️ Sin paquete compilado (python asset_bundle.py compilar): se omite ese método")
+    print()
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        level_1_path = LEVEL_1_BACKGROUND
+        if not os.path.exists(level_1_path):
+            # El repo no trae el fondo del Nivel 1: se mide un recorte del mismo tamaño
+            level_1_path = os.path.join(temp_dir, "nivel1.png")
+            Image.open(WIDE_BACKGROUND).crop((0, 0, 1980, 1080)).save(level_1_path)
+        run_case("Fondo Nivel 1", level_1_path)
+        print()
+        run_case("Fondo ancho", WIDE_BACKGROUND)
+    print()
+
+    print("🎞️ Dibujo del fondo por frame (vista 1920x1080):")
+    wide, _ = decode_background(WIDE_BACKGROUND, use_bundle=False)
+    run_draw_case("Fondo ancho", wide)
+    # Un mundo cuatro veces más ancho: el costo por frame no debería crecer
+    huge = pygame.Surface((wide.get_width() * 4, wide.get_height())).convert()
+    for i in range(4):
+        huge.blit(wide, (i * wide.get_width(), 0))
+    run_draw_case("Mundo x4", huge)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+BENCHMARK DE RESOLUCIÓN INTERNA - La Tierra de las Manzanas
+Mide el tiempo por frame de la intro, el Nivel 1 y el Nivel 2 con cada
+RENDER_SCALE (0.5, 0.75, 1.0):
+- Cada escala corre en un proceso aparte (RENDER_SCALE se lee al importar)
+- Se cuenta update() + draw() completo, incluida la presentación (flip)
+- Con 1.0 el Nivel 2 usa rectángulos sucios; con escala reducida se
+  presenta el frame completo, que escala SDL (ventana SCALED)
+- Se mide con dos drivers de video sin pantalla: "dummy", donde presentar
+  a la ventana no cuesta nada (solo cuenta el dibujo), y "offscreen", donde
+  la presentación tiene un costo proporcional al tamaño de la ventana,
+  como en una pantalla real sin aceleración
+Uso: python benchmark_render.py [ancho alto]
+"""
+
+import contextlib
+import importlib.util
+import io
+import os
+import subprocess
+import sys
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+SCALES = (0.5, 0.75, 1.0)
+DRIVERS = ("dummy", "offscreen")
+WARMUP_FRAMES = 30
+FRAMES = 300
+DEFAULT_SIZE = (1920, 1080)
+
+
+def frame_ms(scene, frames=FRAMES):
+    """Milisegundos medios por frame (update + draw) después del calentamiento"""
+    for _ in range(WARMUP_FRAMES):
+        scene.update()
+        scene.draw()
+    start = time.perf_counter()
+    for _ in range(frames):
+        scene.update()
+        scene.draw()
+    return (time.perf_counter() - start) * 1000 / frames
+
+
+def measure(scale, size):
+    """Modo hijo: corre las escenas con una escala e imprime 'intro nivel1 nivel2' en ms"""
+    import config
+    config.RENDER_SCALE = scale
+    import pygame
+    pygame.init()
+    from render_scale import internal_size
+    # Los drivers sin pantalla no tienen modos de pantalla completa: se fija el tamaño
+    # de la ventana (la ventana SCALED de escala reducida mide el tamaño interno)
+    original_set_mode = pygame.display.set_mode
+
+    def set_mode(_size, flags=0, *args, **kwargs):
+        if flags & pygame.SCALED:
+            return original_set_mode(internal_size(size, scale), pygame.SCALED)
+        return original_set_mode(size)
+
+    pygame.display.set_mode = set_mode
+    pygame.time.wait = lambda ms: None
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        from intro_cinematica import IntroCinematica
+        intro = IntroCinematica()
+        intro.show_menu = True
+        intro_ms = frame_ms(intro)
+
+        spec = importlib.util.spec_from_file_location("nivel_1", "nivel 1 escenario.py")
+        nivel_1 = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(nivel_1)
+        level_1_ms = frame_ms(nivel_1.Game())
+
+        from nivel_2 import Nivel2
+        level_2_ms = frame_ms(Nivel2("juan", {}))
+    print(f"{intro_ms:.3f} {level_1_ms:.3f} {level_2_ms:.3f}")
+
+
+def main():
+    if len(sys.argv) == 5 and sys.argv[1] == "--medir":
+        measure(float(sys.argv[2]), (int(sys.argv[3]), int(sys.argv[4])))
+        return
+
+    size = (int(sys.argv[1]), int(sys.argv[2])) if len(sys.argv) == 3 else DEFAULT_SIZE
+    print(f"⏱️ BENCHMARK DE RESOLUCIÓN INTERNA (ventana {size[0]}x{size[1]}, {FRAMES} frames)")
+    print("=" * 50)
+    for driver in DRIVERS:
+        print(f"🖥️ Driver de video: {driver}")
+        print(f"   {'escala':>6s} {'interna':>10s} {'intro':>9s} {'nivel 1':>9s} {'nivel 2':>9s}")
+        environment = dict(os.environ, SDL_VIDEODRIVER=driver)
+        results = {}
+        try:
+            for scale in SCALES:
+                output = subprocess.run([sys.executable, __file__, "--medir", str(scale), str(size[0]), str(size[1])],
+                                        capture_output=True, text=True, check=True, env=environment).stdout.split()
+                results[scale] = [float(value) for value in output[-3:]]
+                internal = f"{round(size[0] * scale)}x{round(size[1] * scale)}"
+                intro_ms, level_1_ms, level_2_ms = results[scale]
+                print(f"   {scale:6.2f} {internal:>10s} {intro_ms:6.2f} ms {level_1_ms:6.2f} ms {level_2_ms:6.2f} ms")
+        except (subprocess.CalledProcessError, ValueError) as e:
+            print(f"   ⚠️ No se pudo medir con el driver {driver}: {e}")
+            continue
+
+        full = results[1.0]
+        for scale in SCALES[:-1]:
+            speedups = " | ".join(f"x{base / value:.2f}" for base, value in zip(full, results[scale]))
+            print(f"   📊 {scale} contra 1.0: {speedups}")
+
+
+if __name__ == "__main__":
+    main()
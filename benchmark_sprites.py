@@ -0,0 +1,252 @@
+#!/usr/bin/env python3
+"""
+BENCHMARK DE SPRITES - La Tierra de las Manzanas
+Compara el recorte de fondos de los cargadores de animaciones:
+- Antes: recorrido píxel por píxel de cada cargador (get_at/set_at o pixels[x, y])
+- Después: etapa compartida de sprite_keying sobre el frame completo
+Verifica que ambos produzcan exactamente los mismos píxeles.
+También mide la carga de todas las animaciones del juego en frío (sin caché
+en disco) y en caliente (frames leídos de la caché en disco), y la
+decodificación secuencial contra la precarga en paralelo de AssetPreloader,
+y el tiempo hasta poder dibujar el primer frame con carga diferida.
+Uso: python benchmark_sprites.py
+"""
+
+import contextlib
+import io
+import os
+import tempfile
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame
+from PIL import Image
+
+import lazy_animations
+import sprite_cache
+from asset_preloader import AssetPreloader, level_2_requests
+from config import *
+from sprite_cache import DiskFrameCache, decode_gif_frames
+from sprite_keying import KEY_ATTACK, KEY_CHAMAN, KEY_CHARACTER, NUMPY_AVAILABLE, frame_to_surface
+
+DIRECTIONS = ("up", "down", "left", "right")
+
+
+def legacy_character(frame):
+    """Recorte original de CharacterBase.load_animations"""
+    surface = pygame.image.fromstring(frame.tobytes(), frame.size, "RGBA").convert_alpha()
+    width, height = surface.get_size()
+    for x in range(width):
+        for y in range(height):
+            pixel = surface.get_at((x, y))
+            if pixel[0] > 250 and pixel[1] > 250 and pixel[2] > 250:
+                surface.set_at((x, y), (0, 0, 0, 0))
+    return surface
+
+
+def legacy_attack(frame):
+    """Recorte original de JuanAttack/AdanAttack (blancos y grises claros)"""
+    frame = frame.copy()
+    pixels = frame.load()
+    for y in range(frame.height):
+        for x in range(frame.width):
+            r, g, b, a = pixels[x, y]
+            if r > 200 and g > 200 and b > 200:
+                pixels[x, y] = (r, g, b, 0)
+            elif abs(r - g) < 30 and abs(r - b) < 30 and abs(g - b) < 30 and r > 180:
+                pixels[x, y] = (r, g, b, 0)
+    return pygame.image.fromstring(frame.tobytes(), frame.size, "RGBA").convert_alpha()
+
+
+def legacy_chaman(frame):
+    """Recorte original de ChamanCharacter/ChamanAttack"""
+    frame = frame.copy()
+    pixel_data = frame.load()
+    for y in range(frame.height):
+        for x in range(frame.width):
+            r, g, b, a = pixel_data[x, y]
+            if r > 240 and g > 240 and b > 240:
+                pixel_data[x, y] = (r, g, b, 0)
+    return pygame.image.fromstring(frame.tobytes(), frame.size, "RGBA").convert_alpha()
+
+
+def decode_frames(path, size=None):
+    """Decodifica todos los frames de un GIF a RGBA (opcionalmente redimensionados)"""
+    gif = Image.open(path)
+    frames = []
+    for frame_num in range(getattr(gif, "n_frames", 1)):
+        gif.seek(frame_num)
+        frame = gif.copy().convert("RGBA")
+        if size:
+            frame = frame.resize(size, Image.LANCZOS)
+        frames.append(frame)
+    return frames
+
+
+def run_case(name, paths, legacy, rule, size=None):
+    """Mide ambos recortes sobre los mismos frames y compara el resultado"""
+    frames = [frame for path in paths if os.path.exists(path) for frame in decode_frames(path, size)]
+    if not frames:
+        print(f"⚠️ {name:<22} sin archivos")
+        return 0.0, 0.0
+
+    start = time.perf_counter()
+    before = [legacy(frame) for frame in frames]
+    before_ms = (time.perf_counter() - start) * 1000
+
+    start = time.perf_counter()
+    after = [frame_to_surface(frame, rule) for frame in frames]
+    after_ms = (time.perf_counter() - start) * 1000
+
+    identical = all(pygame.image.tobytes(a, "RGBA") == pygame.image.tobytes(b, "RGBA")
+                    for a, b in zip(before, after))
+    status = "✅" if identical else "❌"
+    speedup = before_ms / after_ms if after_ms else 0.0
+    print(f"{status} {name:<22} {len(frames):>4} frames | antes {before_ms:9.1f} ms | "
+          f"después {after_ms:7.1f} ms | x{speedup:.0f}")
+    return before_ms, after_ms
+
+
+def load_all_animations():
+    """Crea todos los personajes, ataques y enemigos (carga real de animaciones)"""
+    from adan_attacks import AdanAttack
+    from adan_character_animation import AdanCharacter
+    from chaman_attacks import ChamanAttack
+    from chaman_character_animation import ChamanCharacter
+    from juan_attacks import JuanAttack
+    from juan_character_animation import JuanCharacter
+    from worm_enemy import WormEnemy
+
+    with contextlib.redirect_stdout(io.StringIO()):  # Silenciar los mensajes de carga
+        juan = JuanCharacter(0, 0)
+        adan = AdanCharacter(0, 0)
+        JuanAttack(juan)
+        AdanAttack(adan)
+        chaman = ChamanCharacter(0, 0)
+        ChamanAttack(chaman)
+        WormEnemy(0, 0)
+
+
+def run_startup_case():
+    """Compara el arranque en frío y en caliente con una caché en disco temporal"""
+    lazy_animations.LAZY_ANIMATIONS = False  # Medir la carga completa
+    with tempfile.TemporaryDirectory() as cache_dir:
+        disk_cache = DiskFrameCache(cache_dir)
+        sprite_cache._disk_frame_cache = disk_cache
+        timings = []
+        for _ in range(2):
+            sprite_cache.get_sprite_cache().clear()  # Simula un proceso nuevo
+            start = time.perf_counter()
+            load_all_animations()
+            timings.append((time.perf_counter() - start) * 1000)
+        sprite_cache._disk_frame_cache = None
+    lazy_animations.LAZY_ANIMATIONS = LAZY_ANIMATIONS
+
+    cold_ms, warm_ms = timings
+    print(f"🧊 En frío   {cold_ms:8.1f} ms (escrituras en disco: {disk_cache.writes})")
+    print(f"🔥 En caliente {warm_ms:6.1f} ms (aciertos en disco: {disk_cache.hits}) | x{cold_ms / warm_ms:.1f}")
+
+
+def run_preload_case():
+    """Compara la decodificación secuencial con la precarga en hilos (sin caché en disco)"""
+    requests = [request for request in level_2_requests(lazy=False) if os.path.exists(request.path)]
+    disk_cache = sprite_cache._disk_frame_cache
+    sprite_cache._disk_frame_cache = None
+    sprite_cache.SPRITE_DISK_CACHE = False
+    try:
+        start = time.perf_counter()
+        for request in requests:
+            decode_gif_frames(*request)
+        serial_ms = (time.perf_counter() - start) * 1000
+
+        sprite_cache.get_sprite_cache().clear()
+        preloader = AssetPreloader(requests)
+        start = time.perf_counter()
+        preloader.run()
+        parallel_ms = (time.perf_counter() - start) * 1000
+    finally:
+        sprite_cache.SPRITE_DISK_CACHE = SPRITE_DISK_CACHE
+        sprite_cache._disk_frame_cache = disk_cache
+        sprite_cache.get_sprite_cache().clear()
+
+    print(f"🐢 Secuencial {serial_ms:8.1f} ms ({len(requests)} animaciones)")
+    print(f"🚀 En paralelo {parallel_ms:7.1f} ms ({preloader.workers} hilos, {os.cpu_count()} núcleos) | "
+          f"x{serial_ms / parallel_ms:.1f}")
+
+
+def run_lazy_case():
+    """Tiempo hasta tener todos los personajes listos para dibujar: carga completa vs diferida"""
+    disk_cache = sprite_cache._disk_frame_cache
+    sprite_cache._disk_frame_cache = None
+    sprite_cache.SPRITE_DISK_CACHE = False
+    timings = []
+    try:
+        for lazy in (False, True):
+            lazy_animations.LAZY_ANIMATIONS = lazy
+            sprite_cache.get_sprite_cache().clear()
+            start = time.perf_counter()
+            load_all_animations()
+            timings.append((time.perf_counter() - start) * 1000)
+        prefetcher = lazy_animations.get_animation_prefetcher()
+        prefetcher.wait_idle()
+        prefetch_ms = (time.perf_counter() - start) * 1000
+    finally:
+        lazy_animations.LAZY_ANIMATIONS = LAZY_ANIMATIONS
+        sprite_cache.SPRITE_DISK_CACHE = SPRITE_DISK_CACHE
+        sprite_cache._disk_frame_cache = disk_cache
+        sprite_cache.get_sprite_cache().clear()
+
+    eager_ms, lazy_ms = timings
+    print(f"📦 Todo por adelantado {eager_ms:8.1f} ms")
+    print(f"💤 Diferida            {lazy_ms:8.1f} ms | x{eager_ms / lazy_ms:.1f} "
+          f"(prefetch terminado a los {prefetch_ms:.1f} ms, {prefetcher.decoded} GIFs)")
+
+
+def main():
+    pygame.init()
+    pygame.display.set_mode((1, 1))
+    print("⏱️ BENCHMARK DE SPRITES")
+    print("=" * 50)
+    if not NUMPY_AVAILABLE:
+        print("⚠️ NumPy no disponible, el recorte usa el respaldo píxel por píxel")
+    print()
+
+    cases = [
+        ("Juan (movimiento)", [f"assets/characters/juan/animations/{d}.gif" for d in DIRECTIONS],
+         legacy_character, KEY_CHARACTER, None),
+        ("Adán (movimiento)", [f"assets/characters/adan/animations/{d}.gif" for d in DIRECTIONS],
+         legacy_character, KEY_CHARACTER, None),
+        ("Juan (ataques)", [f"assets/characters/juan/attacks/{d}.gif" for d in DIRECTIONS],
+         legacy_attack, KEY_ATTACK, None),
+        ("Adán (ataques)", [f"assets/characters/adan/attacks/{d}.gif" for d in DIRECTIONS],
+         legacy_attack, KEY_ATTACK, None),
+        ("Chamán (movimiento)", [f"assets/characters/chaman/animations/{d}.gif" for d in DIRECTIONS],
+         legacy_chaman, KEY_CHAMAN, (128, 128)),
+        ("Chamán (ataques)", [f"assets/characters/chaman/attacks/{d}.gif" for d in DIRECTIONS],
+         legacy_chaman, KEY_CHAMAN, (128, 128)),
+    ]
+    total_before = total_after = 0.0
+    for name, paths, legacy, rule, size in cases:
+        before_ms, after_ms = run_case(name, paths, legacy, rule, size)
+        total_before += before_ms
+        total_after += after_ms
+
+    print()
+    print(f"📊 Total recorte: antes {total_before:.1f} ms → después {total_after:.1f} ms")
+    print()
+
+    print("💾 Carga de todas las animaciones (caché en disco):")
+    run_startup_case()
+    print()
+
+    print("🧵 Precarga de las animaciones del Nivel 2:")
+    run_preload_case()
+    print()
+
+    print("💤 Primer frame con carga diferida (sin caché en disco):")
+    run_lazy_case()
+
+
+if __name__ == "__main__":
+    main()
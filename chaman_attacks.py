@@ -30,6 +30,11 @@ import math
 import random
 import os
 from PIL import Image
+from effect_cache import get_effect_cache
+from lazy_animations import PREFETCH_BOSS, is_ready, lazy_gif_frames
+from render_scale import canvas_draw
+from sprite_keying import KEY_CHAMAN
+from sprite_variants import get_frame_variants
 
 
 class ChamanAttack:
@@ -89,7 +94,10 @@ class ChamanAttack:
                 frames = self.load_gif_from_url(url)
                 if frames:
                     self.attack_frames[direction] = frames
-                    print(f"✅ Ataque {direction}: {len(frames)} frames")
+                    if is_ready(frames):
+                        print(f"✅ Ataque {direction}: {len(frames)} frames")
+                    else:
+                        print(f"⏳ Ataque {direction} diferido (prefetch en segundo plano)")
                 else:
                     self.create_fallback_attack_frame(direction)
             except Exception as e:
@@ -101,37 +109,9 @@ class ChamanAttack:
     def load_gif_from_url(self, url):
         """Carga un GIF de ataque desde archivo local"""
         try:
-            # Cargar desde archivo local
-            gif = Image.open(url)
-            
-            frames = []
-            frame_count = 0
-            
-            try:
-                while True:
-                    frame_rgba = gif.convert('RGBA')  # RGBA para transparencias
-                    frame_rgba = frame_rgba.resize((128, 128), Image.LANCZOS)
-                    
-                    # Convertir fondo blanco a transparente
-                    pixel_data = frame_rgba.load()
-                    for y in range(frame_rgba.height):
-                        for x in range(frame_rgba.width):
-                            r, g, b, a = pixel_data[x, y]
-                            # Si el pixel es blanco o casi blanco, hacerlo transparente
-                            if r > 240 and g > 240 and b > 240:
-                                pixel_data[x, y] = (r, g, b, 0)  # Transparente
-                    
-                    frame_data = frame_rgba.tobytes()
-                    pygame_surface = pygame.image.fromstring(frame_data, (128, 128), 'RGBA')
-                    pygame_surface = pygame_surface.convert_alpha()
-                    
-                    frames.append(pygame_surface)
-                    frame_count += 1
-                    
-                    gif.seek(gif.tell() + 1)
-                    
-            except EOFError:
-                pass
+            # Frames de 128x128 con el fondo blanco transparente (compartidos si ya se cargaron)
+            # Se decodifican en segundo plano; si se usan antes, se completan en ese momento
+            frames = lazy_gif_frames(url, rule=KEY_CHAMAN, size=(128, 128), priority=PREFETCH_BOSS)
             
             return frames
             
@@ -291,7 +271,7 @@ class ChamanAttack:
         
         self.magic_effects.append(effect)
     
-    def update(self, targets):
+    def update(self, targets, collision_manager=None):
         """Actualiza el sistema de ataques"""
         current_time = pygame.time.get_ticks()
         
@@ -308,25 +288,25 @@ class ChamanAttack:
                     self.attack_animation_frame = int(frame_progress * len(frames)) % len(frames)
         
         # Actualizar proyectiles
-        self.update_projectiles(targets)
+        self.update_projectiles(targets, collision_manager)
         
         # Actualizar efectos mágicos
         self.update_magic_effects()
     
-    def update_projectiles(self, targets):
+    def update_projectiles(self, targets, collision_manager=None):
         """Actualiza todos los proyectiles mágicos"""
+        wall_hits = self.move_projectiles(collision_manager)
+        
         for projectile in self.magic_projectiles[:]:
             if not projectile['active']:
                 continue
             
-            # Mover proyectil
-            old_x, old_y = projectile['x'], projectile['y']
-            projectile['x'] += projectile['velocity_x']
-            projectile['y'] += projectile['velocity_y']
-            
-            # Calcular distancia recorrida
-            distance = math.sqrt((projectile['x'] - old_x)**2 + (projectile['y'] - old_y)**2)
-            projectile['traveled'] += distance
+            # Los proyectiles que chocaron con una pared se deshacen en ella
+            if id(projectile) in wall_hits:
+                self.create_impact_effect(projectile['x'], projectile['y'])
+                projectile['active'] = False
+                self.magic_projectiles.remove(projectile)
+                continue
             
             # Verificar si excedió el rango
             if projectile['traveled'] >= projectile['max_range']:
@@ -357,6 +337,37 @@ class ChamanAttack:
                         print(f"💥 Proyectil mágico impactó a {getattr(target, 'name', 'objetivo')}")
                         break
     
+    def move_projectiles(self, collision_manager=None):
+        """
+        Mueve todos los proyectiles activos en una sola pasada contra el mapa.
+        
+        Returns:
+            Conjunto con el id de los proyectiles que chocaron con una pared
+        """
+        active = [p for p in self.magic_projectiles if p['active']]
+        if not active:
+            return set()
+        
+        if collision_manager is None:
+            resolved = [(p['x'] + p['velocity_x'], p['y'] + p['velocity_y']) for p in active]
+            hits = [(False, False)] * len(active)
+        else:
+            # Rectángulos centrados en el proyectil
+            positions = [(p['x'] - p['size'] // 2, p['y'] - p['size'] // 2) for p in active]
+            sizes = [(p['size'], p['size']) for p in active]
+            velocities = [(p['velocity_x'], p['velocity_y']) for p in active]
+            corners, hits = collision_manager.move_aabbs(positions, sizes, velocities)
+            resolved = [(x + p['size'] // 2, y + p['size'] // 2) for p, (x, y) in zip(active, corners)]
+        
+        wall_hits = set()
+        for projectile, (x, y), (hit_x, hit_y) in zip(active, resolved, hits):
+            # Calcular distancia recorrida
+            projectile['traveled'] += math.sqrt((x - projectile['x'])**2 + (y - projectile['y'])**2)
+            projectile['x'], projectile['y'] = float(x), float(y)
+            if hit_x or hit_y:
+                wall_hits.add(id(projectile))
+        return wall_hits
+    
     def update_magic_effects(self):
         """Actualiza efectos mágicos visuales"""
         current_time = pygame.time.get_ticks()
@@ -415,18 +426,17 @@ class ChamanAttack:
                 if projectile.get('special', False):
                     color = (255, 100, 255)  # Magenta brillante
                     size = projectile['size']
-                    # Efecto de brillo
+                    # Efecto de brillo (capas pre-renderizadas)
                     for i in range(3):
-                        alpha_surface = pygame.Surface((size + i*4, size + i*4), pygame.SRCALPHA)
-                        pygame.draw.circle(alpha_surface, (*color, 100 - i*30), 
-                                         (size//2 + i*2, size//2 + i*2), size//2 + i*2)
-                        screen.blit(alpha_surface, (screen_x - size//2 - i*2, screen_y - size//2 - i*2))
+                        radius = size//2 + i*2
+                        glow_surface = get_effect_cache().circle(radius, color, 100 - i*30)
+                        screen.blit(glow_surface, (screen_x - radius, screen_y - radius))
                 else:
                     color = (150, 0, 255)  # Púrpura
                     size = projectile['size']
-                    pygame.draw.circle(screen, color, (screen_x, screen_y), size//2)
+                    canvas_draw.circle(screen, color, (screen_x, screen_y), size//2)
                     # Núcleo brillante
-                    pygame.draw.circle(screen, (255, 150, 255), (screen_x, screen_y), size//4)
+                    canvas_draw.circle(screen, (255, 150, 255), (screen_x, screen_y), size//4)
         
         # Dibujar efectos mágicos
         for effect in self.magic_effects:
@@ -434,12 +444,8 @@ class ChamanAttack:
             screen_y = int(effect['y'] - camera_y)
             
             if effect['radius'] > 0:
-                # Crear superficie con transparencia
-                effect_surface = pygame.Surface((effect['radius']*2, effect['radius']*2), pygame.SRCALPHA)
-                color_with_alpha = (255, 100, 255, effect['alpha'])
-                pygame.draw.circle(effect_surface, color_with_alpha, 
-                                 (effect['radius'], effect['radius']), effect['radius'])
-                
+                # Anillo semitransparente pre-renderizado (alfa cuantizado)
+                effect_surface = get_effect_cache().circle(effect['radius'], (255, 100, 255), effect['alpha'])
                 screen.blit(effect_surface, (screen_x - effect['radius'], screen_y - effect['radius']))
         
         # Dibujar frame de ataque si está atacando
@@ -448,6 +454,9 @@ class ChamanAttack:
             if attack_frame:
                 screen_x = self.character.x - camera_x
                 screen_y = self.character.y - camera_y
+                # Misma variante (escala y volteo) que dibuja ChamanCharacter.draw
+                attack_frame = get_frame_variants().get(attack_frame, self.character.sprite_scale,
+                                                        self.character.flip_horizontal)
                 screen.blit(attack_frame, (screen_x, screen_y))
     
     def get_projectile_count(self):
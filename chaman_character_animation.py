@@ -7,7 +7,13 @@ Sistema de animaciones para el jefe final del Nivel 2
 import pygame
 import math
 import os
-from PIL import Image
+from sprite_atlas import pack_animations
+from lazy_animations import PREFETCH_BOSS, is_ready, lazy_gif_frames
+from render_scale import canvas_draw
+from sprite_cache import load_gif_frames
+from sprite_keying import KEY_CHAMAN
+from sprite_variants import get_frame_variants
+from text_cache import get_font
 
 
 class ChamanCharacter:
@@ -45,6 +51,7 @@ class ChamanCharacter:
         # Diccionarios para almacenar frames
         self.movement_frames = {"up": [], "down": [], "left": [], "right": []}
         self.frames_loaded = False
+        self.atlas = None
         
         # Cargar animaciones
         self.load_all_animations()
@@ -53,6 +60,7 @@ class ChamanCharacter:
         self.width = 128  # Más grande que los héroes
         self.height = 128
         self.flip_horizontal = False
+        self.sprite_scale = 1.0  # Escala de dibujo (variantes memorizadas, los frames no se tocan)
         
         print(f"🧙 Chamán Malvado creado en ({x}, {y}) - Vida: {self.health}")
     
@@ -60,12 +68,21 @@ class ChamanCharacter:
         """Carga todas las animaciones de movimiento del chamán"""
         print("🎭 Cargando animaciones del Chamán Malvado...")
         
-        for direction, url in self.movement_urls.items():
+        # La dirección inicial se carga ya; el resto se difiere mostrando la inicial mientras tanto
+        first_direction = self.current_direction
+        for direction in sorted(self.movement_urls, key=lambda d: d != first_direction):
+            url = self.movement_urls[direction]
             try:
-                frames = self.load_gif_from_url(url)
+                if direction == first_direction:
+                    frames = self.load_gif_from_url(url)
+                else:
+                    frames = self.load_gif_from_url(url, lazy=True, placeholder=self.movement_frames.get(first_direction))
                 if frames:
                     self.movement_frames[direction] = frames
-                    print(f"✅ Animación {direction}: {len(frames)} frames")
+                    if is_ready(frames):
+                        print(f"✅ Animación {direction}: {len(frames)} frames")
+                    else:
+                        print(f"⏳ Animación {direction} diferida (prefetch en segundo plano)")
                 else:
                     print(f"⚠️ No se pudieron cargar frames para {direction}")
                     self.create_fallback_frame(direction)
@@ -76,53 +93,17 @@ class ChamanCharacter:
         self.frames_loaded = True
         print("🎭 Animaciones del Chamán cargadas completamente")
     
-    def load_gif_from_url(self, url):
-        """Carga un GIF desde archivo local y extrae sus frames"""
+    def load_gif_from_url(self, url, lazy=False, placeholder=None):
+        """Carga un GIF desde archivo local y extrae sus frames (o lo difiere si lazy)"""
         try:
             print(f"📥 Cargando animación desde archivo local...")
-            # Cargar desde archivo local
-            gif = Image.open(url)
-            
-            frames = []
-            frame_count = 0
-            
-            try:
-                while True:
-                    # Convertir frame a RGBA para manejar transparencia
-                    frame_rgba = gif.convert('RGBA')
-                    
-                    # Redimensionar para que sea más imponente (128x128)
-                    try:
-                        if hasattr(Image, 'Resampling'):
-                            frame_rgba = frame_rgba.resize((128, 128), Image.Resampling.LANCZOS)
-                        else:
-                            frame_rgba = frame_rgba.resize((128, 128))
-                    except AttributeError:
-                        frame_rgba = frame_rgba.resize((128, 128))
-                    
-                    # Convertir fondo blanco a transparente
-                    pixel_data = frame_rgba.load()
-                    if pixel_data is not None:
-                        for y in range(frame_rgba.height):
-                            for x in range(frame_rgba.width):
-                                r, g, b, a = pixel_data[x, y]
-                                # Si el pixel es blanco o casi blanco, hacerlo transparente
-                                if r > 240 and g > 240 and b > 240:
-                                    pixel_data[x, y] = (r, g, b, 0)  # Transparente
-                    
-                    # Convertir a pygame surface
-                    frame_data = frame_rgba.tobytes()
-                    pygame_surface = pygame.image.fromstring(frame_data, (128, 128), 'RGBA')
-                    pygame_surface = pygame_surface.convert_alpha()
-                    
-                    frames.append(pygame_surface)
-                    frame_count += 1
-                    
-                    # Ir al siguiente frame
-                    gif.seek(gif.tell() + 1)
-                    
-            except EOFError:
-                pass  # Fin del GIF
+            # Redimensionar a 128x128 (más imponente) y volver transparente el fondo blanco
+            # Los frames se comparten si el chamán se vuelve a crear
+            if lazy:
+                return lazy_gif_frames(url, rule=KEY_CHAMAN, size=(128, 128),
+                                       placeholder=placeholder, priority=PREFETCH_BOSS)
+            frames = load_gif_frames(url, rule=KEY_CHAMAN, size=(128, 128))
+            frame_count = len(frames)
             
             print(f"✅ {frame_count} frames extraídos exitosamente")
             return frames
@@ -131,6 +112,23 @@ class ChamanCharacter:
             print(f"❌ Error procesando GIF: {e}")
             return []
     
+    def pack_atlas(self, attack_system=None):
+        """Empaqueta movimiento y ataques del chamán en un atlas"""
+        groups = {"movimiento": self.movement_frames}
+        if attack_system is not None and getattr(attack_system, 'attack_frames', None):
+            groups["ataque"] = attack_system.attack_frames
+        self.atlas = pack_animations("Chamán", groups)
+        
+        # Variantes de dibujo a la escala actual, mirando a ambos lados
+        variants = get_frame_variants()
+        for animations in groups.values():
+            for frames in animations.values():
+                if not is_ready(frames):
+                    continue  # Diferida: se prepara al dibujarla
+                variants.prepare(frames, self.sprite_scale)
+                variants.prepare(frames, self.sprite_scale, flip=True)
+        return self.atlas
+    
     def create_fallback_frame(self, direction):
         """Crea un frame de respaldo si falla la carga"""
         surface = pygame.Surface((128, 128), pygame.SRCALPHA)
@@ -240,9 +238,8 @@ class ChamanCharacter:
                 current_frame = self.get_current_frame()
             
             if current_frame:
-                # Aplicar flip horizontal si es necesario
-                if self.flip_horizontal:
-                    current_frame = pygame.transform.flip(current_frame, True, False)
+                # Variante escalada y volteada (se genera una sola vez por frame)
+                current_frame = get_frame_variants().get(current_frame, self.sprite_scale, self.flip_horizontal)
                 
                 # Dibujar frame (siempre del mismo tamaño)
                 screen.blit(current_frame, (screen_x, screen_y))
@@ -251,7 +248,7 @@ class ChamanCharacter:
                 self.draw_health_bar(screen, screen_x, screen_y)
             else:
                 # Fallback si no hay frame
-                pygame.draw.rect(screen, (80, 20, 80), 
+                canvas_draw.rect(screen, (80, 20, 80), 
                                (screen_x, screen_y, self.width, self.height))
     
     def draw_health_bar(self, screen, screen_x, screen_y):
@@ -262,7 +259,7 @@ class ChamanCharacter:
         bar_y = screen_y - 15
         
         # Fondo de la barra
-        pygame.draw.rect(screen, (100, 0, 0), (bar_x, bar_y, bar_width, bar_height))
+        canvas_draw.rect(screen, (100, 0, 0), (bar_x, bar_y, bar_width, bar_height))
         
         # Barra de vida
         health_percentage = self.health / self.max_health
@@ -277,13 +274,13 @@ class ChamanCharacter:
             health_color = (255, 0, 0)  # Rojo
         
         if health_width > 0:
-            pygame.draw.rect(screen, health_color, (bar_x, bar_y, health_width, bar_height))
+            canvas_draw.rect(screen, health_color, (bar_x, bar_y, health_width, bar_height))
         
         # Borde de la barra
-        pygame.draw.rect(screen, (255, 255, 255), (bar_x, bar_y, bar_width, bar_height), 1)
+        canvas_draw.rect(screen, (255, 255, 255), (bar_x, bar_y, bar_width, bar_height), 1)
         
         # Texto de vida
-        font = pygame.font.Font(None, 24)
+        font = get_font(24)
         health_text = font.render(f"{self.health}/{self.max_health}", True, (255, 255, 255))
         text_x = screen_x + (self.width - health_text.get_width()) // 2
         text_y = screen_y - 35
@@ -39,17 +39,17 @@ class ChamanMalvado:
         
         print("🧙 Chamán Malvado inicializado")
     
-    def update(self, targets):
+    def update(self, targets, collision_manager=None):
         current_time = pygame.time.get_ticks()
         
         self.x = self.character.x
         self.y = self.character.y
         self.health = self.character.health
         
-        self.attack_system.update(targets)
+        self.attack_system.update(targets, collision_manager)
         
         if current_time - self.state_change_timer >= self.ai_decision_interval:
-            self.update_ai_behavior(targets)
+            self.update_ai_behavior(targets, collision_manager)
             self.state_change_timer = current_time
         
         self.update_movement_by_state(targets)
@@ -57,14 +57,17 @@ class ChamanMalvado:
         ai_direction = self.get_movement_direction(targets)
         self.character.update(ai_controlled=True, ai_direction=ai_direction)
         
+        if collision_manager is not None:
+            self.resolve_collisions(collision_manager)
+        
         self.clean_dead_summons()
     
-    def update_ai_behavior(self, targets):
+    def update_ai_behavior(self, targets, collision_manager=None):
         if not targets:
             self.state = "idle"
             return
         
-        closest_target = self.find_closest_target(targets)
+        closest_target = self.find_closest_target(targets, collision_manager)
         self.target = closest_target
         
         if not closest_target:
@@ -116,14 +119,18 @@ class ChamanMalvado:
         else:
             return "down" if dy > 0 else "up"
     
-    def find_closest_target(self, targets):
+    def find_closest_target(self, targets, collision_manager=None):
         closest = None
         min_distance = float('inf')
+        origin = (self.x + 32, self.y + 32)
         
         for target in targets:
             if hasattr(target, 'health') and target.health > 0:
                 distance = self.get_distance_to_target(target)
-                if distance < min_distance:
+                # Solo objetivos visibles (sin paredes entre medio)
+                if distance < min_distance and (
+                        collision_manager is None or
+                        collision_manager.has_line_of_sight(origin, (target.x + 32, target.y + 32))):
                     min_distance = distance
                     closest = target
         
@@ -144,6 +151,14 @@ class ChamanMalvado:
     def get_rect(self):
         return self.character.get_rect()
     
+    def resolve_collisions(self, collision_manager):
+        """Ajusta el movimiento del chamán de este tick contra los bloques de colisión"""
+        velocity = (self.character.x - self.x, self.character.y - self.y)
+        if not velocity[0] and not velocity[1]:
+            return
+        resolved, _ = collision_manager.move_aabbs([(self.x, self.y)], (100, 100), [velocity])  # 64 * 1.56 = 100
+        self.character.x, self.character.y = float(resolved[0][0]), float(resolved[0][1])
+    
     def check_projectile_collisions(self, targets):
         """Verifica colisiones de proyectiles con objetivos"""
         # El sistema de ataques ya maneja las colisiones en update_projectiles
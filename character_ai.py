@@ -42,7 +42,7 @@ class CharacterAI:
         
         print(f"🤖 IA de {self.character.name} inicializada con configuración agresiva")
     
-    def update(self, enemies):
+    def update(self, enemies, collision_manager=None):
         """Actualiza la lógica de la IA"""
         # No hacer nada si está derribado y no está siendo revivido
         if self.character.health <= 0 and not self.is_being_revived:
@@ -76,8 +76,8 @@ class CharacterAI:
         # Determinar estado según la salud
         health_percent = (self.character.health / self.character.max_health) * 100
         
-        # Buscar enemigos cercanos
-        self.find_nearest_enemy(enemies)
+        # Buscar enemigos cercanos (y visibles)
+        self.find_nearest_enemy(enemies, collision_manager)
         
         # Cambiar estado según condiciones
         if health_percent <= self.low_health_threshold:
@@ -114,15 +114,18 @@ class CharacterAI:
         self.last_x = self.character.x
         self.last_y = self.character.y
     
-    def find_nearest_enemy(self, enemies):
-        """Busca el enemigo más cercano con rango de detección ampliado"""
+    def find_nearest_enemy(self, enemies, collision_manager=None):
+        """Busca el enemigo más cercano y visible con rango de detección ampliado"""
         nearest_enemy = None
         min_distance = float('inf')
+        origin = (self.character.x + 32, self.character.y + 32)
         
         for enemy in enemies:
             if hasattr(enemy, 'alive') and enemy.alive:
                 dist = self.distance_to(enemy.x, enemy.y)
-                if dist < min_distance and dist <= self.detection_range:
+                if (dist < min_distance and dist <= self.detection_range and
+                        (collision_manager is None or
+                         collision_manager.has_line_of_sight(origin, (enemy.x + 32, enemy.y + 32)))):
                     min_distance = dist
                     nearest_enemy = enemy
         
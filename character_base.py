@@ -3,9 +3,13 @@ Clase base para personajes - Elimina duplicación de código
 """
 import pygame
 import os
-from PIL import Image
 from config import *
 from utils import *
+from lazy_animations import PREFETCH_MOVEMENT, is_ready, lazy_gif_frames
+from sprite_atlas import pack_animations
+from sprite_cache import load_gif_frames
+from sprite_keying import KEY_CHARACTER
+from sprite_variants import get_frame_variants
 
 
 class CharacterBase:
@@ -23,6 +27,9 @@ class CharacterBase:
         self.animation_frame = 0
         self.animation_speed = ANIMATION_SPEED
         
+        # Escala de dibujo alineada con los ataques (1.56x); se aplica con variantes memorizadas
+        self.sprite_scale = 1.56
+        
         # Dimensiones del personaje para colisiones y efectos (escaladas como ataques)
         self.width = int(CHARACTER_SIZE[0] * 1.56)
         self.height = int(CHARACTER_SIZE[1] * 1.56)
@@ -45,62 +52,84 @@ class CharacterBase:
         }
         
         self.animations = {}
+        self.atlas = None
         self.load_animations()
     
     def load_animations(self):
         """Carga las animaciones desde archivos locales"""
         print(f"Cargando animaciones de {self.name}...")
         
-        for direction, file_path in self.gif_urls.items():
+        # La animación del primer frame se carga ya; el resto se difiere y la trae el prefetch
+        first_direction = self.animation_direction(self.current_direction)
+        for direction in sorted(self.gif_urls, key=lambda d: d != first_direction):
+            file_path = self.gif_urls[direction]
             try:
                 if not os.path.exists(file_path):
                     print(f"⚠️  Archivo no encontrado: {file_path}")
                     raise FileNotFoundError(f"Archivo no encontrado: {file_path}")
                 
-                gif = Image.open(file_path)
-                frames = []
-                
-                # Usar getattr para evitar errores con n_frames
-                frame_count = getattr(gif, 'n_frames', 1)
-                for frame_num in range(frame_count):
-                    gif.seek(frame_num)
-                    frame = gif.copy().convert("RGBA")
-                    
-                    frame_data = frame.tobytes()
-                    try:
-                        pygame_surface = pygame.image.fromstring(frame_data, frame.size, "RGBA")
-                        pygame_surface = pygame_surface.convert_alpha()
-                        
-                        # Eliminar fondo blanco y colores similares
-                        pygame_surface.set_colorkey((255, 255, 255))  # Blanco puro
-                        pygame_surface.set_colorkey((254, 254, 254))  # Casi blanco
-                        pygame_surface.set_colorkey((253, 253, 253))  # Gris muy claro
-                        
-                        # Procesar píxel por píxel para eliminar fondos blancos/claros
-                        width, height = pygame_surface.get_size()
-                        for x in range(width):
-                            for y in range(height):
-                                pixel = pygame_surface.get_at((x, y))
-                                # Si el píxel es muy claro (fondo), hacerlo transparente
-                                if pixel[0] > 250 and pixel[1] > 250 and pixel[2] > 250:
-                                    pygame_surface.set_at((x, y), (0, 0, 0, 0))
-                                    
-                    except pygame.error as e:
-                        print(f"⚠️  Error convirtiendo frame {frame_num} de {direction}: {e}")
-                        # Crear un sprite temporal para debug
-                        pygame_surface = pygame.Surface(frame.size, pygame.SRCALPHA)
-                        pygame_surface.fill((255, 0, 255, 128))  # Magenta semi-transparente para debug
-                    
-                    frames.append(pygame_surface)
+                # Eliminar fondo blanco y colores muy claros (gris muy claro como colorkey)
+                # Los frames se comparten entre niveles: solo se decodifican la primera vez
+                if direction == first_direction:
+                    frames = load_gif_frames(file_path, rule=KEY_CHARACTER, colorkey=(253, 253, 253))
+                else:
+                    # Mientras tanto se muestra la animación inicial
+                    frames = lazy_gif_frames(file_path, rule=KEY_CHARACTER, colorkey=(253, 253, 253),
+                                             placeholder=self.animations.get(first_direction),
+                                             priority=PREFETCH_MOVEMENT)
                 
                 self.animations[direction] = frames
-                print(f"✅ Cargada animación {direction}: {len(frames)} frames")
+                if is_ready(frames):
+                    print(f"✅ Cargada animación {direction}: {len(frames)} frames")
+                else:
+                    print(f"⏳ Animación {direction} diferida (prefetch en segundo plano)")
                 
             except Exception as e:
                 print(f"❌ Error cargando {direction}: {e}")
                 # Crear animación de respaldo
                 self.animations[direction] = [self.create_fallback_sprite()]
     
+    def pack_atlas(self, attack_system=None):
+        """Empaqueta movimiento y ataques del personaje en un atlas compartido"""
+        groups = {"movimiento": self.animations}
+        if attack_system is not None and getattr(attack_system, 'attack_animations', None):
+            groups["ataque"] = attack_system.attack_animations
+        self.atlas = pack_animations(self.name, groups)
+        self.prepare_variants()
+        return self.atlas
+    
+    def animation_direction(self, direction):
+        """Animación que se dibuja para una dirección de movimiento"""
+        if self.name == "Juan":
+            # Invertir SOLO las direcciones arriba/abajo para Juan
+            direction_map = {
+                "up": "down",    # Cuando va arriba, usa animación de abajo
+                "down": "up",    # Cuando va abajo, usa animación de arriba
+                "left": "left",  # Izquierda se mantiene
+                "right": "right" # Derecha se mantiene
+            }
+            return direction_map.get(direction, direction)
+        # Adán usa direcciones normales
+        return direction
+    
+    def should_flip(self, direction):
+        """Indica si los frames de una dirección se dibujan volteados (según configuración)"""
+        if self.name == "Juan" and JUAN_FLIP_HORIZONTAL:
+            # Solo invertir horizontalmente si los sprites left/right están mirando al lado contrario
+            return direction in ["left", "right"]
+        if self.name == "Adán" and ADAN_FLIP_HORIZONTAL:
+            # Adán normalmente no necesita corrección, pero disponible por configuración
+            return direction in ["left", "right"]
+        return False
+    
+    def prepare_variants(self):
+        """Genera de antemano las variantes escaladas/volteadas que usa draw"""
+        variants = get_frame_variants()
+        for direction, frames in self.animations.items():
+            # Las direcciones diferidas todavía tienen el marcador: se preparan al dibujarlas
+            if is_ready(frames):
+                variants.prepare(frames, self.sprite_scale, self.should_flip(direction))
+    
     def create_fallback_sprite(self):
         """Crea un sprite de respaldo si falla la carga"""
         try:
@@ -162,52 +191,20 @@ class CharacterBase:
         screen_y = self.y - camera_y
         
         # Obtener frame actual con inversión especial para Juan en direcciones verticales
-        if self.name == "Juan":
-            # Invertir SOLO las direcciones arriba/abajo para Juan
-            direction_map = {
-                "up": "down",    # Cuando va arriba, usa animación de abajo
-                "down": "up",    # Cuando va abajo, usa animación de arriba
-                "left": "left",  # Izquierda se mantiene
-                "right": "right" # Derecha se mantiene
-            }
-            animation_direction = direction_map.get(self.current_direction, self.current_direction)
-        else:
-            # Adán usa direcciones normales
-            animation_direction = self.current_direction
+        animation_direction = self.animation_direction(self.current_direction)
         
         current_animation = self.animations.get(animation_direction, [])
         if current_animation:
             frame_index = int(self.animation_frame) % len(current_animation)
             current_frame = current_animation[frame_index]
             
-            # Escalar a tamaño final alineado con ataques (1.56x como los ataques)
-            original_size = current_frame.get_size()
-            scaled_size = (int(original_size[0] * 1.56), int(original_size[1] * 1.56))
-            scaled_frame = pygame.transform.scale(current_frame, scaled_size)
-            
-            # CORREGIDO: Solo invertir horizontalmente para Juan usando configuración
-            # Las direcciones up/down ahora funcionan correctamente
-            should_flip = False
-            if self.name == "Juan" and JUAN_FLIP_HORIZONTAL:
-                # Solo invertir horizontalmente si los sprites left/right están mirando al lado contrario
-                if self.current_direction in ["left", "right"]:
-                    should_flip = True
-            elif self.name == "Adán" and ADAN_FLIP_HORIZONTAL:
-                # Adán normalmente no necesita corrección, pero disponible por configuración
-                if self.current_direction in ["left", "right"]:
-                    should_flip = True
-            
-            if should_flip:
-                scaled_frame = pygame.transform.flip(scaled_frame, True, False)
-            
-            # Efecto de invulnerabilidad
-            if self.invulnerable and (self.invulnerable_time // 100) % 2:
-                # Hacer el sprite semi-transparente
-                temp_surface = scaled_frame.copy()
-                temp_surface.set_alpha(128)
-                screen.blit(temp_surface, (screen_x, screen_y))
-            else:
-                screen.blit(scaled_frame, (screen_x, screen_y))
+            # Variante escalada (1.56x como los ataques) y, según configuración, volteada;
+            # semitransparente durante la invulnerabilidad. Se generan una sola vez por frame
+            blinking = self.invulnerable and (self.invulnerable_time // 100) % 2
+            frame = get_frame_variants().get(current_frame, self.sprite_scale,
+                                             self.should_flip(self.current_direction),
+                                             128 if blinking else None)
+            screen.blit(frame, (screen_x, screen_y))
     
     def take_damage(self, damage):
         """El personaje recibe daño"""
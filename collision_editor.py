@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+COLLISION EDITOR - La Tierra de las Manzanas
+Utilidades compartidas por los editores de colisión de ambos niveles:
+- cells_in_rect: celdas de la grilla que cubre un rectángulo arrastrado
+- EditorHistory: deshacer/rehacer por lotes (cada entrada guarda solo
+  las celdas que cambiaron)
+- CollisionOverlay: capa transparente del tamaño del mundo con los bloques
+  pre-dibujados; solo se redibujan las celdas que cambian y cada frame es
+  un único blit recortado a la vista
+"""
+
+import pygame
+from collections import deque
+from typing import Container, Iterable, List, Optional, Tuple
+from config import *
+
+Cell = Tuple[int, int]
+CellChange = Tuple[Tuple[Cell, ...], Tuple[Cell, ...]]
+
+
+def cells_in_rect(start_x: float, start_y: float, end_x: float, end_y: float, cell_size: int) -> List[Cell]:
+    """
+    Obtiene las celdas que cubre el rectángulo entre dos puntos (en cualquier orden).
+
+    Returns:
+        Lista de celdas (columna, fila)
+    """
+    first_col, last_col = sorted((int(start_x // cell_size), int(end_x // cell_size)))
+    first_row, last_row = sorted((int(start_y // cell_size), int(end_y // cell_size)))
+    return [(col, row)
+            for col in range(first_col, last_col + 1)
+            for row in range(first_row, last_row + 1)]
+
+
+class EditorHistory:
+    """Historial de deshacer/rehacer del editor de colisiones"""
+
+    def __init__(self, limit: int = EDITOR_HISTORY_LIMIT):
+        """Crea un historial vacío que guarda hasta `limit` operaciones"""
+        self.undo_stack = deque(maxlen=limit)
+        self.redo_stack: List[CellChange] = []
+
+    def push(self, added: List[Cell], removed: List[Cell]) -> None:
+        """Registra una operación nueva (descarta lo que se podía rehacer)"""
+        if not added and not removed:
+            return
+        self.undo_stack.append((tuple(added), tuple(removed)))
+        self.redo_stack.clear()
+
+    def undo(self) -> Optional[CellChange]:
+        """Saca la última operación para deshacerla (queda disponible para rehacer)"""
+        if not self.undo_stack:
+            return None
+        change = self.undo_stack.pop()
+        self.redo_stack.append(change)
+        return change
+
+    def redo(self) -> Optional[CellChange]:
+        """Saca la última operación deshecha para volver a aplicarla"""
+        if not self.redo_stack:
+            return None
+        change = self.redo_stack.pop()
+        self.undo_stack.append(change)
+        return change
+
+    def clear(self) -> None:
+        """Vacía el historial"""
+        self.undo_stack.clear()
+        self.redo_stack.clear()
+
+
+class CollisionOverlay:
+    """Capa pre-renderizada con los bloques de colisión del editor"""
+
+    def __init__(self, world_width: int, world_height: int, cell_size: int = COLLISION_BLOCK_SIZE):
+        """
+        Crea la capa (se dibuja la primera vez que se necesita).
+
+        Args:
+            world_width: Ancho del mundo en píxeles
+            world_height: Alto del mundo en píxeles
+            cell_size: Tamaño de celda en píxeles
+        """
+        self.world_width = world_width
+        self.world_height = world_height
+        self.cell_size = cell_size
+        self.layer: Optional[pygame.Surface] = None
+        self.needs_rebuild = True
+        self.layer_changed = False  # Para descartar copias escaladas de la capa (render_scale)
+
+    def invalidate(self) -> None:
+        """Marca la capa para redibujarla completa (p. ej. tras cargar un mapa)"""
+        self.needs_rebuild = True
+
+    def rebuild(self, occupied: Container[Cell]) -> None:
+        """Dibuja todas las celdas ocupadas en una capa nueva"""
+        if self.layer is None:
+            self.layer = pygame.Surface((self.world_width, self.world_height), pygame.SRCALPHA)
+        self.layer.fill((0, 0, 0, 0))
+        for cell in occupied:
+            self._draw_cell(cell, occupied)
+        self.needs_rebuild = False
+        self.layer_changed = True
+
+    def update_cells(self, cells: Iterable[Cell], occupied: Container[Cell]) -> None:
+        """
+        Redibuja solo las celdas que cambiaron y sus vecinas (por el contorno).
+
+        Args:
+            cells: Celdas añadidas o eliminadas
+            occupied: Conjunto de celdas ocupadas tras el cambio
+        """
+        if self.layer is None or self.needs_rebuild:
+            return  # Se dibujará completa en el próximo frame
+        dirty = set()
+        for col, row in cells:
+            dirty.update(((col, row), (col - 1, row), (col + 1, row), (col, row - 1), (col, row + 1)))
+        for cell in dirty:
+            self._draw_cell(cell, occupied)
+        self.layer_changed = True
+
+    def _draw_cell(self, cell: Cell, occupied: Container[Cell]) -> None:
+        """Dibuja una celda con borde solo en los lados que dan a celdas libres"""
+        size = self.cell_size
+        col, row = cell
+        x, y = col * size, row * size
+        if cell not in occupied:
+            self.layer.fill((0, 0, 0, 0), (x, y, size, size))
+            return
+
+        # fill() escribe los píxeles sin mezclar, así la celda queda igual sin importar lo que hubiera
+        self.layer.fill(EDITOR_OVERLAY_COLOR, (x, y, size, size))
+        border = EDITOR_OVERLAY_BORDER
+        edge_color = EDITOR_OVERLAY_COLOR[:3]
+        if (col - 1, row) not in occupied:
+            self.layer.fill(edge_color, (x, y, border, size))
+        if (col + 1, row) not in occupied:
+            self.layer.fill(edge_color, (x + size - border, y, border, size))
+        if (col, row - 1) not in occupied:
+            self.layer.fill(edge_color, (x, y, size, border))
+        if (col, row + 1) not in occupied:
+            self.layer.fill(edge_color, (x, y + size - border, size, border))
+
+    def draw(self, screen: pygame.Surface, camera_x: float, camera_y: float, occupied: Container[Cell]) -> None:
+        """Dibuja la parte visible de la capa con un único blit"""
+        if self.layer is None or self.needs_rebuild:
+            self.rebuild(occupied)
+        if self.layer_changed:
+            # Un lienzo de resolución interna guarda la capa escalada: hay que rehacerla
+            forget = getattr(screen, "forget", None)
+            if forget:
+                forget(self.layer)
+            self.layer_changed = False
+        view = pygame.Rect(int(camera_x), int(camera_y), screen.get_width(), screen.get_height())
+        clipped = view.clip(self.layer.get_rect())
+        if clipped.width and clipped.height:
+            screen.blit(self.layer, (clipped.x - int(camera_x), clipped.y - int(camera_y)), clipped)
@@ -0,0 +1,280 @@
+#!/usr/bin/env python3
+"""
+COLLISION FORMAT - La Tierra de las Manzanas
+Formato binario versionado para los mapas de colisión de ambos niveles:
+- Cabecera fija (magic, versión, codificación, tamaño de celda, dimensiones)
+- Cuerpo como bit-grid empaquetado o como pares int16 (columna, fila),
+  se elige automáticamente el más pequeño
+- Lectura con mmap + numpy.frombuffer, sin parsear bloque por bloque
+- Conversión desde los formatos anteriores (txt x,y,w,h y json del editor)
+
+Uso:
+    python collision_format.py convertir [origen destino]
+    python collision_format.py medir
+"""
+
+import json
+import mmap
+import os
+import struct
+import sys
+import time
+from array import array
+from typing import Iterable, List, Tuple
+from config import *
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    np = None
+    NUMPY_AVAILABLE = False
+
+COLLISION_FORMAT_MAGIC = b"MZCL"
+COLLISION_FORMAT_VERSION = 1
+ENCODING_BITGRID = 0
+ENCODING_CELL_PAIRS = 1
+
+# magic, versión, codificación, tamaño de celda, columnas, filas, cantidad de celdas
+HEADER = struct.Struct("<4sHHHHHI")
+
+# Pares (formato anterior, formato binario) usados por el conversor por defecto
+DEFAULT_CONVERSIONS = [
+    ("save_data/collision_blocks.json", "save_data/collision_blocks.bin"),
+    ("collision_data_nivel2.txt", "collision_data_nivel2.bin"),
+]
+
+
+def blocks_to_cells(blocks: Iterable[Tuple[int, ...]], cell_size: int = COLLISION_BLOCK_SIZE) -> List[Tuple[int, int]]:
+    """
+    Convierte bloques en coordenadas de celda únicas.
+
+    Args:
+        blocks: Tuplas (x, y) o (x, y, ancho, alto) en píxeles
+        cell_size: Tamaño de celda en píxeles
+
+    Returns:
+        Lista ordenada de celdas (columna, fila)
+    """
+    cells = set()
+    for block in blocks:
+        x, y = int(block[0]), int(block[1])
+        width = int(block[2]) if len(block) > 2 else cell_size
+        height = int(block[3]) if len(block) > 3 else cell_size
+        for col in range(x // cell_size, (x + width - 1) // cell_size + 1):
+            for row in range(y // cell_size, (y + height - 1) // cell_size + 1):
+                cells.add((col, row))
+    return sorted(cells, key=lambda cell: (cell[1], cell[0]))
+
+
+def encode_collision_cells(cells: List[Tuple[int, int]], cell_size: int = COLLISION_BLOCK_SIZE) -> bytes:
+    """Codifica celdas en el formato binario (cabecera + cuerpo)"""
+    count = len(cells)
+    cols = max((col for col, _ in cells), default=-1) + 1
+    rows = max((row for _, row in cells), default=-1) + 1
+    grid_bytes = (cols * rows + 7) // 8
+    fits_grid = all(col >= 0 and row >= 0 for col, row in cells) and cols <= 0xFFFF and rows <= 0xFFFF
+
+    if fits_grid and grid_bytes <= count * 4:
+        body = bytearray(grid_bytes)
+        for col, row in cells:
+            index = row * cols + col
+            body[index >> 3] |= 0x80 >> (index & 7)
+        encoding = ENCODING_BITGRID
+    else:
+        pairs = array("h")
+        for col, row in cells:
+            pairs.extend((col, row))
+        if sys.byteorder != "little":
+            pairs.byteswap()
+        body = pairs.tobytes()
+        encoding = ENCODING_CELL_PAIRS
+        cols = min(cols, 0xFFFF)
+        rows = min(rows, 0xFFFF)
+
+    header = HEADER.pack(COLLISION_FORMAT_MAGIC, COLLISION_FORMAT_VERSION, encoding,
+                         cell_size, cols, rows, count)
+    return header + bytes(body)
+
+
+def write_collision_file(path: str, blocks: Iterable[Tuple[int, ...]],
+                         cell_size: int = COLLISION_BLOCK_SIZE) -> int:
+    """
+    Escribe un mapa de colisión binario de forma atómica.
+
+    Args:
+        path: Archivo de destino
+        blocks: Tuplas (x, y) o (x, y, ancho, alto) en píxeles
+        cell_size: Tamaño de celda en píxeles
+
+    Returns:
+        Cantidad de bytes escritos
+    """
+    data = encode_collision_cells(blocks_to_cells(blocks, cell_size), cell_size)
+    temp_path = path + ".tmp"
+    with open(temp_path, "wb") as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temp_path, path)
+    return len(data)
+
+
+def _decode_body(buffer, encoding: int, cols: int, rows: int, count: int):
+    """Decodifica el cuerpo a un arreglo (N, 2) de celdas (columna, fila)"""
+    offset = HEADER.size
+    if encoding == ENCODING_BITGRID:
+        packed = np.frombuffer(buffer, dtype=np.uint8, count=(cols * rows + 7) // 8, offset=offset)
+        bits = np.unpackbits(packed, count=cols * rows).reshape(rows, cols)
+        rows_idx, cols_idx = np.nonzero(bits)
+        return np.column_stack((cols_idx, rows_idx)).astype(np.int32)
+    if encoding == ENCODING_CELL_PAIRS:
+        pairs = np.frombuffer(buffer, dtype="<i2", count=count * 2, offset=offset)
+        return pairs.reshape(-1, 2).astype(np.int32)
+    raise ValueError(f"Codificación desconocida: {encoding}")
+
+
+def _decode_body_python(data: bytes, encoding: int, cols: int, rows: int, count: int) -> List[Tuple[int, int]]:
+    """Decodificación sin NumPy (más lenta, solo como respaldo)"""
+    body = data[HEADER.size:]
+    cells = []
+    if encoding == ENCODING_BITGRID:
+        for byte_index, byte in enumerate(body):
+            if not byte:
+                continue
+            for bit in range(8):
+                if byte & (0x80 >> bit):
+                    index = byte_index * 8 + bit
+                    if index < cols * rows:
+                        cells.append((index % cols, index // cols))
+        return cells
+    if encoding == ENCODING_CELL_PAIRS:
+        pairs = array("h")
+        pairs.frombytes(body[:count * 4])
+        if sys.byteorder != "little":
+            pairs.byteswap()
+        return list(zip(pairs[0::2], pairs[1::2]))
+    raise ValueError(f"Codificación desconocida: {encoding}")
+
+
+def read_collision_cells(path: str):
+    """
+    Lee un mapa de colisión binario.
+
+    Args:
+        path: Archivo binario a leer
+
+    Returns:
+        Tupla (celdas, tamaño de celda). Con NumPy las celdas son un arreglo
+        (N, 2) de int32; sin NumPy, una lista de tuplas (columna, fila)
+    """
+    with open(path, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        if size < HEADER.size:
+            raise ValueError(f"Archivo de colisión demasiado corto: {path}")
+
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            magic, version, encoding, cell_size, cols, rows, count = HEADER.unpack_from(mapped, 0)
+            if magic != COLLISION_FORMAT_MAGIC:
+                raise ValueError(f"Archivo de colisión inválido: {path}")
+            if version > COLLISION_FORMAT_VERSION:
+                raise ValueError(f"Versión de formato no soportada ({version}): {path}")
+
+            if NUMPY_AVAILABLE:
+                # _decode_body devuelve una copia, así el mmap puede cerrarse
+                cells = _decode_body(mapped, encoding, cols, rows, count)
+            else:
+                cells = _decode_body_python(mapped[:], encoding, cols, rows, count)
+    return cells, cell_size
+
+
+def read_collision_positions(path: str) -> List[Tuple[int, int]]:
+    """Lee un mapa binario y devuelve las esquinas (x, y) de cada bloque en píxeles"""
+    cells, cell_size = read_collision_cells(path)
+    if NUMPY_AVAILABLE:
+        return [tuple(position) for position in (cells * cell_size).tolist()]
+    return [(col * cell_size, row * cell_size) for col, row in cells]
+
+
+def load_legacy_blocks(path: str) -> List[Tuple[int, ...]]:
+    """
+    Carga bloques de los formatos anteriores.
+
+    Args:
+        path: Archivo .json del editor ({"blocks": [{"x", "y"}]}) o .txt (x,y,w,h)
+
+    Returns:
+        Lista de tuplas (x, y) o (x, y, ancho, alto)
+    """
+    if path.endswith(".json"):
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        return [(int(b["x"]), int(b["y"])) for b in data.get("blocks", [])]
+
+    blocks = []
+    with open(path, "r", encoding="utf-8", errors="ignore") as f:
+        for line in f:
+            line = line.strip()
+            if line and not line.startswith("#"):
+                blocks.append(tuple(map(int, line.split(","))))
+    return blocks
+
+
+def convert_legacy_file(source: str, destination: str) -> int:
+    """Convierte un archivo de colisión antiguo al formato binario"""
+    blocks = load_legacy_blocks(source)
+    written = write_collision_file(destination, blocks)
+    print(f"✅ {source} → {destination}: {len(blocks)} bloques, {written} bytes")
+    return written
+
+
+def measure_formats() -> None:
+    """Compara tamaño y tiempo de carga de los formatos anterior y binario"""
+    repetitions = 50
+    print("⏱️ FORMATOS DE MAPA DE COLISIÓN")
+    print("=" * 50)
+    for source, destination in DEFAULT_CONVERSIONS + [("collision_data.txt", "collision_data.bin")]:
+        if not os.path.exists(source):
+            print(f"⚠️ No existe {source}")
+            continue
+        temp_binary = destination + ".medicion"
+        write_collision_file(temp_binary, load_legacy_blocks(source))
+
+        start = time.perf_counter()
+        for _ in range(repetitions):
+            legacy_blocks = load_legacy_blocks(source)
+        legacy_ms = (time.perf_counter() - start) / repetitions * 1000
+
+        start = time.perf_counter()
+        for _ in range(repetitions):
+            cells, _ = read_collision_cells(temp_binary)
+        binary_ms = (time.perf_counter() - start) / repetitions * 1000
+
+        legacy_size = os.path.getsize(source)
+        binary_size = os.path.getsize(temp_binary)
+        os.remove(temp_binary)
+
+        print(f"📄 {source}: {len(legacy_blocks)} bloques")
+        print(f"   anterior: {legacy_size:>8} bytes, {legacy_ms:7.3f} ms")
+        print(f"   binario:  {binary_size:>8} bytes, {binary_ms:7.3f} ms "
+              f"({len(cells)} celdas, x{legacy_size / max(binary_size, 1):.0f} más pequeño, "
+              f"x{legacy_ms / max(binary_ms, 1e-9):.0f} más rápido)")
+
+
+def main(argv: List[str]) -> None:
+    if len(argv) >= 1 and argv[0] == "medir":
+        measure_formats()
+    elif len(argv) == 3 and argv[0] == "convertir":
+        convert_legacy_file(argv[1], argv[2])
+    elif len(argv) == 1 and argv[0] == "convertir":
+        for source, destination in DEFAULT_CONVERSIONS:
+            if os.path.exists(source):
+                convert_legacy_file(source, destination)
+            else:
+                print(f"⚠️ No existe {source}, se omite")
+    else:
+        print(__doc__)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
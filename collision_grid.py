@@ -0,0 +1,760 @@
+#!/usr/bin/env python3
+"""
+COLLISION GRID - La Tierra de las Manzanas
+Estructuras de consulta para los bloques de colisión:
+- SpatialHashGrid: cada bloque se registra en las celdas que cubre su rectángulo
+  y las consultas solo revisan las celdas que toca el rectángulo consultado
+- OccupancyGrid: mapa de ocupación en NumPy con tabla de áreas sumadas,
+  "¿este rectángulo toca algo?" se responde con cuatro lecturas
+- merge_cells: fusiona celdas contiguas en rectángulos maximales
+- CollisionIndex: combina todo según COLLISION_ENGINE y COLLISION_MERGE_BLOCKS,
+  y resuelve movimientos barriendo cada eje por separado (deslizamiento por paredes)
+- Raycast DDA sobre la grilla y línea de visión memorizada por tick
+"""
+
+import math
+import pygame
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from config import *
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    np = None
+    NUMPY_AVAILABLE = False
+
+
+class SpatialHashGrid:
+    """Agrupa bloques de colisión en celdas para consultas rápidas"""
+
+    def __init__(self, cell_size: int = SPATIAL_HASH_CELL_SIZE):
+        """Inicializa el hash espacial con el tamaño de celda indicado"""
+        self.cell_size = cell_size
+        self.cells: Dict[Tuple[int, int], List[Any]] = {}
+        self.block_count = 0
+
+    def _cell_range(self, rect: pygame.Rect) -> Tuple[int, int, int, int]:
+        """Obtiene el rango de celdas (inclusivo) que cubre un rectángulo"""
+        size = self.cell_size
+        first_x = rect.left // size
+        first_y = rect.top // size
+        last_x = (rect.right - 1) // size
+        last_y = (rect.bottom - 1) // size
+        return first_x, first_y, last_x, last_y
+
+    def insert(self, block) -> None:
+        """Registra un bloque en todas las celdas que ocupa"""
+        first_x, first_y, last_x, last_y = self._cell_range(block.rect)
+        for cell_x in range(first_x, last_x + 1):
+            for cell_y in range(first_y, last_y + 1):
+                self.cells.setdefault((cell_x, cell_y), []).append(block)
+        self.block_count += 1
+
+    def remove(self, block) -> bool:
+        """Elimina un bloque de las celdas que ocupa"""
+        removed = False
+        first_x, first_y, last_x, last_y = self._cell_range(block.rect)
+        for cell_x in range(first_x, last_x + 1):
+            for cell_y in range(first_y, last_y + 1):
+                bucket = self.cells.get((cell_x, cell_y))
+                if bucket and block in bucket:
+                    bucket.remove(block)
+                    removed = True
+                    if not bucket:
+                        del self.cells[(cell_x, cell_y)]
+        if removed:
+            self.block_count -= 1
+        return removed
+
+    def clear(self) -> None:
+        """Vacía todas las celdas"""
+        self.cells.clear()
+        self.block_count = 0
+
+    def rebuild(self, blocks: Iterable) -> None:
+        """Reconstruye el hash completo a partir de una lista de bloques"""
+        self.clear()
+        for block in blocks:
+            self.insert(block)
+
+    def collides(self, rect: pygame.Rect) -> bool:
+        """Verifica si el rectángulo toca algún bloque registrado"""
+        if rect.width <= 0 or rect.height <= 0:
+            return False
+        first_x, first_y, last_x, last_y = self._cell_range(rect)
+        cells = self.cells
+        for cell_x in range(first_x, last_x + 1):
+            for cell_y in range(first_y, last_y + 1):
+                for block in cells.get((cell_x, cell_y), ()):
+                    if rect.colliderect(block.rect):
+                        return True
+        return False
+
+    def query_rect(self, rect: pygame.Rect) -> List[Any]:
+        """Obtiene los bloques que colisionan con el rectángulo (sin duplicados)"""
+        found = []
+        if rect.width <= 0 or rect.height <= 0:
+            return found
+        seen = set()
+        first_x, first_y, last_x, last_y = self._cell_range(rect)
+        for cell_x in range(first_x, last_x + 1):
+            for cell_y in range(first_y, last_y + 1):
+                for block in self.cells.get((cell_x, cell_y), ()):
+                    if id(block) not in seen and rect.colliderect(block.rect):
+                        seen.add(id(block))
+                        found.append(block)
+        return found
+
+    def query_point(self, x: int, y: int) -> List[Any]:
+        """Obtiene los bloques que contienen el punto indicado"""
+        bucket = self.cells.get((int(x) // self.cell_size, int(y) // self.cell_size), ())
+        return [block for block in bucket if block.rect.collidepoint(x, y)]
+
+    def find_block_at(self, x: int, y: int):
+        """Obtiene el bloque cuya esquina superior izquierda es (x, y), si existe"""
+        for block in self.query_point(x, y):
+            if block.x == x and block.y == y:
+                return block
+        return None
+
+    def __len__(self) -> int:
+        return self.block_count
+
+
+class OccupancyGrid:
+    """Mapa de ocupación por celdas con tabla de áreas sumadas (requiere NumPy)"""
+
+    def __init__(self, world_width: int, world_height: int, cell_size: int = COLLISION_BLOCK_SIZE):
+        """Crea un mapa vacío que cubre el mundo indicado"""
+        self.cell_size = cell_size
+        self.cols = max(1, -(-int(world_width) // cell_size))
+        self.rows = max(1, -(-int(world_height) // cell_size))
+        # Cantidad de bloques que cubren cada celda (permite bloques superpuestos)
+        self.counts = np.zeros((self.rows, self.cols), dtype=np.int32)
+        # sat[r, c] = celdas ocupadas en counts[:r, :c]
+        self.sat = np.zeros((self.rows + 1, self.cols + 1), dtype=np.int32)
+
+    @property
+    def occupancy(self):
+        """Mapa booleano de celdas ocupadas"""
+        return self.counts > 0
+
+    def _block_cells(self, rect: pygame.Rect) -> Tuple[int, int, int, int]:
+        """Rango de celdas (inclusivo) que cubre un rectángulo, sin recortar"""
+        size = self.cell_size
+        return (rect.left // size, rect.top // size,
+                (rect.right - 1) // size, (rect.bottom - 1) // size)
+
+    def _ensure_size(self, last_col: int, last_row: int) -> None:
+        """Amplía el mapa si un bloque queda fuera de los límites actuales"""
+        if last_col < self.cols and last_row < self.rows:
+            return
+        cols = max(self.cols, last_col + 1)
+        rows = max(self.rows, last_row + 1)
+        counts = np.zeros((rows, cols), dtype=np.int32)
+        counts[:self.rows, :self.cols] = self.counts
+        self.counts = counts
+        self.rows, self.cols = rows, cols
+        self._rebuild_sat()
+
+    def _rebuild_sat(self) -> None:
+        """Recalcula la tabla de áreas sumadas completa"""
+        self.sat = np.zeros((self.rows + 1, self.cols + 1), dtype=np.int32)
+        self.sat[1:, 1:] = (self.counts > 0).astype(np.int32).cumsum(axis=0).cumsum(axis=1)
+
+    def _update_cells(self, rect: pygame.Rect, delta: int) -> None:
+        """Suma delta a las celdas del rectángulo y corrige la tabla incrementalmente"""
+        first_col, first_row, last_col, last_row = self._block_cells(rect)
+        if last_col < 0 or last_row < 0 or rect.width <= 0 or rect.height <= 0:
+            return
+        first_col, first_row = max(0, first_col), max(0, first_row)
+        if delta > 0:
+            self._ensure_size(last_col, last_row)
+        last_col = min(last_col, self.cols - 1)
+        last_row = min(last_row, self.rows - 1)
+        for row in range(first_row, last_row + 1):
+            for col in range(first_col, last_col + 1):
+                was_occupied = self.counts[row, col] > 0
+                self.counts[row, col] = max(0, self.counts[row, col] + delta)
+                is_occupied = self.counts[row, col] > 0
+                if was_occupied != is_occupied:
+                    # Solo cambia el cuadrante inferior derecho de la tabla
+                    self.sat[row + 1:, col + 1:] += 1 if is_occupied else -1
+
+    def insert(self, block) -> None:
+        """Marca las celdas que cubre el bloque"""
+        self._update_cells(block.rect, 1)
+
+    def remove(self, block) -> None:
+        """Desmarca las celdas que cubre el bloque"""
+        self._update_cells(block.rect, -1)
+
+    def update_many(self, blocks: Iterable, delta: int) -> None:
+        """Suma delta a las celdas de muchos bloques y recalcula la tabla una sola vez"""
+        single_rows, single_cols = [], []
+        for block in blocks:
+            first_col, first_row, last_col, last_row = self._block_cells(block.rect)
+            if last_col < 0 or last_row < 0:
+                continue
+            if delta > 0:
+                self._ensure_size(last_col, last_row)
+            if first_col == last_col and first_row == last_row:
+                # Bloques de una celda (el caso del editor): se aplican juntos más abajo
+                single_rows.append(first_row)
+                single_cols.append(first_col)
+            else:
+                area = self.counts[max(0, first_row):last_row + 1, max(0, first_col):last_col + 1]
+                np.maximum(area + delta, 0, out=area)
+        if single_rows:
+            np.add.at(self.counts, (np.array(single_rows), np.array(single_cols)), delta)
+            np.maximum(self.counts, 0, out=self.counts)
+        self._rebuild_sat()
+
+    def rebuild(self, blocks: Iterable) -> None:
+        """Reconstruye el mapa completo a partir de una lista de bloques"""
+        self.counts[:, :] = 0
+        for block in blocks:
+            first_col, first_row, last_col, last_row = self._block_cells(block.rect)
+            if last_col < 0 or last_row < 0:
+                continue
+            self._ensure_size(last_col, last_row)
+            self.counts[max(0, first_row):last_row + 1, max(0, first_col):last_col + 1] += 1
+        self._rebuild_sat()
+
+    def clear(self) -> None:
+        """Vacía el mapa"""
+        self.counts[:, :] = 0
+        self.sat[:, :] = 0
+
+    def count_in_cells(self, first_col: int, first_row: int, last_col: int, last_row: int) -> int:
+        """Cantidad de celdas ocupadas en un rango inclusivo (recortado al mapa)"""
+        first_col, first_row = max(0, first_col), max(0, first_row)
+        last_col, last_row = min(last_col, self.cols - 1), min(last_row, self.rows - 1)
+        if first_col > last_col or first_row > last_row:
+            return 0
+        sat = self.sat
+        return int(sat[last_row + 1, last_col + 1] - sat[first_row, last_col + 1]
+                   - sat[last_row + 1, first_col] + sat[first_row, first_col])
+
+    def collides(self, rect: pygame.Rect) -> bool:
+        """Verifica en O(1) si el rectángulo toca alguna celda ocupada"""
+        if rect.width <= 0 or rect.height <= 0:
+            return False
+        size = self.cell_size
+        first_col = max(0, rect.left // size)
+        first_row = max(0, rect.top // size)
+        last_col = min((rect.right - 1) // size, self.cols - 1) + 1
+        last_row = min((rect.bottom - 1) // size, self.rows - 1) + 1
+        if first_col >= last_col or first_row >= last_row:
+            return False
+        item = self.sat.item
+        return (item(last_row, last_col) - item(first_row, last_col)
+                - item(last_row, first_col) + item(first_row, first_col)) > 0
+
+    def collides_many(self, lefts, tops, rights, bottoms):
+        """
+        Versión vectorizada de collides para muchos rectángulos a la vez.
+
+        Args:
+            lefts, tops, rights, bottoms: Arreglos de enteros (derecha/abajo exclusivos)
+
+        Returns:
+            Arreglo booleano con True donde el rectángulo toca alguna celda ocupada
+        """
+        size = self.cell_size
+        first_col = np.maximum(lefts // size, 0)
+        first_row = np.maximum(tops // size, 0)
+        last_col = np.minimum((rights - 1) // size, self.cols - 1) + 1
+        last_row = np.minimum((bottoms - 1) // size, self.rows - 1) + 1
+        valid = (first_col < last_col) & (first_row < last_row) & (rights > lefts) & (bottoms > tops)
+        # Índices recortados para poder leer la tabla aunque el rectángulo quede fuera
+        first_col = np.minimum(first_col, self.cols)
+        first_row = np.minimum(first_row, self.rows)
+        last_col = np.maximum(last_col, 0)
+        last_row = np.maximum(last_row, 0)
+        sat = self.sat
+        total = (sat[last_row, last_col] - sat[first_row, last_col]
+                 - sat[last_row, first_col] + sat[first_row, first_col])
+        return valid & (total > 0)
+
+    def cell_occupied(self, col: int, row: int) -> bool:
+        """Indica si una celda concreta está ocupada"""
+        if 0 <= col < self.cols and 0 <= row < self.rows:
+            return bool(self.counts[row, col] > 0)
+        return False
+
+
+class RectBlock:
+    """Bloque rectangular mínimo usado cuando no se indica otra clase de bloque"""
+
+    def __init__(self, x: int, y: int, width: int, height: int):
+        self.x = x
+        self.y = y
+        self.width = width
+        self.height = height
+        self.rect = pygame.Rect(x, y, width, height)
+
+
+def merge_cells(cells: Iterable[Tuple[int, int]]) -> List[Tuple[int, int, int, int]]:
+    """
+    Fusiona celdas ocupadas en rectángulos maximales de forma voraz.
+    
+    Args:
+        cells: Celdas ocupadas como (columna, fila)
+        
+    Returns:
+        Lista de rectángulos (columna, fila, ancho, alto) medidos en celdas
+    """
+    remaining = set(cells)
+    rects = []
+    for row, col in sorted((row, col) for col, row in remaining):
+        if (col, row) not in remaining:
+            continue
+        # Extender hacia la derecha mientras la fila siga ocupada
+        width = 1
+        while (col + width, row) in remaining:
+            width += 1
+        # Extender hacia abajo mientras la franja completa siga ocupada
+        height = 1
+        while all((col + i, row + height) in remaining for i in range(width)):
+            height += 1
+        for r in range(row, row + height):
+            for c in range(col, col + width):
+                remaining.discard((c, r))
+        rects.append((col, row, width, height))
+    return rects
+
+
+class CollisionIndex:
+    """Índice de colisiones usado por los CollisionManager de ambos niveles"""
+
+    def __init__(self, world_width: int, world_height: int, engine: str = COLLISION_ENGINE,
+                 block_factory=None, merge_blocks: bool = COLLISION_MERGE_BLOCKS):
+        """Crea el hash espacial y, si el motor lo pide, el mapa de ocupación"""
+        self.spatial_hash = SpatialHashGrid()
+        self.occupancy_grid: Optional[OccupancyGrid] = None
+        self.engine = "spatial_hash"
+
+        # Bloques fusionados en rectángulos para consultas y dibujo
+        self.cell_size = COLLISION_BLOCK_SIZE
+        self.block_factory = block_factory or RectBlock
+        self.merge_blocks = merge_blocks
+        self._blocks: Dict[int, Any] = {}
+        self._merged_hash = SpatialHashGrid()
+        self._merged_blocks: List[Any] = []
+        self._merged_dirty = True
+
+        # Línea de visión memorizada por par de celdas durante el tick actual
+        self._sight_cache: Dict[Tuple[Tuple[int, int], Tuple[int, int]], bool] = {}
+
+        if engine == "occupancy":
+            if NUMPY_AVAILABLE:
+                self.occupancy_grid = OccupancyGrid(world_width, world_height)
+                self.engine = "occupancy"
+            else:
+                print("⚠️ NumPy no disponible, usando hash espacial para colisiones")
+
+    def insert(self, block) -> None:
+        """Registra un bloque nuevo"""
+        self.spatial_hash.insert(block)
+        self._blocks[id(block)] = block
+        self._merged_dirty = True
+        self._sight_cache.clear()
+        if self.occupancy_grid is not None:
+            self.occupancy_grid.insert(block)
+
+    def remove(self, block) -> bool:
+        """Elimina un bloque registrado"""
+        removed = self.spatial_hash.remove(block)
+        if removed:
+            self._blocks.pop(id(block), None)
+            self._merged_dirty = True
+            self._sight_cache.clear()
+            if self.occupancy_grid is not None:
+                self.occupancy_grid.remove(block)
+        return removed
+
+    def insert_many(self, blocks: Iterable) -> None:
+        """Registra muchos bloques de una vez (el mapa de ocupación se recalcula una sola vez)"""
+        blocks = list(blocks)
+        if not blocks:
+            return
+        for block in blocks:
+            self.spatial_hash.insert(block)
+            self._blocks[id(block)] = block
+        self._merged_dirty = True
+        self._sight_cache.clear()
+        if self.occupancy_grid is not None:
+            self.occupancy_grid.update_many(blocks, 1)
+
+    def remove_many(self, blocks: Iterable) -> None:
+        """Elimina muchos bloques registrados de una vez"""
+        removed = [block for block in blocks if self.spatial_hash.remove(block)]
+        if not removed:
+            return
+        for block in removed:
+            self._blocks.pop(id(block), None)
+        self._merged_dirty = True
+        self._sight_cache.clear()
+        if self.occupancy_grid is not None:
+            self.occupancy_grid.update_many(removed, -1)
+
+    def rebuild(self, blocks: Iterable) -> None:
+        """Reconstruye todas las estructuras a partir de una lista de bloques"""
+        blocks = list(blocks)
+        self.spatial_hash.rebuild(blocks)
+        self._blocks = {id(block): block for block in blocks}
+        self._merged_dirty = True
+        self._sight_cache.clear()
+        if self.occupancy_grid is not None:
+            self.occupancy_grid.rebuild(blocks)
+        if self.merge_blocks:
+            self._ensure_merged()
+            report = self.merge_report()
+            print(f"🧩 Bloques fusionados: {report['raw']} celdas → {report['merged']} rectángulos")
+
+    def clear(self) -> None:
+        """Vacía todas las estructuras"""
+        self.spatial_hash.clear()
+        self._blocks.clear()
+        self._merged_dirty = True
+        self._sight_cache.clear()
+        if self.occupancy_grid is not None:
+            self.occupancy_grid.clear()
+
+    def _ensure_merged(self) -> None:
+        """Recalcula los rectángulos fusionados si hubo cambios desde la última vez"""
+        if not self._merged_dirty:
+            return
+        size = self.cell_size
+        cells = set()
+        merged = []
+        for block in self._blocks.values():
+            if (block.width == size and block.height == size and
+                    block.x % size == 0 and block.y % size == 0):
+                cells.add((int(block.x) // size, int(block.y) // size))
+            else:
+                # Bloques fuera de la grilla se conservan tal cual
+                merged.append(block)
+        for col, row, width, height in merge_cells(cells):
+            merged.append(self.block_factory(col * size, row * size, width * size, height * size))
+        self._merged_blocks = merged
+        self._merged_hash.rebuild(merged)
+        self._merged_dirty = False
+
+    @property
+    def merged_blocks(self) -> List[Any]:
+        """Bloques para consultas y dibujo (fusionados si merge_blocks está activo)"""
+        if not self.merge_blocks:
+            return list(self._blocks.values())
+        self._ensure_merged()
+        return self._merged_blocks
+
+    def merge_report(self) -> Dict[str, int]:
+        """Cantidad de bloques originales frente a rectángulos fusionados"""
+        return {"raw": len(self._blocks), "merged": len(self.merged_blocks)}
+
+    def collides(self, rect: pygame.Rect) -> bool:
+        """Verifica si el rectángulo toca algún bloque"""
+        if self.occupancy_grid is not None:
+            return self.occupancy_grid.collides(rect)
+        if self.merge_blocks:
+            self._ensure_merged()
+            return self._merged_hash.collides(rect)
+        return self.spatial_hash.collides(rect)
+
+    def _sweep_candidates(self, rect: pygame.Rect) -> List[Any]:
+        """Bloques que pueden bloquear un barrido (fusionados si está activo)"""
+        if self.merge_blocks:
+            self._ensure_merged()
+            return self._merged_hash.query_rect(rect)
+        return self.spatial_hash.query_rect(rect)
+
+    def sweep_axis(self, x: float, y: float, width: int, height: int,
+                   delta: float, axis: int) -> Tuple[float, bool]:
+        """
+        Barre el rectángulo sobre un solo eje y devuelve la posición legal más lejana.
+
+        Args:
+            x, y: Esquina superior izquierda de partida
+            width, height: Tamaño del rectángulo
+            delta: Desplazamiento deseado sobre el eje
+            axis: 0 para X, 1 para Y
+
+        Returns:
+            Tupla (nueva coordenada del eje, hubo choque)
+        """
+        start = x if axis == 0 else y
+        if not delta:
+            return start, False
+        size = width if axis == 0 else height
+        target = start + delta
+
+        # Rectángulo que cubre todo el recorrido sobre el eje (truncado como pygame.Rect)
+        low = min(start, target)
+        edge = math.floor(start)
+        if axis == 0:
+            swept = pygame.Rect(int(math.floor(low)), int(math.floor(y)),
+                                int(math.ceil(abs(delta))) + width + 1, height + 1)
+            perp_low = math.floor(y)
+            perp_high = perp_low + height
+        else:
+            swept = pygame.Rect(int(math.floor(x)), int(math.floor(low)),
+                                width + 1, int(math.ceil(abs(delta))) + height + 1)
+            perp_low = math.floor(x)
+            perp_high = perp_low + width
+
+        limit = target
+        hit = False
+        cell = self.cell_size
+        for block in self._sweep_candidates(swept):
+            if axis == 0:
+                block_low, block_high = block.x, block.x + block.width
+                block_perp_low, block_perp_high = block.y, block.y + block.height
+            else:
+                block_low, block_high = block.y, block.y + block.height
+                block_perp_low, block_perp_high = block.x, block.x + block.width
+            # Solo bloquean los bloques que solapan en el eje perpendicular
+            if block_perp_high <= perp_low or block_perp_low >= perp_high:
+                continue
+            # Las celdas ya solapadas al partir se ignoran para poder salir de ellas;
+            # de un bloque fusionado solo bloquean las celdas enteras por delante
+            if delta > 0 and block_low < edge + size:
+                block_low = -(-(edge + size) // cell) * cell
+                if block_low >= block_high:
+                    continue
+            elif delta < 0 and block_high > edge:
+                block_high = (edge // cell) * cell
+                if block_high <= block_low:
+                    continue
+            if delta > 0 and block_low < math.floor(limit) + size:
+                limit = max(block_low - size, start)
+                hit = True
+            elif delta < 0 and math.floor(limit) < block_high:
+                limit = min(block_high, start)
+                hit = True
+        return limit, hit
+
+    def move_rect(self, x: float, y: float, width: int, height: int,
+                  dx: float, dy: float) -> Tuple[float, float, bool, bool]:
+        """
+        Mueve un rectángulo eje por eje (primero X, luego Y) deslizando por las paredes.
+
+        Returns:
+            Tupla (x, y, choque en X, choque en Y)
+        """
+        new_x, hit_x = self.sweep_axis(x, y, width, height, dx, 0)
+        new_y, hit_y = self.sweep_axis(new_x, y, width, height, dy, 1)
+        return new_x, new_y, hit_x, hit_y
+
+    def resolve_moves(self, moves: Iterable[Tuple[float, float, int, int, float, float]]
+                      ) -> List[Tuple[float, float, bool, bool]]:
+        """
+        Resuelve en una sola llamada el movimiento de varios rectángulos.
+
+        Args:
+            moves: Tuplas (x, y, ancho, alto, dx, dy)
+
+        Returns:
+            Lista de (x, y, choque en X, choque en Y) en el mismo orden
+        """
+        moves = list(moves)
+        if not moves:
+            return []
+        resolved, hits = self.move_aabbs([(x, y) for x, y, _, _, _, _ in moves],
+                                         [(width, height) for _, _, width, height, _, _ in moves],
+                                         [(dx, dy) for _, _, _, _, dx, dy in moves])
+        if not isinstance(resolved, list):
+            resolved, hits = resolved.tolist(), hits.tolist()
+        return [(x, y, hit_x, hit_y) for (x, y), (hit_x, hit_y) in zip(resolved, hits)]
+
+    def move_aabbs(self, positions, sizes, velocities):
+        """
+        Mueve muchos rectángulos contra el mapa estático en una sola pasada vectorizada.
+
+        Cada eje se barre por separado, primero X y después Y como en
+        move_rect (deslizamiento por paredes), y los desplazamientos mayores a
+        una celda se dividen en subpasos para no atravesar bloques. Las celdas
+        que un rectángulo ya solapa al partir no lo bloquean (puede salir de
+        ellas). Da el mismo resultado que move_rect cuerpo por cuerpo
+        (benchmark_colisiones.py lo verifica).
+
+        Args:
+            positions: (N, 2) esquinas superiores izquierdas
+            sizes: (N, 2) anchos y altos (o un solo par para todos)
+            velocities: (N, 2) desplazamientos de este tick
+
+        Returns:
+            Tupla (posiciones resueltas (N, 2), choques (N, 2) booleanos por eje).
+            Sin mapa de ocupación (sin NumPy o motor "spatial_hash") o con menos
+            de COLLISION_VECTOR_MIN_BODIES cuerpos se resuelve rectángulo por
+            rectángulo y se devuelven listas de tuplas
+        """
+        if self.occupancy_grid is None or len(positions) < COLLISION_VECTOR_MIN_BODIES:
+            if len(sizes) == 2 and not hasattr(sizes[0], '__len__'):
+                sizes = [sizes] * len(positions)
+            resolved, hits = [], []
+            for (x, y), (width, height), (dx, dy) in zip(positions, sizes, velocities):
+                new_x, new_y, hit_x, hit_y = self.move_rect(x, y, width, height, dx, dy)
+                resolved.append((new_x, new_y))
+                hits.append((hit_x, hit_y))
+            return resolved, hits
+
+        position = np.array(positions, dtype=np.float64).reshape(-1, 2)
+        size = np.broadcast_to(np.asarray(sizes, dtype=np.float64), position.shape)
+        velocity = np.array(velocities, dtype=np.float64).reshape(-1, 2)
+        hits = np.zeros(position.shape, dtype=bool)
+        if not len(position):
+            return position, hits
+
+        cell = self.cell_size
+        # Mismo orden que move_rect: todo el recorrido en X y después todo en Y
+        for axis in (0, 1):
+            perp = 1 - axis
+            origin = position[:, axis].copy()
+            edge = np.floor(origin)
+            perp_low = np.floor(position[:, perp])
+            perp_high = perp_low + size[:, perp].astype(np.int64)
+            steps = max(1, int(math.ceil(np.abs(velocity[:, axis]).max() / cell)))
+            step = velocity[:, axis] / steps
+            for _ in range(steps):
+                delta = np.where(hits[:, axis], 0.0, step)
+                if not delta.any():
+                    break
+                target = position[:, axis] + delta
+                target_edge = np.floor(target)
+                # Franja recorrida desde el borde de partida, como sweep_axis: solo
+                # cuentan las celdas enteras por delante (se puede salir de las ya solapadas)
+                ahead = -((-(edge + size[:, axis])) // cell) * cell
+                behind = (edge // cell) * cell
+                low = np.where(delta > 0, ahead, target_edge).astype(np.int64)
+                high = np.where(delta > 0, target_edge + size[:, axis], behind).astype(np.int64)
+                if axis == 0:
+                    blocked = self.occupancy_grid.collides_many(low, perp_low.astype(np.int64),
+                                                                high, perp_high.astype(np.int64))
+                else:
+                    blocked = self.occupancy_grid.collides_many(perp_low.astype(np.int64), low,
+                                                                perp_high.astype(np.int64), high)
+                blocked &= delta != 0
+                if blocked.any():
+                    # Ajustar el borde de avance al límite de la primera celda ocupada
+                    # (sin retroceder más allá del punto de partida)
+                    snapped_positive = ((target_edge + size[:, axis] - 1) // cell) * cell - size[:, axis]
+                    snapped_negative = (target_edge // cell + 1) * cell
+                    snapped = np.where(delta > 0, np.maximum(snapped_positive, origin),
+                                       np.minimum(snapped_negative, origin))
+                    target = np.where(blocked, snapped, target)
+                    hits[:, axis] |= blocked
+                position[:, axis] = target
+        return position, hits
+
+    def cell_blocked(self, col: int, row: int) -> bool:
+        """Indica si una celda de la grilla de colisión contiene algún bloque"""
+        if self.occupancy_grid is not None:
+            return self.occupancy_grid.cell_occupied(col, row)
+        size = self.cell_size
+        return self.collides(pygame.Rect(col * size, row * size, size, size))
+
+    def _traverse(self, x: float, y: float, dx: float, dy: float, max_dist: float):
+        """
+        Recorre con DDA las celdas que cruza un rayo (dirección normalizada).
+
+        Genera tuplas (columna, fila, distancia de entrada a la celda)
+        """
+        size = self.cell_size
+        col, row = int(x // size), int(y // size)
+        step_col = 1 if dx > 0 else -1
+        step_row = 1 if dy > 0 else -1
+        # Distancia hasta el primer borde de celda en cada eje y entre bordes sucesivos
+        next_x = ((col + (dx > 0)) * size - x) / dx if dx else math.inf
+        next_y = ((row + (dy > 0)) * size - y) / dy if dy else math.inf
+        delta_x = size / abs(dx) if dx else math.inf
+        delta_y = size / abs(dy) if dy else math.inf
+
+        distance = 0.0
+        while distance <= max_dist:
+            yield col, row, distance
+            if next_x < next_y:
+                col += step_col
+                distance = next_x
+                next_x += delta_x
+            else:
+                row += step_row
+                distance = next_y
+                next_y += delta_y
+
+    def raycast(self, origin: Tuple[float, float], direction: Tuple[float, float],
+                max_dist: float) -> Optional[Tuple[float, Tuple[float, float]]]:
+        """
+        Lanza un rayo sobre la grilla de colisión.
+
+        Args:
+            origin: Punto de partida (x, y)
+            direction: Dirección (dx, dy), no hace falta normalizarla
+            max_dist: Distancia máxima a recorrer
+
+        Returns:
+            (distancia, punto de impacto) del primer bloque encontrado, o None
+        """
+        x, y = origin
+        length = math.hypot(direction[0], direction[1])
+        if not length:
+            return None
+        dx, dy = direction[0] / length, direction[1] / length
+        for col, row, distance in self._traverse(x, y, dx, dy, max_dist):
+            if self.cell_blocked(col, row):
+                return distance, (x + dx * distance, y + dy * distance)
+        return None
+
+    def has_line_of_sight(self, a: Tuple[float, float], b: Tuple[float, float]) -> bool:
+        """
+        Indica si no hay bloques entre los puntos a y b.
+
+        El resultado se calcula entre los centros de las celdas de ambos puntos
+        y se memoriza por par de celdas hasta el próximo begin_tick(), así
+        muchos observadores en las mismas celdas comparten el cálculo.
+        """
+        size = self.cell_size
+        cell_a = (int(a[0] // size), int(a[1] // size))
+        cell_b = (int(b[0] // size), int(b[1] // size))
+        if cell_a == cell_b:
+            return True
+        key = (cell_a, cell_b) if cell_a <= cell_b else (cell_b, cell_a)
+        visible = self._sight_cache.get(key)
+        if visible is None:
+            visible = self._cells_visible(*key)
+            self._sight_cache[key] = visible
+        return visible
+
+    def _cells_visible(self, start: Tuple[int, int], end: Tuple[int, int]) -> bool:
+        """Recorre las celdas entre dos centros de celda (sin contar los extremos)"""
+        size = self.cell_size
+        x, y = (start[0] + 0.5) * size, (start[1] + 0.5) * size
+        dx, dy = (end[0] - start[0]) * size, (end[1] - start[1]) * size
+        length = math.hypot(dx, dy)
+        for col, row, _ in self._traverse(x, y, dx / length, dy / length, length):
+            if (col, row) == end:
+                return True
+            if (col, row) != start and self.cell_blocked(col, row):
+                return False
+        return True
+
+    def begin_tick(self) -> None:
+        """Descarta las líneas de visión memorizadas del tick anterior"""
+        self._sight_cache.clear()
+
+    def query_rect(self, rect: pygame.Rect) -> List[Any]:
+        """Obtiene los bloques (a nivel de celda) que colisionan con el rectángulo"""
+        return self.spatial_hash.query_rect(rect)
+
+    def query_point(self, x: int, y: int) -> List[Any]:
+        """Obtiene los bloques (a nivel de celda) que contienen el punto indicado"""
+        return self.spatial_hash.query_point(x, y)
+
+    def find_block_at(self, x: int, y: int):
+        """Obtiene el bloque cuya esquina superior izquierda es (x, y), si existe"""
+        return self.spatial_hash.find_block_at(x, y)
+
+    def __len__(self) -> int:
+        return len(self.spatial_hash)
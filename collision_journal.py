@@ -0,0 +1,283 @@
+#!/usr/bin/env python3
+"""
+COLLISION JOURNAL - La Tierra de las Manzanas
+Guardado diferido del editor de colisiones:
+- Cada bloque añadido/eliminado se agrega al final de un diario (O(1))
+- Un hilo en segundo plano compacta el diario en el archivo binario base
+  cada cierto intervalo o cuando se sale del editor (F1)
+- Al cargar se reproduce el archivo base más el diario pendiente
+- get_collision_journal() devuelve un único diario por archivo; close() al
+  salir del nivel detiene el hilo y compacta lo pendiente
+- Las operaciones son idempotentes (poner/quitar celda), así que un cierre
+  inesperado en cualquier punto no pierde ni corrompe el mapa
+"""
+
+import os
+import struct
+import threading
+import zlib
+from typing import Iterable, List, Optional, Set, Tuple
+from config import *
+from collision_format import read_collision_positions, write_collision_file
+
+JOURNAL_MAGIC = b"MZCJ"
+JOURNAL_VERSION = 1
+JOURNAL_HEADER = struct.Struct("<4sHH")  # magic, versión, tamaño de celda
+JOURNAL_RECORD = struct.Struct("<BhhB")  # operación, columna, fila, verificación
+
+OP_ADD = 1
+OP_REMOVE = 2
+
+
+def _checksum(op: int, col: int, row: int) -> int:
+    """Byte de verificación para detectar registros cortados o corruptos"""
+    return zlib.crc32(struct.pack("<Bhh", op, col, row)) & 0xFF
+
+
+class CollisionJournal:
+    """Diario de ediciones con compactación en segundo plano"""
+
+    def __init__(self, base_path: str, cell_size: int = COLLISION_BLOCK_SIZE,
+                 compact_interval: int = COLLISION_JOURNAL_COMPACT_INTERVAL):
+        """
+        Inicializa el diario asociado a un archivo binario de colisión.
+
+        Args:
+            base_path: Archivo binario base (formato de collision_format)
+            cell_size: Tamaño de celda en píxeles
+            compact_interval: Milisegundos entre compactaciones automáticas
+        """
+        self.base_path = base_path
+        self.journal_path = base_path + ".journal"
+        self.cell_size = cell_size
+        self.compact_interval = compact_interval
+
+        self.cells: Set[Tuple[int, int]] = set()
+        self.pending_records = 0
+        self._lock = threading.Lock()
+        self._file = None
+        self._wake = threading.Event()
+        self._stop = False
+        self._thread: Optional[threading.Thread] = None
+
+    # === CARGA ===
+
+    def load(self, initial_positions: Optional[List[Tuple[int, int]]] = None) -> List[Tuple[int, int]]:
+        """
+        Carga el archivo base y reproduce el diario pendiente.
+
+        Args:
+            initial_positions: Posiciones a usar si todavía no existe el archivo base
+
+        Returns:
+            Lista de posiciones (x, y) en píxeles del mapa resultante
+        """
+        size = self.cell_size
+        if os.path.exists(self.base_path):
+            positions = read_collision_positions(self.base_path)
+        else:
+            positions = list(initial_positions or [])
+
+        with self._lock:
+            self.cells = {(int(x) // size, int(y) // size) for x, y in positions}
+            self.pending_records = self._replay()
+            self._open_for_append()
+
+        if self.pending_records:
+            print(f"📓 Diario de colisiones reproducido: {self.pending_records} ediciones pendientes")
+        return [(col * size, row * size) for col, row in sorted(self.cells, key=lambda c: (c[1], c[0]))]
+
+    def _replay(self) -> int:
+        """Aplica los registros válidos del diario y recorta un final cortado"""
+        if not os.path.exists(self.journal_path):
+            return 0
+
+        with open(self.journal_path, "rb") as f:
+            data = f.read()
+
+        if len(data) < JOURNAL_HEADER.size:
+            valid_end = 0
+            applied = 0
+        else:
+            magic, version, cell_size = JOURNAL_HEADER.unpack_from(data, 0)
+            if magic != JOURNAL_MAGIC or version > JOURNAL_VERSION or cell_size != self.cell_size:
+                print(f"⚠️ Diario de colisiones inválido, se ignora: {self.journal_path}")
+                os.replace(self.journal_path, self.journal_path + ".invalido")
+                return 0
+
+            offset = JOURNAL_HEADER.size
+            applied = 0
+            while offset + JOURNAL_RECORD.size <= len(data):
+                op, col, row, check = JOURNAL_RECORD.unpack_from(data, offset)
+                if check != _checksum(op, col, row) or op not in (OP_ADD, OP_REMOVE):
+                    break  # Registro corrupto: todo lo posterior se descarta
+                if op == OP_ADD:
+                    self.cells.add((col, row))
+                else:
+                    self.cells.discard((col, row))
+                applied += 1
+                offset += JOURNAL_RECORD.size
+            valid_end = offset
+
+        if valid_end != len(data):
+            # Recortar un registro escrito a medias para que los siguientes queden alineados
+            with open(self.journal_path, "r+b") as f:
+                f.truncate(valid_end)
+        return applied
+
+    def _open_for_append(self) -> None:
+        """Abre el diario para agregar registros (creándolo con cabecera si hace falta)"""
+        if self._file:
+            self._file.close()
+        is_new = not os.path.exists(self.journal_path) or os.path.getsize(self.journal_path) == 0
+        self._file = open(self.journal_path, "ab", buffering=0)
+        if is_new:
+            self._file.write(JOURNAL_HEADER.pack(JOURNAL_MAGIC, JOURNAL_VERSION, self.cell_size))
+
+    # === REGISTRO DE EDICIONES ===
+
+    def _append(self, op: int, x: int, y: int) -> None:
+        """Agrega un registro al diario"""
+        col, row = int(x) // self.cell_size, int(y) // self.cell_size
+        with self._lock:
+            if op == OP_ADD:
+                self.cells.add((col, row))
+            else:
+                self.cells.discard((col, row))
+            if self._file is None:
+                self._open_for_append()
+            # Sin búfer: cada registro llega al sistema operativo de inmediato
+            self._file.write(JOURNAL_RECORD.pack(op, col, row, _checksum(op, col, row)))
+            self.pending_records += 1
+
+    def record_many(self, added: Iterable[Tuple[int, int]], removed: Iterable[Tuple[int, int]]) -> None:
+        """Registra un lote de altas y bajas con una sola escritura"""
+        size = self.cell_size
+        records = bytearray()
+        with self._lock:
+            for op, positions in ((OP_REMOVE, removed), (OP_ADD, added)):
+                for x, y in positions:
+                    col, row = int(x) // size, int(y) // size
+                    if op == OP_ADD:
+                        self.cells.add((col, row))
+                    else:
+                        self.cells.discard((col, row))
+                    records += JOURNAL_RECORD.pack(op, col, row, _checksum(op, col, row))
+                    self.pending_records += 1
+            if not records:
+                return
+            if self._file is None:
+                self._open_for_append()
+            self._file.write(bytes(records))
+
+    def record_add(self, x: int, y: int) -> None:
+        """Registra un bloque añadido en (x, y)"""
+        self._append(OP_ADD, x, y)
+
+    def record_remove(self, x: int, y: int) -> None:
+        """Registra un bloque eliminado en (x, y)"""
+        self._append(OP_REMOVE, x, y)
+
+    # === COMPACTACIÓN ===
+
+    def compact(self, positions: Optional[List[Tuple[int, int]]] = None) -> bool:
+        """
+        Escribe el estado actual en el archivo base y vacía el diario.
+
+        Args:
+            positions: Estado completo a guardar; si se omite se usa el del diario
+
+        Returns:
+            True si se guardó correctamente
+        """
+        size = self.cell_size
+        with self._lock:
+            if positions is not None:
+                self.cells = {(int(x) // size, int(y) // size) for x, y in positions}
+            snapshot = list(self.cells)
+            snapshot_records = self.pending_records
+            if self._file:
+                self._file.flush()
+            snapshot_offset = os.path.getsize(self.journal_path) if os.path.exists(self.journal_path) else 0
+
+        try:
+            # El archivo base se reemplaza de forma atómica (tmp + fsync + replace)
+            write_collision_file(self.base_path, [(col * size, row * size) for col, row in snapshot])
+        except Exception as e:
+            print(f"❌ Error compactando diario de colisiones: {e}")
+            return False
+
+        with self._lock:
+            # Conservar los registros agregados mientras se escribía el archivo base
+            tail = b""
+            if os.path.exists(self.journal_path):
+                with open(self.journal_path, "rb") as f:
+                    f.seek(snapshot_offset)
+                    tail = f.read()
+            temp_path = self.journal_path + ".tmp"
+            with open(temp_path, "wb") as f:
+                f.write(JOURNAL_HEADER.pack(JOURNAL_MAGIC, JOURNAL_VERSION, size))
+                f.write(tail)
+                f.flush()
+                os.fsync(f.fileno())
+            if self._file:
+                self._file.close()
+                self._file = None
+            os.replace(temp_path, self.journal_path)
+            self._open_for_append()
+            self.pending_records = max(0, self.pending_records - snapshot_records)
+        return True
+
+    def request_compaction(self) -> None:
+        """Pide al hilo en segundo plano una compactación inmediata"""
+        if self._thread and self._thread.is_alive():
+            self._wake.set()
+        else:
+            self.compact()
+
+    def start(self) -> None:
+        """Arranca el hilo de compactación en segundo plano"""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop = False
+        self._wake.clear()
+        self._thread = threading.Thread(target=self._writer_loop, name="collision-journal", daemon=True)
+        self._thread.start()
+
+    def _writer_loop(self) -> None:
+        """Compacta el diario por intervalo o cuando se solicita"""
+        while not self._stop:
+            requested = self._wake.wait(self.compact_interval / 1000)
+            self._wake.clear()
+            if self._stop:
+                break
+            if self.pending_records or requested:
+                self.compact()
+
+    def close(self) -> None:
+        """Detiene el hilo y compacta las ediciones pendientes"""
+        self._stop = True
+        self._wake.set()
+        if self._thread:
+            self._thread.join(timeout=5)
+            self._thread = None
+        if self.pending_records:
+            self.compact()
+        with self._lock:
+            if self._file:
+                self._file.close()
+                self._file = None
+
+
+# Un único diario por archivo base: dos diarios sobre los mismos archivos
+# compactarían a la vez desde hilos distintos
+_journals = {}
+
+def get_collision_journal(base_path: str) -> CollisionJournal:
+    """Obtiene el diario compartido de un archivo binario de colisión"""
+    key = os.path.abspath(base_path)
+    journal = _journals.get(key)
+    if journal is None:
+        journal = CollisionJournal(base_path)
+        _journals[key] = journal
+    return journal
@@ -10,6 +10,14 @@ FPS = 60
 
 # === CONFIGURACIÓN DE COLISIONES ===
 COLLISION_BLOCK_SIZE = 32
+SPATIAL_HASH_CELL_SIZE = 128  # Tamaño de celda del hash espacial de colisiones
+COLLISION_ENGINE = "occupancy"  # "occupancy" (NumPy + tabla de áreas sumadas) o "spatial_hash"
+COLLISION_MERGE_BLOCKS = True  # Fusionar celdas contiguas en rectángulos para consultas y dibujo
+COLLISION_VECTOR_MIN_BODIES = 32  # Desde cuántos cuerpos el movimiento en lote usa NumPy
+COLLISION_JOURNAL_COMPACT_INTERVAL = 10000  # ms entre compactaciones del diario del editor
+EDITOR_HISTORY_LIMIT = 100  # Operaciones que se pueden deshacer en el editor de colisiones
+EDITOR_OVERLAY_COLOR = (255, 0, 0, 100)  # Relleno semitransparente de los bloques en el editor
+EDITOR_OVERLAY_BORDER = 2  # Grosor del contorno de las zonas bloqueadas en el editor
 
 # === CONFIGURACIÓN DE COLORES ===
 BLACK = (0, 0, 0)
@@ -29,6 +37,26 @@ HEALTH_BAR_HEIGHT = 10
 # === CONFIGURACIÓN DE ANIMACIONES ===
 ANIMATION_SPEED = 0.15
 FRAME_DURATION = 100
+SPRITE_DISK_CACHE = True  # Guardar en disco los frames ya procesados (recorte, escala, volteo)
+SPRITE_CACHE_DIR = "cache/sprites"  # Carpeta de la caché de frames procesados
+SPRITE_ATLAS = True  # Empaquetar los frames de cada personaje/enemigo en un atlas
+ATLAS_PAGE_SIZE = 2048  # Ancho y alto máximo de cada página del atlas
+ATLAS_PADDING = 1  # Píxeles libres entre frames del atlas
+PRELOAD_WORKERS = 0  # Hilos para decodificar GIFs durante la carga (0 = según núcleos)
+LAZY_ANIMATIONS = True  # Decodificar cada dirección al usarla (con prefetch en segundo plano)
+ASSET_BUNDLE = True  # Usar el paquete de assets compilado si existe (python asset_bundle.py compilar)
+ASSET_BUNDLE_PATH = "build/assets.bundle"  # Paquete de assets compilado
+ASSET_STORE_DIR = "cache/assets"  # Almacén local de fondos/objetos (python asset_store.py descargar)
+BACKGROUND_CHUNK_SIZE = 512  # Lado de los bloques del fondo (solo se dibujan los visibles)
+DIRTY_RECT_RENDERING = True  # Nivel 2 (cámara fija): enviar a pantalla solo las regiones que cambian
+DIRTY_RECT_MAX_AREA = 0.5  # Fracción de pantalla sucia a partir de la cual se envía completa
+DIRTY_RECT_VERIFY = False  # Depuración: comparar cada frame con un redibujo completo y avisar diferencias
+RENDER_SCALE = 1.0  # Resolución interna de dibujo (0.5, 0.75, 1.0); SDL la escala a la ventana
+RENDER_SCALE_SMOOTH = False  # Escalado lineal (más suave) en lugar de vecino más cercano al presentar
+TEXT_CACHE_SIZE = 256  # Textos renderizados que se conservan (HUD, menús, editor) antes de descartar
+EFFECT_CACHE_SIZE = 256  # Sprites de efectos pre-renderizados (escudos, brillos, anillos) que se conservan
+EFFECT_ALPHA_STEP = 8  # Paso de cuantización del alfa de los efectos (menos pasos = más reutilización)
+EFFECT_PULSE_FRAMES = 12  # Frames pre-renderizados por período de un efecto pulsante
 
 # === CONFIGURACIÓN DE CORRECCIONES DE SPRITES ===
 # Configuración para corregir sprites que miran al lado contrario
@@ -52,6 +80,7 @@ ITEM_DESPAWN_TIME = 30000  # 30 segundos
 WORM_SPEED = 2
 WORM_HEALTH = 100
 WORM_DAMAGE = 20
+WORM_SCALE = 1.56  # Escala de los sprites del gusano (WormEnemy y la precarga usan la misma)
 
 # === CONFIGURACIÓN DE ATAQUES ===
 ATTACK_COOLDOWN = 500  # milliseconds
@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+"""
+DIRTY RECTS - La Tierra de las Manzanas
+Renderizado por rectángulos sucios para niveles con cámara fija:
+- La escena se dibuja en una superficie propia (SceneSurface) que anota el
+  rectángulo de cada blit y fill de este frame; canvas_draw (render_scale)
+  anota lo que dibuja con pygame.draw, y cualquier otro dibujo directo debe
+  llamar a scene.record(rect)
+- Al empezar el frame solo se restauran desde el fondo los rectángulos
+  dibujados en el frame anterior (el resto de la escena sigue intacto)
+- Se envía a la pantalla la unión de los rectángulos de este frame y del
+  anterior con pygame.display.update(rects)
+- Si el área sucia supera DIRTY_RECT_MAX_AREA (menús, fin de partida, cámara
+  movida) se copia y se presenta la pantalla completa
+El resultado es idéntico a redibujar todo: lo único que cambia es cuánto se
+pinta y se envía. report() informa el porcentaje de píxeles enviados.
+Con DIRTY_RECT_VERIFY cada frame se redibuja completo y se compara lo que
+llegó a la pantalla con la escena: cualquier dibujo sin anotar se avisa.
+"""
+
+import pygame
+from typing import Callable, List, Optional
+from config import *
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    np = None
+    NUMPY_AVAILABLE = False
+
+
+class SceneSurface(pygame.Surface):
+    """Superficie de la escena que anota lo que se dibuja sobre ella"""
+
+    def __init__(self, display: pygame.Surface):
+        super().__init__(display.get_size(), 0, display)
+        self.rects: List[pygame.Rect] = []
+        self.recording = False
+
+    def record(self, rect: pygame.Rect) -> None:
+        """Anota una región dibujada sin blit/fill (pygame.draw, transform con destino...)"""
+        if self.recording:
+            self.rects.append(pygame.Rect(rect))
+
+    def blit(self, source, dest, area=None, special_flags=0):
+        rect = super().blit(source, dest, area, special_flags)
+        if self.recording:
+            self.rects.append(rect)
+        return rect
+
+    def blits(self, blit_sequence, doreturn=1):
+        # Se resuelve con blit para anotar cada rectángulo
+        rects = [self.blit(*item) for item in blit_sequence]
+        return rects if doreturn else None
+
+    def fill(self, color, rect=None, special_flags=0):
+        result = super().fill(color, rect, special_flags)
+        if self.recording:
+            self.rects.append(result)
+        return result
+
+
+class DirtyRectRenderer:
+    """Restaura, anota y presenta solo las regiones que cambian"""
+
+    def __init__(self, display: pygame.Surface,
+                 restore: Callable[[pygame.Surface, pygame.Rect], None],
+                 max_area: float = DIRTY_RECT_MAX_AREA, verify: bool = DIRTY_RECT_VERIFY):
+        """
+        Args:
+            display: Superficie de la pantalla
+            restore: Dibuja el fondo de una región de la escena (superficie, rectángulo)
+            max_area: Fracción de la pantalla a partir de la cual se presenta completa
+            verify: Redibujar todo cada frame y comparar la pantalla con la escena
+        """
+        self.display = display
+        self.scene = SceneSurface(display)
+        self.restore = restore
+        self.max_area = max_area
+        self.screen_rect = display.get_rect()
+        self._previous: List[pygame.Rect] = []
+        self._view_key = None
+        self._full_redraw = True
+        self.verify = verify
+        # Estadísticas
+        self.frames = 0
+        self.full_frames = 0
+        self.pushed_pixels = 0
+        self.last_percent = 100.0
+        self.max_percent = 0.0
+        self.mismatched_frames = 0
+
+    def invalidate(self) -> None:
+        """Fuerza redibujar y presentar toda la pantalla en el próximo frame"""
+        self._full_redraw = True
+
+    def begin_frame(self, view_key=None) -> pygame.Surface:
+        """
+        Prepara la escena para dibujar el frame.
+
+        Args:
+            view_key: Estado de la vista (p. ej. la cámara); si cambia, se redibuja todo
+
+        Returns:
+            La superficie de la escena
+        """
+        if view_key != self._view_key:
+            self._view_key = view_key
+            self._full_redraw = True
+
+        scene = self.scene
+        if self._full_redraw or self.verify:
+            # Verificación: la escena es siempre el redibujo completo del frame
+            self.restore(scene, self.screen_rect)
+        else:
+            for rect in self._previous:
+                self.restore(scene, rect)
+
+        scene.rects = []
+        scene.recording = True
+        return scene
+
+    def end_frame(self) -> float:
+        """
+        Presenta el frame.
+
+        Returns:
+            Porcentaje de píxeles de la pantalla enviados
+        """
+        scene = self.scene
+        scene.recording = False
+        current = [rect.clip(self.screen_rect) for rect in scene.rects]
+        current = [rect for rect in current if rect.width and rect.height]
+
+        screen_area = self.screen_rect.width * self.screen_rect.height
+        dirty: Optional[List[pygame.Rect]] = None
+        if not self._full_redraw:
+            dirty = merge_rects(self._previous + current)
+            area = sum(rect.width * rect.height for rect in dirty)
+            if area > screen_area * self.max_area:
+                dirty = None
+
+        if dirty is None:
+            self.display.blit(scene, (0, 0))
+            pygame.display.flip()
+            area = screen_area
+            self.full_frames += 1
+        else:
+            for rect in dirty:
+                self.display.blit(scene, rect, rect)
+            pygame.display.update(dirty)
+            if self.verify:
+                self._check_frame()
+
+        self._previous = current
+        self._full_redraw = False
+        self.frames += 1
+        self.pushed_pixels += area
+        self.last_percent = area * 100.0 / screen_area
+        self.max_percent = max(self.max_percent, self.last_percent)
+        return self.last_percent
+
+    def _check_frame(self) -> None:
+        """Compara lo enviado a la pantalla con el redibujo completo (la escena)"""
+        count, bounds = count_differences(self.display, self.scene)
+        if not count:
+            return
+        self.mismatched_frames += 1
+        print(f"⚠️ Rectángulos sucios: frame {self.frames} con {count} píxeles distintos del redibujo "
+              f"completo en {tuple(bounds)} (¿dibujo sin anotar en la escena?)")
+        # Resincronizar para que el próximo frame se compare por separado
+        self.display.blit(self.scene, (0, 0))
+        pygame.display.flip()
+
+    @property
+    def average_percent(self) -> float:
+        """Porcentaje medio de píxeles enviados por frame"""
+        if not self.frames:
+            return 0.0
+        screen_area = self.screen_rect.width * self.screen_rect.height
+        return self.pushed_pixels * 100.0 / (self.frames * screen_area)
+
+    def report(self) -> None:
+        """Muestra las estadísticas en consola"""
+        print(f"🧽 Rectángulos sucios: {self.frames} frames, {self.average_percent:.1f}% de píxeles "
+              f"enviados por frame (máx {self.max_percent:.1f}%, {self.full_frames} completos)")
+        if self.verify:
+            print(f"🔎 Verificación: {self.mismatched_frames} frames distintos del redibujo completo")
+
+
+def count_differences(first: pygame.Surface, second: pygame.Surface):
+    """
+    Píxeles distintos entre dos superficies del mismo tamaño y formato.
+
+    Returns:
+        (cantidad, rectángulo que los contiene); sin NumPy la cantidad es la
+        de filas distintas
+    """
+    if NUMPY_AVAILABLE:
+        different = pygame.surfarray.array2d(first) != pygame.surfarray.array2d(second)
+        xs, ys = np.nonzero(different)
+        if not len(xs):
+            return 0, None
+        return int(len(xs)), pygame.Rect(int(xs.min()), int(ys.min()),
+                                         int(xs.max() - xs.min()) + 1, int(ys.max() - ys.min()) + 1)
+    width, height = first.get_size()
+    first_bytes = pygame.image.tostring(first, "RGB")
+    second_bytes = pygame.image.tostring(second, "RGB")
+    row = width * 3
+    rows = [y for y in range(height)
+            if first_bytes[y * row:(y + 1) * row] != second_bytes[y * row:(y + 1) * row]]
+    if not rows:
+        return 0, None
+    return len(rows), pygame.Rect(0, rows[0], width, rows[-1] - rows[0] + 1)
+
+
+def merge_rects(rects: List[pygame.Rect]) -> List[pygame.Rect]:
+    """Une los rectángulos que se solapan (menos llamadas y sin contar dos veces el mismo píxel)"""
+    merged: List[pygame.Rect] = []
+    for rect in rects:
+        rect = rect.copy()
+        # Absorber todos los ya unidos que toquen al nuevo, hasta que no quede ninguno
+        index = rect.collidelist(merged)
+        while index != -1:
+            rect.union_ip(merged.pop(index))
+            index = rect.collidelist(merged)
+        merged.append(rect)
+    return merged
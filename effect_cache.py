@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+EFFECT CACHE - La Tierra de las Manzanas
+Sprites de efectos pre-renderizados (escudos, brillos, anillos mágicos,
+partículas, capa de derrota):
+- Cada combinación de forma, tamaño, color y alfa se dibuja una sola vez
+  sobre una superficie SRCALPHA y se reutiliza en los frames siguientes
+- El alfa se cuantiza a EFFECT_ALPHA_STEP para que los efectos que se
+  desvanecen compartan superficies
+- pulse_alpha() convierte una fase (p. ej. el sin() del escudo) en uno de
+  EFFECT_PULSE_FRAMES valores: un efecto pulsante usa un juego pequeño de
+  frames ya dibujados
+- Descarte LRU con tope de EFFECT_CACHE_SIZE entradas y contadores de
+  aciertos/fallos
+Las superficies devueltas son compartidas: no se modifican.
+"""
+
+import math
+import pygame
+from collections import OrderedDict
+from typing import Dict, Sequence, Tuple
+from config import *
+from sprite_cache import surface_bytes
+
+# Capa de círculos: (radio, color RGB, alfa)
+CircleLayer = Tuple[int, Tuple[int, int, int], int]
+
+
+def quantize_alpha(alpha: float) -> int:
+    """Alfa en 0-255 redondeado al paso de la caché"""
+    alpha = (int(alpha) + EFFECT_ALPHA_STEP // 2) // EFFECT_ALPHA_STEP * EFFECT_ALPHA_STEP
+    return 0 if alpha < 0 else 255 if alpha > 255 else alpha
+
+
+def pulse_alpha(phase: float, base: float, amplitude: float, frames: int = EFFECT_PULSE_FRAMES) -> int:
+    """
+    Alfa de un efecto pulsante (base + amplitude * sin(phase)) elegido entre
+    `frames` valores fijos por período.
+    """
+    index = int(phase * frames / (2 * math.pi)) % frames
+    return int(base + amplitude * math.sin(2 * math.pi * index / frames))
+
+
+class EffectCache:
+    """Superficies de efectos indexadas por forma y parámetros, con descarte LRU"""
+
+    def __init__(self, max_entries: int = EFFECT_CACHE_SIZE):
+        self.max_entries = max_entries
+        self._effects: "OrderedDict[tuple, pygame.Surface]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.bytes_held = 0
+
+    def circles(self, size: Tuple[int, int], center: Tuple[int, int],
+                layers: Sequence[CircleLayer]) -> pygame.Surface:
+        """Círculos concéntricos semitransparentes, dibujados en orden sobre una superficie"""
+        layers = tuple((radius, tuple(color), quantize_alpha(alpha)) for radius, color, alpha in layers)
+        key = ("circulos", tuple(size), tuple(center), layers)
+        surface = self._lookup(key)
+        if surface is None:
+            surface = pygame.Surface(size, pygame.SRCALPHA)
+            for radius, color, alpha in layers:
+                pygame.draw.circle(surface, (*color, alpha), center, radius)
+            self._store(key, surface)
+        return surface
+
+    def circle(self, radius: int, color: Tuple[int, int, int], alpha: float) -> pygame.Surface:
+        """Círculo semitransparente en una superficie de 2 * radio (se dibuja en x - radio, y - radio)"""
+        # Clave corta: es el efecto más frecuente (partículas, brillos, anillos)
+        alpha = quantize_alpha(alpha)
+        key = ("circulo", radius, color, alpha)
+        surface = self._lookup(key)
+        if surface is None:
+            surface = pygame.Surface((radius * 2, radius * 2), pygame.SRCALPHA)
+            pygame.draw.circle(surface, (*color, alpha), (radius, radius), radius)
+            self._store(key, surface)
+        return surface
+
+    def filled(self, size: Tuple[int, int], color: Tuple[int, int, int], alpha: float) -> pygame.Surface:
+        """Rectángulo semitransparente de un color"""
+        alpha = quantize_alpha(alpha)
+        key = ("relleno", tuple(size), tuple(color), alpha)
+        surface = self._lookup(key)
+        if surface is None:
+            surface = pygame.Surface(size, pygame.SRCALPHA)
+            surface.fill((*color, alpha))
+            self._store(key, surface)
+        return surface
+
+    def _lookup(self, key: tuple):
+        surface = self._effects.get(key)
+        if surface is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._effects.move_to_end(key)
+        return surface
+
+    def _store(self, key: tuple, surface: pygame.Surface) -> None:
+        self._effects[key] = surface
+        self.bytes_held += surface_bytes(surface)
+        while len(self._effects) > self.max_entries:
+            _, evicted = self._effects.popitem(last=False)
+            self.bytes_held -= surface_bytes(evicted)
+            self.evictions += 1
+
+    @property
+    def hit_rate(self) -> float:
+        """Porcentaje de efectos servidos desde la caché"""
+        total = self.hits + self.misses
+        return self.hits * 100.0 / total if total else 0.0
+
+    def clear(self) -> None:
+        """Vacía la caché (los contadores se conservan)"""
+        self._effects.clear()
+        self.bytes_held = 0
+
+    def stats(self) -> Dict[str, int]:
+        """Estadísticas de uso de la caché"""
+        return {
+            "entries": len(self._effects),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "bytes": self.bytes_held,
+        }
+
+    def report(self) -> None:
+        """Muestra las estadísticas en consola"""
+        stats = self.stats()
+        print(f"✨ Caché de efectos: {stats['entries']} sprites, {stats['bytes'] / (1024 * 1024):.1f} MB | "
+              f"aciertos {stats['hits']}, fallos {stats['misses']} ({self.hit_rate:.1f}%), "
+              f"descartes {stats['evictions']}")
+
+
+# Instancia global de la caché de efectos
+_effect_cache = None
+
+def get_effect_cache() -> EffectCache:
+    """Obtiene la instancia global de la caché de efectos"""
+    global _effect_cache
+    if _effect_cache is None:
+        _effect_cache = EffectCache()
+    return _effect_cache
@@ -11,6 +11,8 @@ import json
 import os
 import pygame
 from typing import Dict, List, Tuple, Any
+from collision_format import write_collision_file
+from collision_journal import get_collision_journal
 
 class GameDataManager:
     """Maneja la persistencia de datos del juego"""
@@ -20,10 +22,14 @@ class GameDataManager:
         self.data_dir = data_dir
         self.game_data_file = os.path.join(data_dir, "game_progress.json")
         self.collision_data_file = os.path.join(data_dir, "collision_blocks.json")
+        self.collision_binary_file = os.path.join(data_dir, "collision_blocks.bin")
         
         # Crear directorio si no existe
         os.makedirs(data_dir, exist_ok=True)
         
+        # Diario de ediciones del editor (se compacta en el archivo binario)
+        self.collision_journal = get_collision_journal(self.collision_binary_file)
+        
         # Datos por defecto
         self.default_game_data = {
             "total_worms_defeated": 0,
@@ -71,32 +77,39 @@ class GameDataManager:
             print(f"❌ Error guardando datos del juego: {e}")
             return False
     
-    def load_collision_data(self) -> Dict[str, Any]:
-        """Carga los datos de bloques de colisión"""
+    def load_collision_positions(self) -> List[Tuple[int, int]]:
+        """Carga las posiciones (x, y) de los bloques de colisión (archivo binario + diario)"""
         try:
+            if os.path.exists(self.collision_binary_file) or os.path.exists(self.collision_journal.journal_path):
+                positions = self.collision_journal.load()
+                print(f"🧱 Bloques de colisión cargados: {len(positions)} bloques")
+                return positions
             if os.path.exists(self.collision_data_file):
+                # Migración automática desde el JSON anterior
                 with open(self.collision_data_file, 'r', encoding='utf-8') as f:
                     data = json.load(f)
-                print(f"🧱 Bloques de colisión cargados: {len(data.get('blocks', []))} bloques")
-                return data
-            else:
-                print("📋 Creando nuevo archivo de bloques de colisión...")
-                return self.default_collision_data.copy()
+                positions = [(int(b["x"]), int(b["y"])) for b in data.get("blocks", [])]
+                write_collision_file(self.collision_binary_file, positions)
+                print(f"🔄 Bloques de colisión convertidos a formato binario: {len(positions)} bloques")
+                return self.collision_journal.load()
+            print("📋 Creando nuevo archivo de bloques de colisión...")
+            return []
         except Exception as e:
             print(f"⚠️ Error cargando bloques de colisión: {e}")
-            return self.default_collision_data.copy()
+            return []
+    
+    def load_collision_data(self) -> Dict[str, Any]:
+        """Carga los datos de bloques de colisión"""
+        data = self.default_collision_data.copy()
+        data["blocks"] = [{"x": x, "y": y} for x, y in self.load_collision_positions()]
+        data["total_blocks_placed"] = len(data["blocks"])
+        return data
     
     def save_collision_data(self, blocks: List[Tuple[int, int]], silent: bool = False) -> bool:
-        """Guarda los bloques de colisión"""
+        """Guarda todos los bloques de colisión en el archivo binario y vacía el diario"""
         try:
-            data = {
-                "blocks": [{"x": x, "y": y} for x, y in blocks],
-                "last_modified": pygame.time.get_ticks(),
-                "total_blocks_placed": len(blocks)
-            }
-            
-            with open(self.collision_data_file, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=2)
+            if not self.collision_journal.compact(blocks):
+                return False
             
             if not silent:
                 print(f"💾 Bloques guardados: {len(blocks)} bloques de colisión")
@@ -4,16 +4,20 @@ import random
 import math
 import time
 from audio_manager import get_audio_manager
+from effect_cache import get_effect_cache
+from render_scale import open_display, present
+from text_cache import get_font
 
 class Particle:
-    def __init__(self, x, y, screen_width, screen_height):
+    def __init__(self, x, y, screen_width, screen_height, scale=1.0):
         self.screen_width = screen_width
         self.screen_height = screen_height
+        self.scale = scale  # Tamaño y velocidad relativos a 1920x1080
         self.x = x
         self.y = y
-        self.vel_x = random.uniform(-0.5, 0.5)
-        self.vel_y = random.uniform(-2.5, -1.2)  # Velocidad más alta para subir más
-        self.size = random.uniform(2, 6)
+        self.vel_x = random.uniform(-0.5, 0.5) * scale
+        self.vel_y = random.uniform(-2.5, -1.2) * scale  # Velocidad más alta para subir más
+        self.size = random.uniform(2, 6) * scale
         self.alpha = random.uniform(100, 255)
         self.fade_rate = random.uniform(0.3, 1.2)  # Duran más tiempo visibles
         self.float_speed = random.uniform(0.8, 1.5)  # Mayor velocidad de flotación
@@ -24,23 +28,21 @@ class Particle:
         self.alpha -= self.fade_rate
         
         # Si la partícula sale de la pantalla o se desvanece, reiniciarla
-        if self.alpha <= 0 or self.y < -50:  # Permitir que suban mucho más arriba
+        if self.alpha <= 0 or self.y < -50 * self.scale:  # Permitir que suban mucho más arriba
             self.reset()
     
     def reset(self):
         self.x = random.uniform(0, self.screen_width)  # Responsive a resolución actual
-        self.y = random.uniform(self.screen_height, self.screen_height + 70)  # Responsive a resolución actual
+        self.y = random.uniform(self.screen_height, self.screen_height + 70 * self.scale)  # Responsive a resolución actual
         self.alpha = random.uniform(100, 255)
-        self.size = random.uniform(3, 9)  # Partículas más grandes
+        self.size = random.uniform(3, 9) * self.scale  # Partículas más grandes
     
     def draw(self, screen):
         if self.alpha > 0:
-            # Color amarillento dorado
-            color = (255, 215, 0, int(self.alpha))
-            # Crear superficie temporal para alpha
-            temp_surface = pygame.Surface((self.size * 2, self.size * 2), pygame.SRCALPHA)
-            pygame.draw.circle(temp_surface, color, (self.size, self.size), self.size)
-            screen.blit(temp_surface, (self.x - self.size, self.y - self.size))
+            # Color amarillento dorado (sprite pre-renderizado por radio y alfa)
+            radius = max(1, round(self.size))
+            particle_surface = get_effect_cache().circle(radius, (255, 215, 0), self.alpha)
+            screen.blit(particle_surface, (self.x - radius, self.y - radius))
 
 class IntroCinematica:
     def __init__(self):
@@ -60,7 +62,10 @@ class IntroCinematica:
         
         print(f"🖥️ Resolución detectada: {self.screen_width}x{self.screen_height}")
         
-        self.screen = pygame.display.set_mode((self.screen_width, self.screen_height), pygame.FULLSCREEN)
+        # Ventana a la resolución interna de RENDER_SCALE: el diseño de la intro ya se
+        # adapta al tamaño de la pantalla (factores de escala), así que se dibuja directo en ella
+        self.screen = open_display((self.screen_width, self.screen_height), pygame.FULLSCREEN)
+        self.screen_width, self.screen_height = self.screen.get_size()
         pygame.display.set_caption("🍎 La Tierra de las Manzanas - Intro")
         
         self.clock = pygame.time.Clock()
@@ -91,9 +96,9 @@ class IntroCinematica:
         base_text_size = 64
         base_button_size = 72
         
-        self.title_font = pygame.font.Font(None, int(base_title_size * self.scale_factor))
-        self.text_font = pygame.font.Font(None, int(base_text_size * self.scale_factor))
-        self.button_font = pygame.font.Font(None, int(base_button_size * self.scale_factor))
+        self.title_font = get_font(int(base_title_size * self.scale_factor))
+        self.text_font = get_font(int(base_text_size * self.scale_factor))
+        self.button_font = get_font(int(base_button_size * self.scale_factor))
         
         print(f"📝 Tamaños de fuente: Título={int(base_title_size * self.scale_factor)}, "
               f"Texto={int(base_text_size * self.scale_factor)}, "
@@ -103,7 +108,7 @@ class IntroCinematica:
         num_particles = max(30, int(50 * self.scale_factor))
         self.particles = [Particle(random.uniform(0, self.screen_width), 
                                  random.uniform(0, self.screen_height), 
-                                 self.screen_width, self.screen_height) 
+                                 self.screen_width, self.screen_height, self.scale_factor) 
                          for _ in range(num_particles)]
         
         # Historia dividida en fragmentos cinematográficos - VERSIÓN CALIBRADA
@@ -258,8 +263,9 @@ class IntroCinematica:
         
     def show_loading_screen(self, screen, selected_character):
         """Muestra una transición elegante antes de iniciar el juego"""
-        font = pygame.font.Font(None, 96)  # 2x escalado
-        small_font = pygame.font.Font(None, 64)  # 2x escalado
+        scale = self.scale_factor
+        font = get_font(int(96 * scale))  # 2x escalado
+        small_font = get_font(int(64 * scale))  # 2x escalado
         
         # Efecto de transición con fade
         for alpha in range(0, 255, 15):  # Fade in
@@ -267,31 +273,28 @@ class IntroCinematica:
             
             # Título principal
             title_text = font.render(f"Iniciando Nivel 1", True, (255, 255, 255))
-            title_rect = title_text.get_rect(center=(screen.get_width()//2, 280))
+            title_rect = title_text.get_rect(center=(screen.get_width()//2, int(280 * scale)))
             screen.blit(title_text, title_rect)
             
             # Personaje seleccionado
             char_text = small_font.render(f"Personaje: {selected_character.upper()}", True, (255, 215, 0))
-            char_rect = char_text.get_rect(center=(screen.get_width()//2, 340))
+            char_rect = char_text.get_rect(center=(screen.get_width()//2, int(340 * scale)))
             screen.blit(char_text, char_rect)
             
             # Mensaje motivacional
             message_text = small_font.render("¡Prepárate para rescatar a María!", True, (200, 255, 200))
-            message_rect = message_text.get_rect(center=(screen.get_width()//2, 380))
+            message_rect = message_text.get_rect(center=(screen.get_width()//2, int(380 * scale)))
             screen.blit(message_text, message_rect)
             
             # Efecto de partículas doradas
             for _ in range(20):
-                x = random.randint(100, screen.get_width() - 100)
-                y = random.randint(200, 500)
-                size = random.randint(2, 6)
-                color = (255, 215, 0, min(alpha, 200))
-                # Crear superficie temporal para alpha
-                temp_surface = pygame.Surface((size * 2, size * 2), pygame.SRCALPHA)
-                pygame.draw.circle(temp_surface, color, (size, size), size)
-                screen.blit(temp_surface, (x - size, y - size))
+                x = random.randint(int(100 * scale), screen.get_width() - int(100 * scale))
+                y = random.randint(int(200 * scale), int(500 * scale))
+                size = max(1, round(random.randint(2, 6) * scale))
+                particle_surface = get_effect_cache().circle(size, (255, 215, 0), min(alpha, 200))
+                screen.blit(particle_surface, (x - size, y - size))
             
-            pygame.display.flip()
+            present(screen)
             pygame.time.wait(50)  # 50ms por frame = transición suave
             
             # Procesar eventos para evitar que se cuelgue
@@ -556,7 +559,7 @@ class IntroCinematica:
             
             # Emoji del personaje escalado
             emoji_size = int(80 * self.scale_factor)
-            emoji_font = pygame.font.Font(None, emoji_size)
+            emoji_font = get_font(emoji_size)
             emoji_surface = emoji_font.render(char['emoji'], True, self.title_color)
             emoji_y = char_rect.y + int(40 * self.scale_factor)
             emoji_rect = emoji_surface.get_rect(center=(char_rect.centerx, emoji_y))
@@ -576,7 +579,7 @@ class IntroCinematica:
             
             # Segunda línea de descripción escalada
             small_text_size = int(48 * self.scale_factor)
-            small_text_font = pygame.font.Font(None, small_text_size)
+            small_text_font = get_font(small_text_size)
             line2_surface = small_text_font.render(char['line2'], True, (180, 180, 180))
             line2_y = char_rect.y + int(155 * self.scale_factor)
             line2_rect = line2_surface.get_rect(center=(char_rect.centerx, line2_y))
@@ -609,7 +612,7 @@ class IntroCinematica:
             # Mostrar menú principal
             self.draw_menu()
         
-        pygame.display.flip()
+        present(self.screen)
     
     def run(self):
         """Bucle principal de la intro"""
@@ -1,6 +1,12 @@
 import pygame
 import random
 import math
+from asset_store import get_asset_store
+from render_scale import canvas_draw
+from text_cache import get_font
+
+# Superficies de items por (tipo, ancho, alto): se decodifican una vez y se comparten
+_item_surfaces = {}
 
 class Item:
     def __init__(self, item_type, x, y, spawn_delay=0):
@@ -22,50 +28,27 @@ class Item:
         self.surface = self.create_item_surface()
         
     def create_item_surface(self):
-        """Carga la superficie visual del item desde URLs"""
+        """Obtiene la superficie visual del item (compartida entre items del mismo tipo)"""
+        key = (self.type, self.width, self.height)
+        surface = _item_surfaces.get(key)
+        if surface is None:
+            surface = get_asset_store().image(f"items/{self.type}", (self.width, self.height))
+            if surface is None:
+                surface = self.create_fallback_surface()
+            _item_surfaces[key] = surface
+        return surface
+    
+    def create_fallback_surface(self):
+        """Sprites simples para items sin imagen en el almacén local"""
         surface = pygame.Surface((self.width, self.height), pygame.SRCALPHA)
-        
-        # URLs correctas de los items desde GitHub
-        item_urls = {
-            'apple': 'https://github.com/user-attachments/assets/8d98de91-3834-456d-8dac-484029df9a02',
-            'potion': 'https://github.com/user-attachments/assets/5365c2ea-ad1e-4055-8d3b-de1547e10396'
-        }
-        
-        try:
-            if self.type in item_urls:
-                import requests
-                from PIL import Image
-                from io import BytesIO
-                
-                response = requests.get(item_urls[self.type], timeout=5)
-                response.raise_for_status()
-                
-                pil_image = Image.open(BytesIO(response.content))
-                pil_image = pil_image.convert('RGBA')
-                try:
-                    if hasattr(Image, 'Resampling'):
-                        pil_image = pil_image.resize((self.width, self.height), Image.Resampling.LANCZOS)
-                    else:
-                        pil_image = pil_image.resize((self.width, self.height))
-                except AttributeError:
-                    pil_image = pil_image.resize((self.width, self.height))
-                
-                image_data = pil_image.tobytes()
-                surface = pygame.image.fromstring(image_data, (self.width, self.height), 'RGBA')
-                surface = surface.convert_alpha()
-                
-        except Exception as e:
-            print(f"⚠️ Error cargando {self.type}: {e}, usando fallback")
-            # Fallback a sprites simples
-            if self.type == 'apple':
-                pygame.draw.circle(surface, (220, 20, 60), (16, 20), 12)
-                pygame.draw.circle(surface, (34, 139, 34), (16, 12), 4)
-                pygame.draw.rect(surface, (101, 67, 33), (15, 8, 2, 6))
-            elif self.type == 'potion':
-                pygame.draw.rect(surface, (0, 100, 200), (8, 16, 16, 12))
-                pygame.draw.circle(surface, (0, 100, 200), (16, 16), 8)
-                pygame.draw.rect(surface, (139, 69, 19), (14, 12, 4, 6))
-            
+        if self.type == 'apple':
+            pygame.draw.circle(surface, (220, 20, 60), (16, 20), 12)
+            pygame.draw.circle(surface, (34, 139, 34), (16, 12), 4)
+            pygame.draw.rect(surface, (101, 67, 33), (15, 8, 2, 6))
+        elif self.type == 'potion':
+            pygame.draw.rect(surface, (0, 100, 200), (8, 16, 16, 12))
+            pygame.draw.circle(surface, (0, 100, 200), (16, 16), 8)
+            pygame.draw.rect(surface, (139, 69, 19), (14, 12, 4, 6))
         return surface
     
     def update(self):
@@ -100,7 +83,7 @@ class Item:
             screen.blit(scaled_surface, (screen_x, screen_y))
             
             # Brillo sutil más pequeño
-            pygame.draw.circle(screen, (255, 255, 255, 50), 
+            canvas_draw.circle(screen, (255, 255, 255, 50), 
                              (screen_x + 8, screen_y + 8), 12, 2)
     
     def get_rect(self):
@@ -166,17 +149,17 @@ class UpgradeMenu:
         menu_x = (screen.get_width() - menu_width) // 2
         menu_y = (screen.get_height() - menu_height) // 2
         
-        pygame.draw.rect(screen, self.bg_color, (menu_x, menu_y, menu_width, menu_height))
-        pygame.draw.rect(screen, (100, 100, 100), (menu_x, menu_y, menu_width, menu_height), 3)
+        canvas_draw.rect(screen, self.bg_color, (menu_x, menu_y, menu_width, menu_height))
+        canvas_draw.rect(screen, (100, 100, 100), (menu_x, menu_y, menu_width, menu_height), 3)
         
         # Título
-        font_title = pygame.font.Font(None, 32)
+        font_title = get_font(32)
         title = font_title.render("Elige una mejora:", True, (255, 255, 255))
         title_x = menu_x + (menu_width - title.get_width()) // 2
         screen.blit(title, (title_x, menu_y + 20))
         
         # Opciones
-        font_option = pygame.font.Font(None, 24)
+        font_option = get_font(24)
         for i, option in enumerate(self.options):
             color = self.selected_color if i == self.selected_option else self.normal_color
             
@@ -185,7 +168,7 @@ class UpgradeMenu:
             
             # Resaltar opción seleccionada
             if i == self.selected_option:
-                pygame.draw.rect(screen, (50, 100, 150), 
+                canvas_draw.rect(screen, (50, 100, 150), 
                                (menu_x + 10, option_y - 5, menu_width - 20, 30))
             
             screen.blit(option_text, (menu_x + 20, option_y))
@@ -232,10 +215,10 @@ class ShieldEffect:
         
         # Círculo de escudo
         radius = 40
-        pygame.draw.circle(screen, (0, 150, 255, 100), (x, y), radius, 3)
+        canvas_draw.circle(screen, (0, 150, 255, 100), (x, y), radius, 3)
         
         # Texto de tiempo restante
-        font = pygame.font.Font(None, 20)
+        font = get_font(20)
         time_text = font.render(f"Escudo: {remaining//1000}s", True, (0, 150, 255))
         screen.blit(time_text, (x - 40, y - 60))
 
@@ -1,6 +1,8 @@
 import pygame
 import math
-from PIL import Image
+from lazy_animations import PREFETCH_ATTACK, is_ready, lazy_gif_frames
+from sprite_keying import KEY_ATTACK
+from text_cache import get_font
 import os
 
 class JuanAttack:
@@ -45,56 +47,26 @@ class JuanAttack:
             try:
                 print(f"📥 Cargando ataque {direction} desde archivo local...")
                 
-                # Cargar el GIF desde archivo local
-                gif = Image.open(url)
-                frames = []
-                
-                # Extraer todos los frames del GIF
+                # Extraer todos los frames del GIF (compartidos si ya se cargaron antes)
                 try:
-                    frame_count = getattr(gif, 'n_frames', 1)  # Usar getattr para evitar error
-                    for frame_num in range(frame_count):
-                        gif.seek(frame_num)
-                        frame = gif.copy().convert("RGBA")
-                        
-                        # Procesar cada pixel para eliminar fondos blancos/grises
-                        pixels = frame.load()
-                        if pixels:  # Verificar que pixels no sea None
-                            for y in range(frame.height):
-                                for x in range(frame.width):
-                                    try:
-                                        r, g, b, a = pixels[x, y]
-                                        # Eliminar fondos blancos, grises claros y similares
-                                        if r > 200 and g > 200 and b > 200:
-                                            pixels[x, y] = (r, g, b, 0)  # Hacer transparente
-                                        elif abs(r - g) < 30 and abs(r - b) < 30 and abs(g - b) < 30 and r > 180:
-                                            pixels[x, y] = (r, g, b, 0)  # Eliminar grises claros
-                                    except (IndexError, TypeError):
-                                        continue  # Ignorar errores de píxeles
-                        
-                        # Convertir PIL image a superficie de Pygame
-                        frame_data = frame.tobytes()
-                        pygame_surface = pygame.image.fromstring(frame_data, frame.size, "RGBA")
-                        
-                        # Aplicar transparencia adicional y suavizado
-                        pygame_surface = pygame_surface.convert_alpha()
-                        pygame_surface.set_colorkey((255, 255, 255))
-                        
-                        # Escalar 56% más grande (30% + 20% adicional)
-                        original_size = pygame_surface.get_size()
-                        new_size = (int(original_size[0] * 1.56), int(original_size[1] * 1.56))
-                        pygame_surface = pygame.transform.scale(pygame_surface, new_size)
-                        
-                        frames.append(pygame_surface)
+                    # Eliminar fondos blancos y grises claros, escalar 56% más grande (30% + 20% adicional)
+                    # Se decodifica en segundo plano; si se usa antes, se completa en ese momento
+                    frames = lazy_gif_frames(url, rule=KEY_ATTACK, scale=1.56, colorkey=(255, 255, 255),
+                                             priority=PREFETCH_ATTACK)
                         
                 except (AttributeError, OSError, Exception) as e:
                     print(f"⚠️ Error procesando frames: {e}")
                     # Crear frame de respaldo
+                    frames = []
                     backup_surface = pygame.Surface((100, 100), pygame.SRCALPHA)
                     backup_surface.fill((255, 255, 0, 128))  # Amarillo semitransparente
                     frames.append(backup_surface)
                 
                 self.attack_animations[direction] = frames
-                print(f"✅ Cargada animación de ataque '{direction}': {len(frames)} frames")
+                if is_ready(frames):
+                    print(f"✅ Cargada animación de ataque '{direction}': {len(frames)} frames")
+                else:
+                    print(f"⏳ Animación de ataque '{direction}' diferida (prefetch en segundo plano)")
                 
             except Exception as e:
                 print(f"❌ Error cargando ataque {direction}: {e}")
@@ -352,7 +324,7 @@ class JuanAttack:
         # Efectos especiales eliminados para mejor visibilidad
     
     def draw_ui(self, screen):
-        font = pygame.font.Font(None, 24)
+        font = get_font(24)
         
         combo_text = f"Combo: {self.combo_count + 1}/{self.max_combo}"
         combo_surface = font.render(combo_text, True, (100, 255, 100))
@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+"""
+LAZY ANIMATIONS - La Tierra de las Manzanas
+Animaciones que se decodifican recién cuando hacen falta:
+- LazyFrames: lista de frames que se completa sola en el primer acceso
+  (len, índice, iteración); mientras tanto muestra un marcador (p. ej. los frames de
+  la dirección inicial) o, si no tiene marcador, decodifica en el momento
+- AnimationPrefetcher: hilo de baja prioridad que decodifica de antemano las
+  direcciones que probablemente se usen después (PIL + recorte sobre búferes
+  crudos); las superficies se crean siempre en el hilo principal
+Lo que ya está en la caché de sprites (memoria o disco) se entrega al
+instante como una lista normal: solo el primer arranque en frío es diferido.
+Con LAZY_ANIMATIONS = False todo se carga por adelantado, como antes.
+"""
+
+import itertools
+import os
+import queue
+import threading
+import pygame
+from typing import Dict, List, Optional, Tuple
+from config import *
+from sprite_cache import (FrameRequest, cached_gif_frames, decode_gif_buffers, get_sprite_cache,
+                          load_gif_frames, store_gif_frames, surfaces_from_buffers)
+
+# Prioridades del prefetch (menor = antes)
+PREFETCH_URGENT = 0  # Se pidió una dirección que todavía no está lista
+PREFETCH_MOVEMENT = 1  # Otras direcciones de movimiento (las más probables)
+PREFETCH_ATTACK = 2  # Ataques
+PREFETCH_BOSS = 3  # Jefe del nivel (aparece más tarde)
+
+
+class AnimationPrefetcher:
+    """Hilo en segundo plano que decodifica GIFs por orden de prioridad"""
+
+    def __init__(self):
+        self._queue: "queue.PriorityQueue" = queue.PriorityQueue()
+        self._order = itertools.count()  # Desempate: primero lo que se pidió antes
+        self._results: Dict[Tuple, object] = {}  # clave de decodificación -> búferes o excepción
+        self._released = set()  # Claves ya convertidas en superficies: el hilo las salta
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self.decoded = 0
+
+    def request(self, decode_key: Tuple, priority: int = PREFETCH_MOVEMENT) -> None:
+        """Encola un GIF para decodificar (pedirlo de nuevo con más prioridad lo adelanta)"""
+        with self._lock:
+            if decode_key in self._results:
+                return
+            # Una animación nueva pide otra vez un GIF ya liberado (p. ej. tras vaciar la caché)
+            self._released.discard(decode_key)
+            self._queue.put((priority, next(self._order), decode_key))
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="prefetch-animaciones", daemon=True)
+                self._thread.start()
+
+    def result(self, decode_key: Tuple):
+        """Búferes decodificados, la excepción si falló, o None si aún no está listo"""
+        with self._lock:
+            return self._results.get(decode_key)
+
+    def release(self, decode_key: Tuple) -> None:
+        """Descarta los búferes de un GIF ya convertido en superficies (y lo que quede en la cola)"""
+        with self._lock:
+            self._results.pop(decode_key, None)
+            self._released.add(decode_key)
+
+    def _run(self) -> None:
+        """Bucle del hilo: decodifica en orden de prioridad (no toca Pygame)"""
+        while True:
+            priority, _, decode_key = self._queue.get()
+            with self._lock:
+                done = decode_key in self._results or decode_key in self._released
+            if not done:
+                try:
+                    result = decode_gif_buffers(*decode_key)
+                    self.decoded += 1
+                except Exception as e:
+                    result = e
+                with self._lock:
+                    # El hilo principal pudo decodificarlo y liberarlo mientras tanto
+                    if decode_key not in self._released:
+                        self._results[decode_key] = result
+            self._queue.task_done()
+
+    def wait_idle(self) -> None:
+        """Espera a que se vacíe la cola (herramientas y pruebas)"""
+        self._queue.join()
+
+
+class LazyFrames(list):
+    """Lista de frames que se decodifica en el primer acceso"""
+
+    def __init__(self, request: FrameRequest, placeholder: Optional[List[pygame.Surface]] = None):
+        """
+        Args:
+            request: Animación a cargar (mismos parámetros que load_gif_frames)
+            placeholder: Frames a mostrar mientras tanto; None para decodificar
+                en el momento del primer acceso (p. ej. ataques, cuya duración
+                depende de la cantidad de frames)
+        """
+        super().__init__(placeholder or [])
+        self.request = request
+        self.blocking = placeholder is None
+        self.ready = False
+        self._urgent = False
+
+    def resolve(self) -> bool:
+        """
+        Completa la lista si los frames ya están disponibles.
+
+        Returns:
+            True si la lista ya tiene los frames definitivos
+        """
+        if self.ready:
+            return True
+        prefetcher = get_animation_prefetcher()
+        decode_key = self.request.decode_key
+        # Otro cargador pudo haberla completado mientras tanto (el disco ya se consultó al crearla)
+        cache = get_sprite_cache()
+        frames = cache.get(self.request.key) if cache.has(self.request.key) else None
+        if frames is None:
+            buffers = prefetcher.result(decode_key)
+            if buffers is None:
+                if not self.blocking:
+                    # Sigue el marcador; el prefetch adelanta esta animación (una sola vez)
+                    if not self._urgent:
+                        prefetcher.request(decode_key, PREFETCH_URGENT)
+                        self._urgent = True
+                    return False
+                try:
+                    buffers = decode_gif_buffers(*decode_key)
+                except Exception as e:
+                    buffers = e
+            if isinstance(buffers, Exception):
+                print(f"⚠️ No se pudo cargar {self.request.path}: {buffers}")
+                self.ready = True  # Se queda con el marcador
+                return True
+            frames = surfaces_from_buffers(buffers, self.request.rule, self.request.scale,
+                                           self.request.flip, self.request.colorkey)
+            store_gif_frames(self.request, frames)
+        prefetcher.release(decode_key)
+        self[:] = frames
+        self.ready = True
+        return True
+
+    def __bool__(self) -> bool:
+        # Una animación pendiente cuenta como no vacía sin forzar la decodificación
+        return not self.ready or super().__len__() > 0
+
+    def __len__(self) -> int:
+        if not self.ready:
+            self.resolve()
+        return super().__len__()
+
+    def __getitem__(self, index):
+        if not self.ready:
+            self.resolve()
+        return super().__getitem__(index)
+
+    def __iter__(self):
+        # for, enumerate y list() no pasan por __getitem__
+        if not self.ready:
+            self.resolve()
+        return super().__iter__()
+
+    def __reversed__(self):
+        if not self.ready:
+            self.resolve()
+        return super().__reversed__()
+
+
+def lazy_gif_frames(path: str, rule=None, scale: float = 1.0, size: Optional[Tuple[int, int]] = None,
+                    flip: bool = False, colorkey: Optional[Tuple[int, int, int]] = None,
+                    placeholder: Optional[List[pygame.Surface]] = None,
+                    priority: int = PREFETCH_MOVEMENT) -> List[pygame.Surface]:
+    """
+    Como load_gif_frames, pero sin decodificar en frío: devuelve una LazyFrames
+    y encola el GIF en el prefetch.
+
+    Si la animación ya está en caché (memoria o disco) o LAZY_ANIMATIONS está
+    desactivado, devuelve la lista normal. Un archivo inexistente lanza
+    FileNotFoundError para que cada cargador use su frame de respaldo.
+    """
+    request = FrameRequest(path, rule, scale, size, flip, colorkey)
+    if not LAZY_ANIMATIONS:
+        return load_gif_frames(*request)
+    frames = cached_gif_frames(request)
+    if frames is not None:
+        return frames
+    if not os.path.exists(path):
+        raise FileNotFoundError(f"Archivo no encontrado: {path}")
+    get_animation_prefetcher().request(request.decode_key, priority)
+    return LazyFrames(request, placeholder)
+
+
+def is_ready(frames: List[pygame.Surface]) -> bool:
+    """Indica si una lista de frames ya tiene sus frames definitivos"""
+    return getattr(frames, "ready", True)
+
+
+# Instancia global del prefetch
+_animation_prefetcher = None
+
+def get_animation_prefetcher() -> AnimationPrefetcher:
+    """Obtiene la instancia global del prefetch de animaciones"""
+    global _animation_prefetcher
+    if _animation_prefetcher is None:
+        _animation_prefetcher = AnimationPrefetcher()
+    return _animation_prefetcher
@@ -1,5 +1,7 @@
 import pygame
 import math
+from render_scale import canvas_draw, present
+from text_cache import get_font
 
 # Constantes optimizadas
 COLORS = {
@@ -19,15 +21,16 @@ FONT_SIZES = {
 class LoadingScreen:
     """Sistema de pantalla de carga optimizado"""
     
-    def __init__(self, screen):
+    def __init__(self, screen, title="🍎 Cargando Nivel 1"):
         self.screen = screen
+        self.title = title
         self.screen_width = screen.get_width()
         self.screen_height = screen.get_height()
         
         # Fuentes optimizadas
-        self.title_font = pygame.font.Font(None, FONT_SIZES['TITLE'])
-        self.text_font = pygame.font.Font(None, FONT_SIZES['TEXT'])
-        self.small_font = pygame.font.Font(None, FONT_SIZES['SMALL'])
+        self.title_font = get_font(FONT_SIZES['TITLE'])
+        self.text_font = get_font(FONT_SIZES['TEXT'])
+        self.small_font = get_font(FONT_SIZES['SMALL'])
         
         # Estado de carga
         self.assets_to_load = []
@@ -35,6 +38,10 @@ class LoadingScreen:
         self.current_message = "Iniciando..."
         self.progress = 0.0
         
+        # Unidades de trabajo reales (precarga en paralelo)
+        self.work_total = 0
+        self.work_done = 0
+        
         # Frases clásicas de carga
         self.loading_messages = [
             "Preparando el mundo...",
@@ -81,6 +88,23 @@ class LoadingScreen:
         else:
             self.progress = min(self.progress + 0.1, 1.0)
     
+    def start_work(self, total_units, message=None):
+        """Inicia la carga medida en unidades de trabajo reales"""
+        self.assets_to_load = []
+        self.current_asset = 0
+        self.work_total = max(1, total_units)
+        self.work_done = 0
+        self.progress = 0.0
+        if message:
+            self.current_message = message
+    
+    def complete_work(self, units=1, message=None):
+        """Marca unidades de trabajo terminadas y recalcula el progreso"""
+        self.work_done = min(self.work_done + units, self.work_total)
+        self.progress = self.work_done / self.work_total if self.work_total else 1.0
+        if message:
+            self.current_message = message
+    
     def set_custom_message(self, message):
         """Establece un mensaje personalizado"""
         self.current_message = message
@@ -109,7 +133,7 @@ class LoadingScreen:
             self.screen.blit(temp_surface, (x - size, y - size))
         
         # Título principal
-        title_text = self.title_font.render("🍎 Cargando Nivel 1", True, COLORS['TITLE'])
+        title_text = self.title_font.render(self.title, True, COLORS['TITLE'])
         title_rect = title_text.get_rect(center=(self.screen_width//2, 220))
         self.screen.blit(title_text, title_rect)
         
@@ -125,15 +149,15 @@ class LoadingScreen:
         bar_y = int(self.screen_height * 0.65)  # 65% de la altura de pantalla
         
         # Fondo de la barra
-        pygame.draw.rect(self.screen, COLORS['BAR_BG'], (bar_x, bar_y, bar_width, bar_height))
+        canvas_draw.rect(self.screen, COLORS['BAR_BG'], (bar_x, bar_y, bar_width, bar_height))
         
         # Progreso
         progress_width = int(bar_width * self.progress)
         if progress_width > 0:
-            pygame.draw.rect(self.screen, COLORS['PROGRESS'], (bar_x, bar_y, progress_width, bar_height))
+            canvas_draw.rect(self.screen, COLORS['PROGRESS'], (bar_x, bar_y, progress_width, bar_height))
         
         # Borde de la barra
-        pygame.draw.rect(self.screen, COLORS['TEXT'], (bar_x, bar_y, bar_width, bar_height), 2)
+        canvas_draw.rect(self.screen, COLORS['TEXT'], (bar_x, bar_y, bar_width, bar_height), 2)
         
         # Porcentaje
         percent = int(self.progress * 100)
@@ -141,8 +165,12 @@ class LoadingScreen:
         percent_rect = percent_text.get_rect(center=(self.screen_width//2, bar_y + 50))
         self.screen.blit(percent_text, percent_rect)
         
-        # Asset actual (si hay)
-        if self.current_asset < len(self.assets_to_load):
+        # Asset actual (si hay) o unidades de trabajo completadas
+        if self.work_total:
+            work_text = self.small_font.render(f"{self.work_done}/{self.work_total} tareas", True, (180, 180, 180))
+            work_rect = work_text.get_rect(center=(self.screen_width//2, bar_y + 80))
+            self.screen.blit(work_text, work_rect)
+        elif self.current_asset < len(self.assets_to_load):
             asset_info = self.assets_to_load[self.current_asset]
             asset_text = self.small_font.render(f"Cargando: {asset_info.get('name', 'Recurso')}", True, (180, 180, 180))
             asset_rect = asset_text.get_rect(center=(self.screen_width//2, bar_y + 80))
@@ -160,7 +188,7 @@ class LoadingScreen:
         tip_rect = tip_text.get_rect(center=(self.screen_width//2, self.screen_height - 80))
         self.screen.blit(tip_text, tip_rect)
         
-        pygame.display.flip()
+        present(self.screen)
     
     def is_complete(self):
         """Verifica si la carga está completa"""
@@ -182,7 +210,7 @@ class LoadingScreen:
             y = self.screen_height//2 + 100 * pygame.math.Vector2(1, 0).rotate(angle).y
             size = 4 + 2 * abs(pygame.math.Vector2(1, 0).rotate(36 * i).x)
             color = (100 + 155 * abs(pygame.math.Vector2(1, 0).rotate(72 * i).x), 255, 100)
-            pygame.draw.circle(self.screen, color, (int(x), int(y)), int(size))
+            canvas_draw.circle(self.screen, color, (int(x), int(y)), int(size))
         
-        pygame.display.flip()
+        present(self.screen)
         pygame.time.wait(1000)  # Mostrar por 1 segundo
\ No newline at end of file
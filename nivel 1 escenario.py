@@ -7,9 +7,7 @@ import pygame
 import sys
 import math
 import random
-import requests
 from PIL import Image
-from io import BytesIO
 
 # Importaciones de configuración y utilidades
 from config import *
@@ -18,13 +16,23 @@ from utils import *
 # Importaciones del juego
 from adan_attacks import AdanAttack
 from adan_character_animation import AdanCharacter
+from asset_preloader import AssetPreloader, level_1_requests, level_2_requests
+from asset_store import get_asset_store
 from audio_manager import get_audio_manager
+from background_loader import load_background
+from background_renderer import ChunkedBackground
 from character_ai import CharacterAI
+from collision_editor import CollisionOverlay, EditorHistory, cells_in_rect
+from collision_grid import CollisionIndex
+from effect_cache import get_effect_cache, pulse_alpha
 from game_data_manager import get_game_data_manager
 from intro_cinematica import IntroCinematica
 from juan_attacks import JuanAttack
 from juan_character_animation import JuanCharacter
 from loading_screen import LoadingScreen
+from render_scale import canvas_draw, create_canvas, open_display, present, to_logical
+from sprite_cache import get_sprite_cache
+from text_cache import get_font, get_text_cache
 from worm_enemy import WormSpawner
 from sound_generator import get_sound_generator, play_sound
 
@@ -96,13 +104,13 @@ class StaticItem:
             # Fallback: círculo de color
             color = (255, 50, 50) if self.item_type == 'apple' else (50, 100, 255)
             center = (int(screen_pos[0] + self.width//2), int(screen_pos[1] + self.height//2))
-            pygame.draw.circle(screen, color, center, self.width//2)
+            canvas_draw.circle(screen, color, center, self.width//2)
         
         # Indicador "E" simplificado
-        font = pygame.font.Font(None, 24)
+        font = get_font(24)
         text = font.render("E", True, (255, 255, 255))
         text_pos = (screen_pos[0] + self.width//2 - 8, screen_pos[1] - 18)
-        pygame.draw.rect(screen, (0, 0, 0, 120), (*text_pos, 16, 16))
+        canvas_draw.rect(screen, (0, 0, 0, 120), (*text_pos, 16, 16))
         screen.blit(text, text_pos)
     
     def get_rect(self):
@@ -114,7 +122,9 @@ class StaticItem:
 class CollisionManager:
     """Maneja las colisiones con bloques invisibles"""
     def __init__(self, world_width=1980, world_height=1080):
-        self.blocks = []
+        # Bloques indexados por celda (columna, fila): altas, bajas y búsquedas en O(1)
+        self.cells = {}
+        self.history = EditorHistory()
         self.editor_mode = False
         self.block_size = CHARACTER_SIZE[0] // 2
         self.editor_cursor_x = 100
@@ -129,26 +139,41 @@ class CollisionManager:
         self.drag_current_x = 0
         self.drag_current_y = 0
         self.is_dragging = False
+        self.drag_button = 1  # 1 = rellenar, 3 = borrar
         
-        # Sistema de persistencia
+        # Índice de colisiones (hash espacial / mapa de ocupación) según COLLISION_ENGINE
+        self.collision_index = CollisionIndex(self.world_width, self.world_height,
+                                              block_factory=CollisionBlock)
+        # Capa pre-renderizada del editor (solo se redibujan las celdas que cambian)
+        self.overlay = CollisionOverlay(self.world_width, self.world_height, self.block_size)
+        
+        # Sistema de persistencia: cada edición va al diario y un hilo la compacta en el binario
         self.data_manager = get_game_data_manager()
+        self.journal = self.data_manager.collision_journal
         self.load_collision_data()
+        self.journal.start()
+    
+    @property
+    def blocks(self):
+        """Lista de bloques de colisión (a partir del conjunto de celdas)"""
+        return list(self.cells.values())
     
     def load_collision_data(self):
         """Carga bloques de colisión desde archivo"""
         try:
-            collision_data = self.data_manager.load_collision_data()
-            self.blocks = []
-            
-            for block_data in collision_data.get("blocks", []):
-                x = block_data["x"]
-                y = block_data["y"]
-                self.blocks.append(CollisionBlock(x, y, self.block_size, self.block_size))
-            
-            print(f"🧱 Bloques de colisión cargados: {len(self.blocks)} bloques")
+            positions = self.data_manager.load_collision_positions()
+            self.cells = {(int(x) // self.block_size, int(y) // self.block_size):
+                              CollisionBlock(x, y, self.block_size, self.block_size) for x, y in positions}
+            self.history.clear()
+            self.overlay.invalidate()
+            
+            self.collision_index.rebuild(self.blocks)
+            print(f"🧱 Bloques de colisión cargados: {len(self.blocks)} bloques (motor: {self.collision_index.engine})")
         except Exception as e:
             print(f"⚠️ Error cargando bloques: {e}")
-            self.blocks = []
+            self.cells = {}
+            self.collision_index.clear()
+            self.overlay.invalidate()
     
     def save_collision_data(self, silent=True):
         """Guarda bloques de colisión en archivo"""
@@ -158,22 +183,24 @@ class CollisionManager:
         except Exception as e:
             print(f"❌ Error guardando bloques: {e}")
     
+    def request_save(self):
+        """Pide la compactación del diario en segundo plano (sin bloquear el frame)"""
+        self.journal.request_compaction()
+    
+    def close(self):
+        """Detiene el hilo del diario y guarda las ediciones pendientes (al salir del nivel)"""
+        self.journal.close()
+    
     def add_block(self, x, y):
         """Añade un bloque de colisión y guarda automáticamente"""
         # Alinear a la grilla
         grid_x = (x // self.block_size) * self.block_size
         grid_y = (y // self.block_size) * self.block_size
         
-        # Verificar si ya existe un bloque en esa posición
-        for block in self.blocks:
-            if block.x == grid_x and block.y == grid_y:
-                return False
-        
-        self.blocks.append(CollisionBlock(grid_x, grid_y, self.block_size, self.block_size))
+        # Verificar si ya existe un bloque en esa posición (búsqueda O(1) en el conjunto de celdas)
+        if not self.fill_cells([(int(grid_x // self.block_size), int(grid_y // self.block_size))]):
+            return False
         print(f"✅ Bloque añadido en ({grid_x}, {grid_y})")
-        
-        # Guardar automáticamente
-        self.save_collision_data(silent=True)
         return True
     
     def remove_block(self, x, y):
@@ -181,22 +208,82 @@ class CollisionManager:
         grid_x = (x // self.block_size) * self.block_size
         grid_y = (y // self.block_size) * self.block_size
         
-        for block in self.blocks[:]:
-            if block.x == grid_x and block.y == grid_y:
-                self.blocks.remove(block)
-                print(f"🗑️ Bloque eliminado en ({grid_x}, {grid_y})")
-                
-                # Guardar automáticamente
-                self.save_collision_data(silent=True)
-                return True
+        if self.erase_cells([(int(grid_x // self.block_size), int(grid_y // self.block_size))]):
+            print(f"🗑️ Bloque eliminado en ({grid_x}, {grid_y})")
+            return True
         return False
     
+    def apply_cell_changes(self, add_cells, remove_cells, record_history=True):
+        """
+        Aplica un lote de altas y bajas tocando solo las celdas afectadas.
+        
+        Args:
+            add_cells: Celdas (columna, fila) a ocupar
+            remove_cells: Celdas (columna, fila) a liberar
+            record_history: Si la operación se puede deshacer
+            
+        Returns:
+            Tupla (celdas añadidas, celdas eliminadas) que realmente cambiaron
+        """
+        size = self.block_size
+        removed_cells, removed_blocks = [], []
+        for cell in remove_cells:
+            block = self.cells.pop(cell, None)
+            if block is not None:
+                removed_cells.append(cell)
+                removed_blocks.append(block)
+        
+        added_cells, added_blocks = [], []
+        for cell in add_cells:
+            if cell not in self.cells:
+                block = CollisionBlock(cell[0] * size, cell[1] * size, size, size)
+                self.cells[cell] = block
+                added_cells.append(cell)
+                added_blocks.append(block)
+        
+        # Índice y diario se actualizan una sola vez por lote
+        self.collision_index.remove_many(removed_blocks)
+        self.collision_index.insert_many(added_blocks)
+        self.journal.record_many([(block.x, block.y) for block in added_blocks],
+                                 [(block.x, block.y) for block in removed_blocks])
+        self.overlay.update_cells(added_cells + removed_cells, self.cells)
+        if record_history:
+            self.history.push(added_cells, removed_cells)
+        return added_cells, removed_cells
+    
+    def fill_cells(self, cells):
+        """Ocupa en lote las celdas indicadas y devuelve las que se añadieron"""
+        return self.apply_cell_changes(cells, [])[0]
+    
+    def erase_cells(self, cells):
+        """Libera en lote las celdas indicadas y devuelve las que se eliminaron"""
+        return self.apply_cell_changes([], cells)[1]
+    
+    def undo(self):
+        """Deshace la última operación del editor"""
+        change = self.history.undo()
+        if change is None:
+            print("↩️ Nada que deshacer")
+            return False
+        added, removed = change
+        self.apply_cell_changes(removed, added, record_history=False)
+        print(f"↩️ Deshecho: {len(added)} bloques quitados, {len(removed)} restaurados")
+        return True
+    
+    def redo(self):
+        """Vuelve a aplicar la última operación deshecha"""
+        change = self.history.redo()
+        if change is None:
+            print("↪️ Nada que rehacer")
+            return False
+        added, removed = change
+        self.apply_cell_changes(added, removed, record_history=False)
+        print(f"↪️ Rehecho: {len(added)} bloques añadidos, {len(removed)} quitados")
+        return True
+    
     def check_collision(self, character_rect):
         """Verifica colisión con bloques"""
-        for block in self.blocks:
-            if character_rect.colliderect(block.rect):
-                return True
-        return False
+        return self.collision_index.collides(character_rect)
     
     def can_move_to(self, character, new_x, new_y):
         """Verifica si un personaje puede moverse a una posición"""
@@ -214,22 +301,56 @@ class CollisionManager:
         
         return True
     
+    def resolve_movements(self, moves):
+        """
+        Resuelve en una sola llamada los movimientos del tick, eje por eje,
+        para que los cuerpos se deslicen por las paredes en lugar de detenerse.
+        
+        Args:
+            moves: Lista de (cuerpo, x_anterior, y_anterior, ancho, alto); cada cuerpo
+                   ya tiene en x/y la posición a la que intentó moverse
+        """
+        requests = [(old_x, old_y, width, height, body.x - old_x, body.y - old_y)
+                    for body, old_x, old_y, width, height in moves]
+        results = self.collision_index.resolve_moves(requests)
+        for (body, _, _, _, _), (x, y, hit_x, hit_y) in zip(moves, results):
+            body.x, body.y = x, y
+            # Los cuerpos con velocidad (gusanos) la pierden en el eje del choque
+            if hit_x and hasattr(body, 'vel_x'):
+                body.vel_x = 0
+            if hit_y and hasattr(body, 'vel_y'):
+                body.vel_y = 0
+    
+    def move_aabbs(self, positions, sizes, velocities):
+        """Mueve muchos rectángulos contra el mapa en una sola pasada (posiciones resueltas, choques)"""
+        return self.collision_index.move_aabbs(positions, sizes, velocities)
+    
+    def has_line_of_sight(self, a, b):
+        """Indica si no hay bloques entre dos puntos (memorizado por tick)"""
+        return self.collision_index.has_line_of_sight(a, b)
+    
+    def raycast(self, origin, direction, max_dist):
+        """Lanza un rayo contra los bloques: (distancia, punto de impacto) o None"""
+        return self.collision_index.raycast(origin, direction, max_dist)
+    
+    def begin_tick(self):
+        """Inicia un tick nuevo (descarta las líneas de visión memorizadas)"""
+        self.collision_index.begin_tick()
+    
     def draw_editor_mode(self, screen, camera_x, camera_y):
         """Dibuja el modo editor"""
         if not self.editor_mode:
             return
         
-        # Dibujar todos los bloques
-        for block in self.blocks:
-            block.draw_editor(screen, camera_x, camera_y)
+        # Dibujar todos los bloques desde la capa pre-renderizada (un solo blit)
+        self.overlay.draw(screen, camera_x, camera_y, self.cells)
         
         # Dibujar cursor del editor con mejor feedback visual
         cursor_screen_x = self.editor_cursor_x - camera_x
         cursor_screen_y = self.editor_cursor_y - camera_y
         
         # Verificar si ya existe un bloque en esta posición
-        block_exists = any(block.x == self.editor_cursor_x and block.y == self.editor_cursor_y 
-                          for block in self.blocks)
+        block_exists = (self.editor_cursor_x // self.block_size, self.editor_cursor_y // self.block_size) in self.cells
         
         # Color del cursor: verde si es posición libre, rojo si ocupada
         cursor_color = (255, 100, 100) if block_exists else (100, 255, 100)
@@ -243,7 +364,7 @@ class CollisionManager:
         # Borde del cursor con animación
         time_factor = pygame.time.get_ticks() / 200
         border_width = int(3 + 2 * abs(math.sin(time_factor)))
-        pygame.draw.rect(screen, border_color, 
+        canvas_draw.rect(screen, border_color, 
                         (cursor_screen_x, cursor_screen_y, self.block_size, self.block_size), 
                         border_width)
         
@@ -253,15 +374,15 @@ class CollisionManager:
         
         if block_exists:
             # Símbolo de eliminación (X)
-            pygame.draw.line(screen, (255, 255, 255), 
+            canvas_draw.line(screen, (255, 255, 255), 
                            (center_x - 8, center_y - 8), (center_x + 8, center_y + 8), 3)
-            pygame.draw.line(screen, (255, 255, 255), 
+            canvas_draw.line(screen, (255, 255, 255), 
                            (center_x + 8, center_y - 8), (center_x - 8, center_y + 8), 3)
         else:
             # Símbolo de adición (+)
-            pygame.draw.line(screen, (255, 255, 255), 
+            canvas_draw.line(screen, (255, 255, 255), 
                            (center_x - 8, center_y), (center_x + 8, center_y), 3)
-            pygame.draw.line(screen, (255, 255, 255), 
+            canvas_draw.line(screen, (255, 255, 255), 
                            (center_x, center_y - 8), (center_x, center_y + 8), 3)
         
         # Dibujar rectángulo de arrastre si se está arrastrando
@@ -279,9 +400,10 @@ class CollisionManager:
             
             # Rectángulo de previsualización
             preview_surface = pygame.Surface((grid_width, grid_height), pygame.SRCALPHA)
-            preview_surface.fill((0, 255, 0, 100))
+            preview_color = (255, 0, 0) if self.drag_button == 3 else (0, 255, 0)
+            preview_surface.fill((*preview_color, 100))
             screen.blit(preview_surface, (grid_start_x, grid_start_y))
-            pygame.draw.rect(screen, (0, 255, 0), (grid_start_x, grid_start_y, grid_width, grid_height), 3)
+            canvas_draw.rect(screen, preview_color, (grid_start_x, grid_start_y, grid_width, grid_height), 3)
         
         # Información del editor - OCULTA pero funcional
         # Los bloques y cursor se siguen mostrando, pero sin texto de ayuda
@@ -292,13 +414,15 @@ class CollisionManager:
         if not self.editor_mode:
             return
         
-        # Manejar eventos del mouse
+        # Manejar eventos del mouse (izquierdo rellena, derecho borra)
         for event in mouse_events:
             if event.type == pygame.MOUSEBUTTONDOWN:
-                if event.button == 1:  # Click izquierdo
+                if event.button in (1, 3):  # Click izquierdo / derecho
                     self.mouse_pressed = True
-                    mouse_world_x = event.pos[0] + camera_x
-                    mouse_world_y = event.pos[1] + camera_y
+                    self.drag_button = event.button
+                    mouse_x, mouse_y = to_logical(event.pos)  # Ventana interna -> coordenadas lógicas
+                    mouse_world_x = mouse_x + camera_x
+                    mouse_world_y = mouse_y + camera_y
                     self.drag_start_x = mouse_world_x
                     self.drag_start_y = mouse_world_y
                     self.drag_current_x = mouse_world_x
@@ -306,23 +430,31 @@ class CollisionManager:
                     self.is_dragging = False
                     
             elif event.type == pygame.MOUSEBUTTONUP:
-                if event.button == 1 and self.mouse_pressed:  # Soltar click izquierdo
+                if event.button == self.drag_button and self.mouse_pressed:  # Soltar click
                     self.mouse_pressed = False
+                    erasing = self.drag_button == 3
                     if self.is_dragging:
-                        # Crear rectángulo de bloques
-                        self.create_block_rectangle()
+                        # Rellenar o borrar el rectángulo completo en un solo lote
+                        if erasing:
+                            self.erase_block_rectangle()
+                        else:
+                            self.create_block_rectangle()
                     else:
-                        # Click simple - agregar un bloque
+                        # Click simple - agregar o quitar un bloque
                         grid_x = (self.drag_start_x // self.block_size) * self.block_size
                         grid_y = (self.drag_start_y // self.block_size) * self.block_size
-                        if self.add_block(grid_x, grid_y):
+                        if erasing:
+                            if self.remove_block(grid_x, grid_y):
+                                print(f"🗑️ Bloque eliminado y guardado automáticamente")
+                        elif self.add_block(grid_x, grid_y):
                             print(f"🔧 Bloque guardado automáticamente")
                     self.is_dragging = False
                     
             elif event.type == pygame.MOUSEMOTION:
                 if self.mouse_pressed:
-                    mouse_world_x = event.pos[0] + camera_x
-                    mouse_world_y = event.pos[1] + camera_y
+                    mouse_x, mouse_y = to_logical(event.pos)  # Ventana interna -> coordenadas lógicas
+                    mouse_world_x = mouse_x + camera_x
+                    mouse_world_y = mouse_y + camera_y
                     self.drag_current_x = mouse_world_x
                     self.drag_current_y = mouse_world_y
                     
@@ -331,43 +463,44 @@ class CollisionManager:
                     if distance > 10:  # Threshold para detectar arrastre
                         self.is_dragging = True
         
+        # Deshacer / rehacer (Ctrl+Z, Ctrl+Y o Ctrl+Shift+Z)
+        mods = pygame.key.get_mods()
+        if mods & pygame.KMOD_CTRL:
+            if keys_just_pressed.get(pygame.K_z, False):
+                if mods & pygame.KMOD_SHIFT:
+                    self.redo()
+                else:
+                    self.undo()
+            elif keys_just_pressed.get(pygame.K_y, False):
+                self.redo()
+        
         # Teclas para eliminar (mantener funcionalidad de teclado)
         if keys_just_pressed.get(pygame.K_BACKSPACE, False):
-            mouse_pos = pygame.mouse.get_pos()
+            mouse_pos = to_logical(pygame.mouse.get_pos())
             mouse_world_x = mouse_pos[0] + camera_x
             mouse_world_y = mouse_pos[1] + camera_y
             grid_x = (mouse_world_x // self.block_size) * self.block_size
             grid_y = (mouse_world_y // self.block_size) * self.block_size
             if self.remove_block(grid_x, grid_y):
-                print(f"� Bloque eliminado y guardado automáticamente")
+                print(f"🗑️ Bloque eliminado y guardado automáticamente")
+    
+    def get_drag_cells(self):
+        """Celdas que cubre el rectángulo arrastrado"""
+        return cells_in_rect(self.drag_start_x, self.drag_start_y,
+                             self.drag_current_x, self.drag_current_y, self.block_size)
     
     def create_block_rectangle(self):
         """Crea un rectángulo de bloques desde drag_start hasta drag_current"""
-        start_x = min(self.drag_start_x, self.drag_current_x)
-        end_x = max(self.drag_start_x, self.drag_current_x)
-        start_y = min(self.drag_start_y, self.drag_current_y)
-        end_y = max(self.drag_start_y, self.drag_current_y)
-        
-        # Alinear a la grilla
-        start_grid_x = (start_x // self.block_size) * self.block_size
-        end_grid_x = (end_x // self.block_size) * self.block_size
-        start_grid_y = (start_y // self.block_size) * self.block_size
-        end_grid_y = (end_y // self.block_size) * self.block_size
-        
-        blocks_added = 0
-        for x in range(int(start_grid_x), int(end_grid_x) + self.block_size, self.block_size):
-            for y in range(int(start_grid_y), int(end_grid_y) + self.block_size, self.block_size):
-                # Verificar si ya existe un bloque en esta posición
-                block_exists = any(block.x == x and block.y == y for block in self.blocks)
-                if not block_exists:
-                    new_block = CollisionBlock(x, y, self.block_size, self.block_size)
-                    self.blocks.append(new_block)
-                    blocks_added += 1
-        
+        blocks_added = len(self.fill_cells(self.get_drag_cells()))
         if blocks_added > 0:
             print(f"✅ {blocks_added} bloques agregados en rectángulo")
-            # Guardar automáticamente después del rectángulo completo
-            self.save_collision_data(silent=True)
+            print("💾 Rectángulo guardado automáticamente")
+    
+    def erase_block_rectangle(self):
+        """Elimina los bloques del rectángulo desde drag_start hasta drag_current"""
+        blocks_removed = len(self.erase_cells(self.get_drag_cells()))
+        if blocks_removed > 0:
+            print(f"🗑️ {blocks_removed} bloques eliminados en rectángulo")
             print("💾 Rectángulo guardado automáticamente")
     
 
@@ -383,20 +516,15 @@ class Background:
         self.height = 1080
         self.surface = None
         self.load_background(image_url)
+        self.renderer = ChunkedBackground(self.surface)
         
     def load_background(self, file_path):
-        """Carga el fondo desde archivo local"""
-        try:
-            pil_image = Image.open(file_path)
-            self.width, self.height = pil_image.size
-            
-            pil_image = pil_image.convert('RGB')
-            image_data = pil_image.tobytes()
-            
-            self.surface = pygame.image.fromstring(image_data, pil_image.size, 'RGB')
-            self.surface = self.surface.convert()
-            
-        except Exception as e:
+        """Carga el fondo directamente en el formato de la pantalla (paquete compilado o archivo local)"""
+        surface = load_background(file_path)
+        if surface:
+            self.surface = surface
+            self.width, self.height = surface.get_size()
+        else:
             self.create_fallback_background()
     
     def create_fallback_background(self):
@@ -415,26 +543,26 @@ class Background:
             color = (30, random.randint(80, 120), 30)
             pygame.draw.circle(self.surface, color, (x, y), size)
     
+    def clamp_camera(self, camera_x, camera_y, screen_width, screen_height):
+        """Limita la cámara a los bounds del escenario (dimensiones reales)"""
+        # Permitir scroll completo en ambas direcciones si el escenario es más grande
+        max_camera_x = max(0, self.width - screen_width)
+        max_camera_y = max(0, self.height - screen_height)
+        return max(0, min(camera_x, max_camera_x)), max(0, min(camera_y, max_camera_y))
+    
+    def covers(self, screen_width, screen_height):
+        """Indica si el fondo tapa toda la pantalla (no hace falta limpiarla antes)"""
+        camera_x, camera_y = self.clamp_camera(0, 0, screen_width, screen_height)
+        return self.renderer.covers(camera_x, camera_y, screen_width, screen_height)
+    
     def draw(self, screen, camera_x, camera_y, screen_width, screen_height):
         """Dibuja el fondo con scroll completo respetando dimensiones originales"""
         if not self.surface:
             return
             
-        # Limitar cámara a los bounds del escenario (dimensiones reales)
-        # Permitir scroll completo en ambas direcciones si el escenario es más grande
-        max_camera_x = max(0, self.width - screen_width)
-        max_camera_y = max(0, self.height - screen_height)
-        
-        camera_x = max(0, min(camera_x, max_camera_x))
-        camera_y = max(0, min(camera_y, max_camera_y))
-        
-        # Calcular región visible del escenario
-        visible_width = min(screen_width, self.width - camera_x)
-        visible_height = min(screen_height, self.height - camera_y)
-        
-        # Dibujar la porción visible del escenario
-        source_rect = pygame.Rect(camera_x, camera_y, visible_width, visible_height)
-        screen.blit(self.surface, (0, 0), source_rect)
+        # Dibujar solo los bloques del escenario que tocan la vista
+        camera_x, camera_y = self.clamp_camera(camera_x, camera_y, screen_width, screen_height)
+        self.renderer.draw(screen, camera_x, camera_y)
 
 
 class Game:
@@ -446,37 +574,33 @@ class Game:
         
         # Configuración de pantalla
         self.screen_width, self.screen_height = 1920, 1080
-        self.screen = pygame.display.set_mode((self.screen_width, self.screen_height), pygame.FULLSCREEN)
+        # Ventana a la resolución interna de RENDER_SCALE; el juego dibuja en coordenadas
+        # lógicas sobre un lienzo que la llena (la pantalla misma con 1.0)
+        self.display = open_display((self.screen_width, self.screen_height), pygame.FULLSCREEN)
         pygame.display.set_caption("🍎 Nivel 1 - Tierra de las Manzanas")
+        self.screen = create_canvas(self.display)
         
-        # Actualizar dimensiones reales
+        # Actualizar dimensiones reales (coordenadas lógicas del juego)
         self.screen_width, self.screen_height = self.screen.get_size()
         self.clock = pygame.time.Clock()
         self.fps = 60
         
-        # Sistema de carga
+        # Sistema de carga: una unidad por animación precargada y por etapa
         self.loading_screen = LoadingScreen(self.screen)
-        assets = [
-            {"name": "Escenario", "description": "Cargando fondo"},
-            {"name": "Personajes", "description": "Cargando Juan y Adán"},
-            {"name": "Ataques", "description": "Sistemas de combate"},
-            {"name": "Enemigos", "description": "25 gusanos enemigos"},
-            {"name": "Audio", "description": "Música y efectos"},
-            {"name": "IA", "description": "Inteligencia artificial"}
-        ]
-        self.loading_screen.start_loading(assets)
-        
-        # Carga de escenario
-        self.loading_screen.update_progress("Escenario", "Cargando desde assets locales...")
+        preloader = AssetPreloader(level_1_requests())
+        self.loading_screen.start_work(preloader.total_units + 7, "Cargando desde assets locales...")
         self.loading_screen.draw()
         
+        # Carga de escenario
         self.background = Background("assets/backgrounds/escenario.png")
         self.world_width = self.background.width
         self.world_height = self.background.height
+        self.loading_step("Decodificando animaciones...")
+        
+        # Animaciones de personajes, ataques y gusanos en paralelo
+        preloader.run(on_progress=lambda label: self.loading_step(f"Animación {label} lista"))
         
         # Carga de personajes
-        self.loading_screen.update_progress("Personajes", "Cargando Juan...")
-        self.loading_screen.draw()
         
         self.juan = JuanCharacter(400, 300)
         self.juan.max_health = 100
@@ -485,9 +609,7 @@ class Game:
         self.juan.damage = 22
         self.juan.attack_speed = 1.0
         self.juan.name = "Juan"
-        
-        self.loading_screen.update_progress("Personajes", "Cargando Adán...")
-        self.loading_screen.draw()
+        self.loading_step("Juan listo")
         
         self.adan = AdanCharacter(500, 300)
         self.adan.max_health = 125
@@ -496,14 +618,17 @@ class Game:
         self.adan.damage = 28
         self.adan.attack_speed = 0.8
         self.adan.name = "Adán"
+        self.loading_step("Adán listo")
         
         # Sistemas de ataque
-        self.loading_screen.update_progress("Ataques", "Configurando combate...")
-        self.loading_screen.draw()
-        
         self.juan_attack = JuanAttack(self.juan)
         self.adan_attack = AdanAttack(self.adan)
         
+        # Movimiento y ataques de cada personaje en un solo atlas
+        self.juan.pack_atlas(self.juan_attack)
+        self.adan.pack_atlas(self.adan_attack)
+        self.loading_step("Combate configurado")
+        
         # Configuración de personaje activo
         if selected_character == 'juan':
             self.active_character = self.juan
@@ -517,12 +642,10 @@ class Game:
             self.inactive_attack_system = self.juan_attack
         
         # Sistema de enemigos
-        self.loading_screen.update_progress("Enemigos", "Preparando 25 gusanos únicos...")
-        self.loading_screen.draw()
-        
         self.worm_spawner = WormSpawner(max_worms=25)
         self.setup_enemy_spawns()
         self.enemies_defeated = 0
+        self.loading_step("25 gusanos únicos preparados")
         
         # Sistema de items estáticos
         self.static_items = []
@@ -532,18 +655,14 @@ class Game:
         self.drops = []
         
         # IA y Audio
-        self.loading_screen.update_progress("IA", "Configurando inteligencia artificial...")
-        self.loading_screen.draw()
-        
         self.inactive_ai = CharacterAI(self.inactive_character, self.active_character)
         self.inactive_ai.detection_range = 400
         self.inactive_ai.attack_range = 150
-        
-        self.loading_screen.update_progress("Audio", "Cargando sonidos...")
-        self.loading_screen.draw()
+        self.loading_step("Inteligencia artificial configurada")
         
         self.audio = get_audio_manager()
         self.sound_generator = get_sound_generator()
+        self.loading_step("Sonidos cargados")
         
         # Estado del juego
         self.game_over = False
@@ -586,7 +705,7 @@ class Game:
         print("   Click simple: Colocar bloque individual")
         print("   Backspace: Eliminar bloque en cursor del mouse")
         print("   💾 GUARDADO AUTOMÁTICO: Cada bloque se guarda instantáneamente")
-        print("   📁 Archivo: collision_data.txt")
+        print("   📁 Archivo: save_data/collision_blocks.bin")
         
         # Inicializar keys_last_frame como lista
         temp_keys = pygame.key.get_pressed()
@@ -600,11 +719,18 @@ class Game:
         self.victory_message = "¡Victoria! Presiona N para ir al Nivel 2"
         
         # === FINALIZAR CARGA ===
-        self.loading_screen.update_progress("Completado", "¡Iniciando batalla!")
+        self.loading_screen.set_custom_message("¡Iniciando batalla!")
         self.loading_screen.draw()
         pygame.time.wait(1000)
         
         print("✅ Nivel 1 inicializado correctamente")
+        get_sprite_cache().report()
+    
+    def loading_step(self, message):
+        """Completa una unidad de trabajo de la carga y redibuja la pantalla"""
+        self.loading_screen.complete_work(1, message)
+        self.loading_screen.draw()
+        pygame.event.pump()  # Evita que la ventana deje de responder durante la carga
     
     def setup_enemy_spawns(self):
         """Configura spawn dinámico alrededor de los personajes (25 gusanos únicos)"""
@@ -650,11 +776,7 @@ class Game:
             item_rect = pygame.Rect(x, y, ITEM_SIZE[0], ITEM_SIZE[1])
             
             # Revisar colisión con bloques invisibles
-            collision_found = False
-            for block in self.collision_manager.blocks:
-                if item_rect.colliderect(block.rect):
-                    collision_found = True
-                    break
+            collision_found = self.collision_manager.check_collision(item_rect)
             
             # Verificar que no esté muy cerca de otros items existentes
             too_close = False
@@ -697,50 +819,11 @@ class Game:
     
 
     def create_collectible_images(self):
-        """Crea sprites optimizados para manzanas y pociones con URLs de GitHub"""
-        # URLs de GitHub para sprites de alta calidad
-        self.github_item_urls = {
-            'apple': 'https://github.com/user-attachments/assets/8d98de91-3834-456d-8dac-484029df9a02',
-            'potion': 'https://github.com/user-attachments/assets/5365c2ea-ad1e-4055-8d3b-de1547e10396'
-        }
-        
-        # Intentar cargar desde GitHub, con fallback a sprites simples
-        self.apple_image = self.load_collectible_from_github('apple') or self.create_fallback_apple()
-        self.potion_image = self.load_collectible_from_github('potion') or self.create_fallback_potion()
-    
-    def load_collectible_from_github(self, item_type):
-        """Carga un coleccionable desde GitHub"""
-        try:
-            url = self.github_item_urls.get(item_type)
-            if not url:
-                return None
-                
-            print(f"📥 Descargando {item_type} desde GitHub...")
-            response = requests.get(url, timeout=10)
-            response.raise_for_status()
-            
-            image_data = BytesIO(response.content)
-            pil_image = Image.open(image_data)
-            try:
-                # Intentar usar el método moderno primero
-                if hasattr(Image, 'Resampling'):
-                    pil_image = pil_image.convert('RGBA').resize(ITEM_SIZE, Image.Resampling.LANCZOS)
-                else:
-                    # Fallback para versiones más antiguas
-                    pil_image = pil_image.convert('RGBA').resize(ITEM_SIZE)
-            except AttributeError:
-                pil_image = pil_image.convert('RGBA').resize(ITEM_SIZE)
-            
-            pygame_surface = pygame.image.fromstring(
-                pil_image.tobytes(), pil_image.size, 'RGBA'
-            ).convert_alpha()
-            
-            print(f"✅ {item_type.capitalize()} cargado desde GitHub")
-            return pygame_surface
-            
-        except Exception as e:
-            print(f"⚠️ Error cargando {item_type}: {e}, usando fallback")
-            return None
+        """Crea sprites optimizados para manzanas y pociones desde el almacén local"""
+        # Sin red: lo que no está en el almacén usa los sprites simples
+        store = get_asset_store()
+        self.apple_image = store.image('items/apple', ITEM_SIZE) or self.create_fallback_apple()
+        self.potion_image = store.image('items/potion', ITEM_SIZE) or self.create_fallback_potion()
     
     def create_fallback_apple(self):
         """Crea sprite de manzana de respaldo optimizado"""
@@ -814,10 +897,10 @@ class Game:
                     if self.collision_manager.editor_mode:
                         print("🔄 GUARDADO AUTOMÁTICO ACTIVADO")
                         print("✨ Todos los bloques se guardan instantáneamente")
-                        print("📁 Archivo: collision_data.txt")
+                        print("📁 Archivo: save_data/collision_blocks.bin")
                     else:
-                        # Guardado final al salir del editor
-                        self.collision_manager.save_collision_data(silent=False)
+                        # Guardado final al salir del editor (compactación en segundo plano)
+                        self.collision_manager.request_save()
                         print(f"💾 Configuración final guardada: {len(self.collision_manager.blocks)} bloques")
                 elif event.key == pygame.K_r and (self.game_over or self.victory):
                     # Reiniciar juego (funciona tanto para game over como victoria)
@@ -997,22 +1080,19 @@ class Game:
             
         keys_pressed = pygame.key.get_pressed()
         
+        # Nuevo tick: las líneas de visión memorizadas se recalculan
+        self.collision_manager.begin_tick()
+        
+        # Posiciones de partida de todos los cuerpos (las colisiones se resuelven juntas al final)
+        movement_start = self.get_moving_bodies()
+        
         # Actualizar personaje activo
         if not self.active_attack_system.is_character_attacking() and not self.collision_manager.editor_mode:
-            old_x, old_y = self.active_character.x, self.active_character.y
             self.active_character.update(keys_pressed)
-            
-            if not self.collision_manager.can_move_to(self.active_character, 
-                                                     self.active_character.x, 
-                                                     self.active_character.y):
-                self.active_character.x, self.active_character.y = old_x, old_y
-            
             self.enforce_boundaries(self.active_character)
         
         # Actualizar IA del personaje inactivo con ATAQUE A GUSANOS
         if (self.inactive_character.health > 0 or self.inactive_ai.is_being_revived) and not self.collision_manager.editor_mode:
-            old_x, old_y = self.inactive_character.x, self.inactive_character.y
-            
             worms = self.worm_spawner.get_worms()
             
             # NUEVA FUNCIONALIDAD: Hacer que la IA ataque gusanos cercanos
@@ -1030,7 +1110,7 @@ class Game:
             # Si hay un gusano cerca, atacarlo; si no, seguir al jugador
             if target_worm and min_distance < 150:  # Rango de detección
                 # La IA ya maneja el targeting internamente
-                self.inactive_ai.update(worms)
+                self.inactive_ai.update(worms, self.collision_manager)
                 
                 # Intentar atacar si está cerca
                 if min_distance < 100:  # Rango de ataque
@@ -1061,16 +1141,10 @@ class Game:
                             print(f"🔥 Juan IA atacando gusano a {min_distance:.1f} unidades")
             else:
                 # Comportamiento normal: seguir al jugador
-                self.inactive_ai.update(worms)
+                self.inactive_ai.update(worms, self.collision_manager)
             
             ai_animation_state = self.inactive_ai.get_animation_state()
             self.inactive_character.update(keys_pressed=None, ai_controlled=True, ai_direction=ai_animation_state)
-            
-            if not self.collision_manager.can_move_to(self.inactive_character,
-                                                     self.inactive_character.x,
-                                                     self.inactive_character.y):
-                self.inactive_character.x, self.inactive_character.y = old_x, old_y
-            
             self.enforce_boundaries(self.inactive_character)
         
         # Manejar ataques del personaje activo
@@ -1110,7 +1184,7 @@ class Game:
         
         # Actualizar sistemas de ataque
         self.juan_attack.update(worms)
-        self.adan_attack.update(worms)
+        self.adan_attack.update(worms, self.collision_manager)
         
         # Spawn automático de items distribuidos
         self.spawn_random_item()
@@ -1123,6 +1197,9 @@ class Game:
         players = [self.juan, self.adan]
         self.worm_spawner.update(players, self.collision_manager)
         
+        # Resolver colisiones de los personajes en una sola llamada (deslizamiento por ejes)
+        self.collision_manager.resolve_movements(movement_start)
+        
         # Verificar ataques de gusanos
         self.check_worm_attacks(players)
         
@@ -1418,6 +1495,14 @@ class Game:
     
     # === UTILIDADES ===
     
+    def get_moving_bodies(self):
+        """
+        Personajes que se mueven en este tick: (cuerpo, x, y, ancho, alto) al inicio del tick.
+        Los gusanos y proyectiles se resuelven en lote dentro de sus propios sistemas.
+        """
+        bodies = [(self.active_character, 100, 100), (self.inactive_character, 100, 100)]  # 64 * 1.56 = 100
+        return [(body, body.x, body.y, width, height) for body, width, height in bodies]
+    
     def enforce_boundaries(self, character):
         """Aplica límites exactos del escenario con dimensiones originales"""
         # Límites dinámicos basados en el tamaño real del escenario
@@ -1469,44 +1554,28 @@ class Game:
             print("🚀 Cargando Nivel 2...")
             
             # Crear pantalla de carga
-            loading_screen = LoadingScreen(self.screen)
-            
-            # Lista de assets a cargar
-            assets_to_load = [
-                {'name': 'nivel2', 'description': 'Preparando el mundo...'},
-                {'name': 'characters', 'description': 'Cargando personajes...'},
-                {'name': 'chaman', 'description': 'Inicializando Chamán Malvado...'},
-                {'name': 'attacks', 'description': 'Cargando sistemas de ataque...'},
-                {'name': 'animations', 'description': 'Configurando animaciones...'},
-                {'name': 'audio', 'description': 'Preparando efectos de sonido...'},
-                {'name': 'physics', 'description': 'Estableciendo físicas...'},
-                {'name': 'final', 'description': '¡Casi listo!'}
-            ]
+            loading_screen = LoadingScreen(self.screen, "🍎 Cargando Nivel 2")
             
-            loading_screen.start_loading(assets_to_load)
+            # Precargar las animaciones del Nivel 2 (las del Nivel 1 ya están en caché)
+            preloader = AssetPreloader(level_2_requests())
+            loading_screen.start_work(preloader.total_units, "Inicializando Chamán Malvado...")
+            loading_screen.draw()
             
-            # Simular carga con pantalla de progreso
-            for i, asset in enumerate(assets_to_load):
-                # Mostrar pantalla de carga
+            def on_progress(label):
+                loading_screen.complete_work(1, f"Animación {label} lista")
                 loading_screen.draw()
-                pygame.display.flip()
-                
-                # Simular tiempo de carga
-                pygame.time.wait(400)  # 400ms por asset
-                
-                # Actualizar progreso
-                loading_screen.update_progress(asset['name'], asset['description'])
-                
-                # Manejar eventos para evitar que se cuelgue
-                for event in pygame.event.get():
-                    if event.type == pygame.QUIT:
-                        return
+                pygame.event.pump()  # Evita que la ventana deje de responder
+            
+            preloader.run(on_progress=on_progress)
+            
+            # Manejar eventos para evitar que se cuelgue
+            for event in pygame.event.get():
+                if event.type == pygame.QUIT:
+                    return
             
             # Pantalla final de carga
             loading_screen.set_custom_message("¡Listo para el combate!")
             loading_screen.draw()
-            pygame.display.flip()
-            pygame.time.wait(500)
             
             # Determinar personaje seleccionado
             selected_character = 'juan' if self.active_character == self.juan else 'adan'
@@ -1549,7 +1618,8 @@ class Game:
             
         # Reinicializar pygame para este nivel si hay error
         pygame.init()
-        self.screen = pygame.display.set_mode((self.screen_width, self.screen_height), pygame.FULLSCREEN)
+        self.display = open_display((self.screen_width, self.screen_height), pygame.FULLSCREEN)
+        self.screen = create_canvas(self.display)
 
     def return_to_main_menu(self):
         """Regresa al menú principal (intro cinematográfica)"""
@@ -1592,9 +1662,9 @@ class Game:
         self.screen.blit(ui_surface, (10, 10))
         
         # Fuentes
-        font_large = pygame.font.Font(None, 36)
-        font_medium = pygame.font.Font(None, 28)
-        font_small = pygame.font.Font(None, 24)
+        font_large = get_font(36)
+        font_medium = get_font(28)
+        font_small = get_font(24)
         
         # 🎮 Indicador de personaje ACTIVO
         active_color = (0, 255, 100)  # Verde brillante
@@ -1646,17 +1716,18 @@ class Game:
         if self.game_over:
             self.screen.fill((0, 0, 0))  # Fondo negro sólido para Game Over
             self.draw_game_over()
-            pygame.display.flip()
+            present(self.screen)
             return
         elif self.victory:
             self.screen.fill((0, 0, 0))  # Fondo negro sólido para Victoria
             self.draw_victory()
-            pygame.display.flip()
+            present(self.screen)
             return
         
         # Renderizado normal del juego solo si NO hay Game Over o Victory
-        # Limpiar pantalla
-        self.screen.fill((50, 100, 50))
+        # Limpiar pantalla (innecesario si el fondo la tapa entera)
+        if not self.background.covers(self.screen_width, self.screen_height):
+            self.screen.fill((50, 100, 50))
         
         # Dibujar UI de estado de personajes primero
         self.draw_character_status_ui()
@@ -1727,21 +1798,22 @@ class Game:
             self.inactive_ai.is_being_revived):
             self.draw_revival_progress()
         
-        pygame.display.flip()
+        present(self.screen)
     
     def draw_shield_effect(self, character):
         """Dibuja efecto visual de escudo mejorado"""
         if not hasattr(character, 'shield_active') or not character.shield_active:
             return
             
-        # Círculo pulsante alrededor del personaje
-        shield_alpha = int(100 + 50 * math.sin(pygame.time.get_ticks() * 0.01))
-        shield_surface = pygame.Surface((125, 125), pygame.SRCALPHA)  # 80 * 1.56 = 125
+        # Círculo pulsante alrededor del personaje (frames del pulso pre-renderizados)
+        shield_alpha = pulse_alpha(pygame.time.get_ticks() * 0.01, 100, 50)
         
-        # Efecto de escudo con múltiples capas (escalado 56%)
-        pygame.draw.circle(shield_surface, (0, 150, 255, shield_alpha//2), (62, 62), 55)  # 40*1.56=62, 35*1.56=55
-        pygame.draw.circle(shield_surface, (100, 200, 255, shield_alpha), (62, 62), 47)    # 30*1.56=47
-        pygame.draw.circle(shield_surface, (150, 220, 255, shield_alpha//3), (62, 62), 39) # 25*1.56=39
+        # Efecto de escudo con múltiples capas (escalado 56%): 80 * 1.56 = 125, centro 40*1.56=62
+        shield_surface = get_effect_cache().circles((125, 125), (62, 62), (
+            (55, (0, 150, 255), shield_alpha//2),   # 35*1.56=55
+            (47, (100, 200, 255), shield_alpha),    # 30*1.56=47
+            (39, (150, 220, 255), shield_alpha//3), # 25*1.56=39
+        ))
         
         shield_x = character.x - self.camera_x - 12  # -8*1.56 ≈ -12
         shield_y = character.y - self.camera_y - 12
@@ -1749,9 +1821,8 @@ class Game:
     
     def draw_defeated_effect(self, character):
         """Dibuja efecto gris sobre personaje derrotado"""
-        # Crear superficie gris semitransparente
-        gray_surface = pygame.Surface((100, 100), pygame.SRCALPHA)  # 64 * 1.56 = 100
-        gray_surface.fill((128, 128, 128, 160))  # Gris con transparencia
+        # Superficie gris semitransparente (compartida)
+        gray_surface = get_effect_cache().filled((100, 100), (128, 128, 128), 160)  # 64 * 1.56 = 100
         
         # Aplicar el efecto gris sobre el personaje derrotado
         defeat_x = character.x - self.camera_x
@@ -1763,19 +1834,19 @@ class Game:
         center_y = defeat_y + 50
         
         # Cruz roja sobre el personaje
-        pygame.draw.line(self.screen, (255, 50, 50), 
+        canvas_draw.line(self.screen, (255, 50, 50), 
                         (center_x - 15, center_y - 15), (center_x + 15, center_y + 15), 4)
-        pygame.draw.line(self.screen, (255, 50, 50), 
+        canvas_draw.line(self.screen, (255, 50, 50), 
                         (center_x + 15, center_y - 15), (center_x - 15, center_y + 15), 4)
         
         # Borde de la cruz en blanco para mejor visibilidad
-        pygame.draw.line(self.screen, (255, 255, 255), 
+        canvas_draw.line(self.screen, (255, 255, 255), 
                         (center_x - 15, center_y - 15), (center_x + 15, center_y + 15), 6)
-        pygame.draw.line(self.screen, (255, 255, 255), 
+        canvas_draw.line(self.screen, (255, 255, 255), 
                         (center_x + 15, center_y - 15), (center_x - 15, center_y + 15), 6)
-        pygame.draw.line(self.screen, (255, 50, 50), 
+        canvas_draw.line(self.screen, (255, 50, 50), 
                         (center_x - 15, center_y - 15), (center_x + 15, center_y + 15), 4)
-        pygame.draw.line(self.screen, (255, 50, 50), 
+        canvas_draw.line(self.screen, (255, 50, 50), 
                         (center_x + 15, center_y - 15), (center_x - 15, center_y + 15), 4)
     
     def draw_collectibles(self):
@@ -1841,7 +1912,7 @@ class Game:
                     bar_y = screen_y - 25  # Por encima del personaje
                     
                     # Fondo de la barra (negro)
-                    pygame.draw.rect(self.screen, (50, 50, 50), 
+                    canvas_draw.rect(self.screen, (50, 50, 50), 
                                    (bar_x - 2, bar_y - 2, bar_width + 4, bar_height + 4))
                     
                     # Barra de vida actual
@@ -1858,20 +1929,19 @@ class Game:
                     
                     # Dibujar barra de vida
                     if current_bar_width > 0:
-                        pygame.draw.rect(self.screen, health_color, 
+                        canvas_draw.rect(self.screen, health_color, 
                                        (bar_x, bar_y, current_bar_width, bar_height))
                     
                     # Nombre del personaje encima de la barra
-                    font_small = pygame.font.Font(None, 24)
+                    font_small = get_font(24)
                     name_text = font_small.render(character.name, True, (255, 255, 255))
                     name_x = bar_x + (bar_width - name_text.get_width()) // 2
                     self.screen.blit(name_text, (name_x, bar_y - 20))
                     
                     # Indicador de escudo si está activo
                     if getattr(character, 'shield_active', False):
-                        shield_surface = pygame.Surface((bar_width + 6, bar_height + 6), pygame.SRCALPHA)
-                        pygame.draw.rect(shield_surface, (100, 200, 255, 100), 
-                                       (0, 0, bar_width + 6, bar_height + 6))
+                        shield_surface = get_effect_cache().filled((bar_width + 6, bar_height + 6),
+                                                                   (100, 200, 255), 100)
                         self.screen.blit(shield_surface, (bar_x - 3, bar_y - 3))
                         
                         # Texto "ESCUDO"
@@ -1880,8 +1950,8 @@ class Game:
     
     def draw_ui(self):
         """Dibuja interfaz de usuario simplificada (sin estadísticas de vida)"""
-        font = pygame.font.Font(None, 72)
-        font_small = pygame.font.Font(None, 48)
+        font = get_font(72)
+        font_small = get_font(48)
         
         # Mostrar pantalla de victoria si está activa
         if self.victory:
@@ -1917,9 +1987,9 @@ class Game:
         overlay.fill((0, 100, 0, 200))  # Verde oscuro
         self.screen.blit(overlay, (0, 0))
         
-        font_huge = pygame.font.Font(None, 150)
-        font_large = pygame.font.Font(None, 96)
-        font_medium = pygame.font.Font(None, 72)
+        font_huge = get_font(150)
+        font_large = get_font(96)
+        font_medium = get_font(72)
         
         # Título de victoria
         title = font_huge.render("🎉 ¡VICTORIA! 🎉", True, (255, 255, 100))
@@ -1943,9 +2013,9 @@ class Game:
         overlay.fill((100, 0, 0, 200))  # Rojo oscuro
         self.screen.blit(overlay, (0, 0))
         
-        font_huge = pygame.font.Font(None, 150)
-        font_large = pygame.font.Font(None, 96)
-        font_medium = pygame.font.Font(None, 72)
+        font_huge = get_font(150)
+        font_large = get_font(96)
+        font_medium = get_font(72)
         
         # Título de game over
         title = font_huge.render("💀 GAME OVER 💀", True, (255, 100, 100))
@@ -1977,8 +2047,8 @@ class Game:
         overlay.fill((0, 0, 0, 180))
         self.screen.blit(overlay, (0, 0))
         
-        font = pygame.font.Font(None, 72)
-        font_small = pygame.font.Font(None, 48)
+        font = get_font(72)
+        font_small = get_font(48)
         
         # Título
         title = font.render("🍎 MEJORAS DISPONIBLES", True, (255, 255, 255))
@@ -2004,7 +2074,7 @@ class Game:
     
     def draw_revival_prompt(self):
         """Dibuja prompt para revivir"""
-        font = pygame.font.Font(None, 48)
+        font = get_font(48)
         text = f"Presiona E para revivir a {self.inactive_character.name}"
         revival_text = font.render(text, True, (255, 255, 100))
         revival_rect = revival_text.get_rect(center=(self.screen_width//2, self.screen_height - 100))
@@ -2029,17 +2099,17 @@ class Game:
         y = self.screen_height // 2
         
         # Fondo
-        pygame.draw.rect(self.screen, (100, 0, 0), (x, y, bar_width, bar_height))
+        canvas_draw.rect(self.screen, (100, 0, 0), (x, y, bar_width, bar_height))
         
         # Progreso
         progress_width = int(bar_width * progress)
-        pygame.draw.rect(self.screen, (0, 255, 100), (x + 2, y + 2, progress_width - 4, bar_height - 4))
+        canvas_draw.rect(self.screen, (0, 255, 100), (x + 2, y + 2, progress_width - 4, bar_height - 4))
         
         # Borde
-        pygame.draw.rect(self.screen, (255, 255, 255), (x, y, bar_width, bar_height), 2)
+        canvas_draw.rect(self.screen, (255, 255, 255), (x, y, bar_width, bar_height), 2)
         
         # Texto
-        font = pygame.font.Font(None, 36)
+        font = get_font(36)
         text = f"Reviviendo... {int(progress * 100)}%"
         revival_text = font.render(text, True, (255, 255, 255))
         text_rect = revival_text.get_rect(center=(x + bar_width//2, y - 30))
@@ -2049,8 +2119,8 @@ class Game:
         """Dibuja pantalla de game over"""
         # Ya no necesitamos overlay porque tenemos fondo negro sólido
         
-        font_large = pygame.font.Font(None, 144)
-        font_small = pygame.font.Font(None, 72)
+        font_large = get_font(144)
+        font_small = get_font(72)
         
         # Título
         game_over_text = font_large.render("💀 GAME OVER", True, (255, 50, 50))
@@ -2075,9 +2145,9 @@ class Game:
         """Dibuja pantalla de victoria"""
         # Ya no necesitamos overlay porque tenemos fondo negro sólido
         
-        font_large = pygame.font.Font(None, 144)
-        font_medium = pygame.font.Font(None, 96)
-        font_small = pygame.font.Font(None, 72)
+        font_large = get_font(144)
+        font_medium = get_font(96)
+        font_small = get_font(72)
         
         # Título
         victory_text = font_large.render("🎉 ¡NIVEL 1 COMPLETADO!", True, (255, 215, 0))
@@ -2113,8 +2183,8 @@ class Game:
             # Fondo para el botón de Nivel 2
             button_bg = pygame.Rect(nivel2_rect.x - 20, nivel2_rect.y - 10, 
                                    nivel2_rect.width + 40, nivel2_rect.height + 20)
-            pygame.draw.rect(self.screen, (50, 0, 50), button_bg)
-            pygame.draw.rect(self.screen, (255, 100, 100), button_bg, 3)
+            canvas_draw.rect(self.screen, (50, 0, 50), button_bg)
+            canvas_draw.rect(self.screen, (255, 100, 100), button_bg, 3)
             
             self.screen.blit(nivel2_text, nivel2_rect)
         else:
@@ -2137,13 +2207,13 @@ class Game:
         self.screen.blit(overlay, (0, 0))
         
         # Título de pausa
-        pause_font = pygame.font.Font(None, 96)
+        pause_font = get_font(96)
         pause_text = pause_font.render("⏸️ PAUSADO", True, (255, 255, 255))
         pause_rect = pause_text.get_rect(center=(self.screen_width // 2, self.screen_height // 2 - 100))
         self.screen.blit(pause_text, pause_rect)
         
         # Opciones del menú de pausa
-        option_font = pygame.font.Font(None, 48)
+        option_font = get_font(48)
         options = [
             "P - Continuar juego",
             "M - Menú Principal",
@@ -2175,6 +2245,9 @@ class Game:
             self.draw()
             self.clock.tick(self.fps)
         
+        self.collision_manager.close()
+        get_text_cache().report()
+        get_effect_cache().report()
         print("👋 ¡Gracias por jugar!")
         pygame.quit()
         sys.exit()
@@ -2187,11 +2260,10 @@ if __name__ == "__main__":
     try:
         import pygame
         import PIL
-        import requests
         print("✅ Todas las dependencias están instaladas")
     except ImportError as e:
         print(f"❌ Falta instalar: {e}")
-        print("Instala con: pip install pygame pillow requests")
+        print("Instala con: pip install pygame pillow")
         sys.exit(1)
     
     # Ejecutar intro cinematográfica
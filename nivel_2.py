@@ -1,9 +1,8 @@
 import pygame
 import sys
 from PIL import Image
-import requests
-from io import BytesIO
 import math
+import os
 import random
 
 # Importar configuración y utilidades
@@ -18,6 +17,11 @@ from juan_attacks import JuanAttack
 from chaman_malvado import ChamanMalvado
 from character_ai import CharacterAI
 from audio_manager import get_audio_manager
+from collision_editor import CollisionOverlay, EditorHistory, cells_in_rect
+from collision_format import load_legacy_blocks, write_collision_file
+from collision_journal import get_collision_journal
+from collision_grid import CollisionIndex
+from effect_cache import get_effect_cache, pulse_alpha
 
 # Clase CollisionBlock para el Nivel 2
 class CollisionBlock:
@@ -45,12 +49,20 @@ class CollisionBlock:
             screen.blit(block_surface, (screen_x, screen_y))
             
             # Borde del bloque
-            pygame.draw.rect(screen, (255, 0, 0), 
+            canvas_draw.rect(screen, (255, 0, 0), 
                            (screen_x, screen_y, self.width, self.height), 2)
 from loading_screen import LoadingScreen
 from items_system import ItemManager
 from worm_enemy import WormSpawner  # Agregar gusanos al nivel 2
 from sound_generator import get_sound_generator, play_sound
+from sprite_cache import get_sprite_cache
+from text_cache import get_font, get_text_cache
+from asset_preloader import AssetPreloader, level_2_requests
+from asset_store import get_asset_store
+from background_loader import load_background
+from background_renderer import ChunkedBackground
+from dirty_rects import DirtyRectRenderer
+from render_scale import canvas_draw, create_canvas, open_display, present, to_logical
 
 # Clase de colisión común (movida a utils para evitar duplicación)
 
@@ -112,13 +124,13 @@ class StaticItemLevel2:
         else:
             # Fallback: rectángulo de color
             color = (255, 100, 100) if self.item_type == 'apple' else (100, 100, 255)
-            pygame.draw.rect(screen, color, (*screen_pos, self.width, self.height))
+            canvas_draw.rect(screen, color, (*screen_pos, self.width, self.height))
         
         # Indicador "E" simplificado
-        font = pygame.font.Font(None, 24)
+        font = get_font(24)
         text = font.render("E", True, (255, 255, 255))
         text_pos = (screen_pos[0] + self.width//2 - 8, screen_pos[1] - 18)
-        pygame.draw.rect(screen, (0, 0, 0, 120), (*text_pos, 16, 16))
+        canvas_draw.rect(screen, (0, 0, 0, 120), (*text_pos, 16, 16))
         screen.blit(text, text_pos)
     
     def get_rect(self):
@@ -129,7 +141,9 @@ class StaticItemLevel2:
 class CollisionManagerLevel2:
     """Maneja las colisiones con bloques invisibles - NIVEL 2"""
     def __init__(self, world_width=5940, world_height=1080):
-        self.blocks = []
+        # Bloques indexados por celda (columna, fila): altas, bajas y búsquedas en O(1)
+        self.cells = {}
+        self.history = EditorHistory()
         self.editor_mode = False
         self.block_size = 32  # CHARACTER_SIZE[0] // 2
         self.editor_cursor_x = 100
@@ -144,33 +158,56 @@ class CollisionManagerLevel2:
         self.drag_current_x = 0
         self.drag_current_y = 0
         self.is_dragging = False
-        
-        # Sistema de persistencia
+        self.drag_button = 1  # 1 = rellenar, 3 = borrar
+        
+        # Índice de colisiones (hash espacial / mapa de ocupación) según COLLISION_ENGINE
+        self.collision_index = CollisionIndex(self.world_width, self.world_height,
+                                              block_factory=CollisionBlock)
+        # Capa pre-renderizada del editor (solo se redibujan las celdas que cambian)
+        self.overlay = CollisionOverlay(self.world_width, self.world_height, self.block_size)
+        
+        # Sistema de persistencia (formato binario, con migración desde el txt anterior)
+        self.binary_filename = "collision_data_nivel2.bin"
+        self.legacy_filename = "collision_data_nivel2.txt"
+        # Cada edición va al diario (uno por archivo) y un hilo la compacta en el binario
+        self.journal = get_collision_journal(self.binary_filename)
         self.load_collision_data()
+        self.journal.start()
+    
+    @property
+    def blocks(self):
+        """Lista de bloques de colisión (a partir del conjunto de celdas)"""
+        return list(self.cells.values())
     
     def load_collision_data(self):
         """Carga bloques de colisión desde archivo"""
         try:
-            filename = "collision_data_nivel2.txt"
-            with open(filename, 'r') as f:
-                for line in f:
-                    if line.strip():
-                        x, y, w, h = map(int, line.strip().split(','))
-                        self.blocks.append(CollisionBlock(x, y, w, h))
-            print(f"🧱 Bloques de colisión cargados para Nivel 2: {len(self.blocks)} bloques")
+            if not os.path.exists(self.binary_filename) and not os.path.exists(self.journal.journal_path):
+                # Migración automática desde el txt anterior
+                positions = [block[:2] for block in load_legacy_blocks(self.legacy_filename)]
+                write_collision_file(self.binary_filename, positions)
+                print(f"🔄 Bloques del Nivel 2 convertidos a formato binario: {self.binary_filename}")
+            positions = self.journal.load()
+            self.cells = {(int(x) // self.block_size, int(y) // self.block_size):
+                              CollisionBlock(x, y, self.block_size, self.block_size) for x, y in positions}
+            self.history.clear()
+            self.overlay.invalidate()
+            self.collision_index.rebuild(self.blocks)
+            print(f"🧱 Bloques de colisión cargados para Nivel 2: {len(self.blocks)} bloques (motor: {self.collision_index.engine})")
         except Exception as e:
             print(f"⚠️ Error cargando bloques Nivel 2: {e}")
-            self.blocks = []
+            self.cells = {}
+            self.collision_index.clear()
+            self.overlay.invalidate()
     
     def save_collision_data(self, silent=True):
         """Guarda bloques de colisión en archivo"""
         try:
-            filename = "collision_data_nivel2.txt"
-            with open(filename, 'w') as f:
-                for block in self.blocks:
-                    f.write(f"{block.x},{block.y},{block.width},{block.height}\n")
+            blocks_data = [(block.x, block.y) for block in self.blocks]
+            if not self.journal.compact(blocks_data):
+                return
             if not silent:
-                print(f"💾 Bloques guardados en {filename}: {len(self.blocks)} bloques")
+                print(f"💾 Bloques guardados en {self.binary_filename}: {len(self.blocks)} bloques")
         except Exception as e:
             print(f"❌ Error guardando bloques: {e}")
     
@@ -180,16 +217,10 @@ class CollisionManagerLevel2:
         grid_x = (x // self.block_size) * self.block_size
         grid_y = (y // self.block_size) * self.block_size
         
-        # Verificar si ya existe un bloque en esa posición
-        for block in self.blocks:
-            if block.x == grid_x and block.y == grid_y:
-                return False
-        
-        self.blocks.append(CollisionBlock(grid_x, grid_y, self.block_size, self.block_size))
+        # Verificar si ya existe un bloque en esa posición (búsqueda O(1) en el conjunto de celdas)
+        if not self.fill_cells([(int(grid_x // self.block_size), int(grid_y // self.block_size))]):
+            return False
         print(f"✅ Bloque añadido en ({grid_x}, {grid_y})")
-        
-        # Guardar automáticamente
-        self.save_collision_data(silent=True)
         return True
     
     def remove_block(self, x, y):
@@ -197,22 +228,82 @@ class CollisionManagerLevel2:
         grid_x = (x // self.block_size) * self.block_size
         grid_y = (y // self.block_size) * self.block_size
         
-        for block in self.blocks[:]:
-            if block.x == grid_x and block.y == grid_y:
-                self.blocks.remove(block)
-                print(f"🗑️ Bloque eliminado en ({grid_x}, {grid_y})")
-                
-                # Guardar automáticamente
-                self.save_collision_data(silent=True)
-                return True
+        if self.erase_cells([(int(grid_x // self.block_size), int(grid_y // self.block_size))]):
+            print(f"🗑️ Bloque eliminado en ({grid_x}, {grid_y})")
+            return True
         return False
     
+    def apply_cell_changes(self, add_cells, remove_cells, record_history=True):
+        """
+        Aplica un lote de altas y bajas tocando solo las celdas afectadas.
+        
+        Args:
+            add_cells: Celdas (columna, fila) a ocupar
+            remove_cells: Celdas (columna, fila) a liberar
+            record_history: Si la operación se puede deshacer
+            
+        Returns:
+            Tupla (celdas añadidas, celdas eliminadas) que realmente cambiaron
+        """
+        size = self.block_size
+        removed_cells, removed_blocks = [], []
+        for cell in remove_cells:
+            block = self.cells.pop(cell, None)
+            if block is not None:
+                removed_cells.append(cell)
+                removed_blocks.append(block)
+        
+        added_cells, added_blocks = [], []
+        for cell in add_cells:
+            if cell not in self.cells:
+                block = CollisionBlock(cell[0] * size, cell[1] * size, size, size)
+                self.cells[cell] = block
+                added_cells.append(cell)
+                added_blocks.append(block)
+        
+        # Índice y diario se actualizan una sola vez por lote
+        self.collision_index.remove_many(removed_blocks)
+        self.collision_index.insert_many(added_blocks)
+        self.journal.record_many([(block.x, block.y) for block in added_blocks],
+                                 [(block.x, block.y) for block in removed_blocks])
+        self.overlay.update_cells(added_cells + removed_cells, self.cells)
+        if record_history:
+            self.history.push(added_cells, removed_cells)
+        return added_cells, removed_cells
+    
+    def fill_cells(self, cells):
+        """Ocupa en lote las celdas indicadas y devuelve las que se añadieron"""
+        return self.apply_cell_changes(cells, [])[0]
+    
+    def erase_cells(self, cells):
+        """Libera en lote las celdas indicadas y devuelve las que se eliminaron"""
+        return self.apply_cell_changes([], cells)[1]
+    
+    def undo(self):
+        """Deshace la última operación del editor"""
+        change = self.history.undo()
+        if change is None:
+            print("↩️ Nada que deshacer")
+            return False
+        added, removed = change
+        self.apply_cell_changes(removed, added, record_history=False)
+        print(f"↩️ Deshecho: {len(added)} bloques quitados, {len(removed)} restaurados")
+        return True
+    
+    def redo(self):
+        """Vuelve a aplicar la última operación deshecha"""
+        change = self.history.redo()
+        if change is None:
+            print("↪️ Nada que rehacer")
+            return False
+        added, removed = change
+        self.apply_cell_changes(added, removed, record_history=False)
+        print(f"↪️ Rehecho: {len(added)} bloques añadidos, {len(removed)} quitados")
+        return True
+    
     def check_collision(self, character_rect):
         """Verifica colisión con bloques"""
-        for block in self.blocks:
-            if character_rect.colliderect(block.rect):
-                return True
-        return False
+        return self.collision_index.collides(character_rect)
     
     def can_move_to(self, character, new_x, new_y):
         """Verifica si un personaje puede moverse a una posición"""
@@ -230,22 +321,56 @@ class CollisionManagerLevel2:
         
         return True
     
+    def resolve_movements(self, moves):
+        """
+        Resuelve en una sola llamada los movimientos del tick, eje por eje,
+        para que los cuerpos se deslicen por las paredes en lugar de detenerse.
+        
+        Args:
+            moves: Lista de (cuerpo, x_anterior, y_anterior, ancho, alto); cada cuerpo
+                   ya tiene en x/y la posición a la que intentó moverse
+        """
+        requests = [(old_x, old_y, width, height, body.x - old_x, body.y - old_y)
+                    for body, old_x, old_y, width, height in moves]
+        results = self.collision_index.resolve_moves(requests)
+        for (body, _, _, _, _), (x, y, hit_x, hit_y) in zip(moves, results):
+            body.x, body.y = x, y
+            # Los cuerpos con velocidad (gusanos) la pierden en el eje del choque
+            if hit_x and hasattr(body, 'vel_x'):
+                body.vel_x = 0
+            if hit_y and hasattr(body, 'vel_y'):
+                body.vel_y = 0
+    
+    def move_aabbs(self, positions, sizes, velocities):
+        """Mueve muchos rectángulos contra el mapa en una sola pasada (posiciones resueltas, choques)"""
+        return self.collision_index.move_aabbs(positions, sizes, velocities)
+    
+    def has_line_of_sight(self, a, b):
+        """Indica si no hay bloques entre dos puntos (memorizado por tick)"""
+        return self.collision_index.has_line_of_sight(a, b)
+    
+    def raycast(self, origin, direction, max_dist):
+        """Lanza un rayo contra los bloques: (distancia, punto de impacto) o None"""
+        return self.collision_index.raycast(origin, direction, max_dist)
+    
+    def begin_tick(self):
+        """Inicia un tick nuevo (descarta las líneas de visión memorizadas)"""
+        self.collision_index.begin_tick()
+    
     def draw_editor_mode(self, screen, camera_x, camera_y):
         """Dibuja el modo editor"""
         if not self.editor_mode:
             return
         
-        # Dibujar todos los bloques
-        for block in self.blocks:
-            block.draw_editor(screen, camera_x, camera_y)
+        # Dibujar todos los bloques desde la capa pre-renderizada (un solo blit)
+        self.overlay.draw(screen, camera_x, camera_y, self.cells)
         
         # Dibujar cursor del editor con mejor feedback visual
         cursor_screen_x = self.editor_cursor_x - camera_x
         cursor_screen_y = self.editor_cursor_y - camera_y
         
         # Verificar si ya existe un bloque en esta posición
-        block_exists = any(block.x == self.editor_cursor_x and block.y == self.editor_cursor_y 
-                          for block in self.blocks)
+        block_exists = (self.editor_cursor_x // self.block_size, self.editor_cursor_y // self.block_size) in self.cells
         
         # Color del cursor: verde si es posición libre, rojo si ocupada
         cursor_color = (255, 100, 100) if block_exists else (100, 255, 100)
@@ -259,7 +384,7 @@ class CollisionManagerLevel2:
         # Borde del cursor con animación
         time_factor = pygame.time.get_ticks() / 200
         border_width = int(3 + 2 * abs(math.sin(time_factor)))
-        pygame.draw.rect(screen, border_color, 
+        canvas_draw.rect(screen, border_color, 
                         (cursor_screen_x, cursor_screen_y, self.block_size, self.block_size), 
                         border_width)
         
@@ -269,15 +394,15 @@ class CollisionManagerLevel2:
         
         if block_exists:
             # Símbolo de eliminación (X)
-            pygame.draw.line(screen, (255, 255, 255), 
+            canvas_draw.line(screen, (255, 255, 255), 
                            (center_x - 8, center_y - 8), (center_x + 8, center_y + 8), 3)
-            pygame.draw.line(screen, (255, 255, 255), 
+            canvas_draw.line(screen, (255, 255, 255), 
                            (center_x + 8, center_y - 8), (center_x - 8, center_y + 8), 3)
         else:
             # Símbolo de adición (+)
-            pygame.draw.line(screen, (255, 255, 255), 
+            canvas_draw.line(screen, (255, 255, 255), 
                            (center_x - 8, center_y), (center_x + 8, center_y), 3)
-            pygame.draw.line(screen, (255, 255, 255), 
+            canvas_draw.line(screen, (255, 255, 255), 
                            (center_x, center_y - 8), (center_x, center_y + 8), 3)
         
         # Dibujar rectángulo de arrastre si se está arrastrando
@@ -295,22 +420,25 @@ class CollisionManagerLevel2:
             
             # Rectángulo de previsualización
             preview_surface = pygame.Surface((grid_width, grid_height), pygame.SRCALPHA)
-            preview_surface.fill((0, 255, 0, 100))
+            preview_color = (255, 0, 0) if self.drag_button == 3 else (0, 255, 0)
+            preview_surface.fill((*preview_color, 100))
             screen.blit(preview_surface, (grid_start_x, grid_start_y))
-            pygame.draw.rect(screen, (0, 255, 0), (grid_start_x, grid_start_y, grid_width, grid_height), 3)
+            canvas_draw.rect(screen, preview_color, (grid_start_x, grid_start_y, grid_width, grid_height), 3)
     
     def handle_editor_input(self, keys_pressed, keys_just_pressed, mouse_events, camera_x, camera_y):
         """Maneja input del modo editor con sistema de arrastre - IGUAL QUE NIVEL 1"""
         if not self.editor_mode:
             return
         
-        # Manejar eventos del mouse
+        # Manejar eventos del mouse (izquierdo rellena, derecho borra)
         for event in mouse_events:
             if event.type == pygame.MOUSEBUTTONDOWN:
-                if event.button == 1:  # Click izquierdo
+                if event.button in (1, 3):  # Click izquierdo / derecho
                     self.mouse_pressed = True
-                    mouse_world_x = event.pos[0] + camera_x
-                    mouse_world_y = event.pos[1] + camera_y
+                    self.drag_button = event.button
+                    mouse_x, mouse_y = to_logical(event.pos)  # Ventana interna -> coordenadas lógicas
+                    mouse_world_x = mouse_x + camera_x
+                    mouse_world_y = mouse_y + camera_y
                     self.drag_start_x = mouse_world_x
                     self.drag_start_y = mouse_world_y
                     self.drag_current_x = mouse_world_x
@@ -318,23 +446,31 @@ class CollisionManagerLevel2:
                     self.is_dragging = False
                     
             elif event.type == pygame.MOUSEBUTTONUP:
-                if event.button == 1 and self.mouse_pressed:  # Soltar click izquierdo
+                if event.button == self.drag_button and self.mouse_pressed:  # Soltar click
                     self.mouse_pressed = False
+                    erasing = self.drag_button == 3
                     if self.is_dragging:
-                        # Crear rectángulo de bloques
-                        self.create_block_rectangle()
+                        # Rellenar o borrar el rectángulo completo en un solo lote
+                        if erasing:
+                            self.erase_block_rectangle()
+                        else:
+                            self.create_block_rectangle()
                     else:
-                        # Click simple - agregar un bloque
+                        # Click simple - agregar o quitar un bloque
                         grid_x = (self.drag_start_x // self.block_size) * self.block_size
                         grid_y = (self.drag_start_y // self.block_size) * self.block_size
-                        if self.add_block(grid_x, grid_y):
+                        if erasing:
+                            if self.remove_block(grid_x, grid_y):
+                                print(f"🗑️ Bloque eliminado y guardado automáticamente")
+                        elif self.add_block(grid_x, grid_y):
                             print(f"🔧 Bloque guardado automáticamente")
                     self.is_dragging = False
                     
             elif event.type == pygame.MOUSEMOTION:
                 if self.mouse_pressed:
-                    mouse_world_x = event.pos[0] + camera_x
-                    mouse_world_y = event.pos[1] + camera_y
+                    mouse_x, mouse_y = to_logical(event.pos)  # Ventana interna -> coordenadas lógicas
+                    mouse_world_x = mouse_x + camera_x
+                    mouse_world_y = mouse_y + camera_y
                     self.drag_current_x = mouse_world_x
                     self.drag_current_y = mouse_world_y
                     
@@ -343,9 +479,20 @@ class CollisionManagerLevel2:
                     if distance > 10:  # Threshold para detectar arrastre
                         self.is_dragging = True
         
+        # Deshacer / rehacer (Ctrl+Z, Ctrl+Y o Ctrl+Shift+Z)
+        mods = pygame.key.get_mods()
+        if mods & pygame.KMOD_CTRL:
+            if keys_just_pressed.get(pygame.K_z, False):
+                if mods & pygame.KMOD_SHIFT:
+                    self.redo()
+                else:
+                    self.undo()
+            elif keys_just_pressed.get(pygame.K_y, False):
+                self.redo()
+        
         # Teclas para eliminar (mantener funcionalidad de teclado)
         if keys_just_pressed.get(pygame.K_BACKSPACE, False):
-            mouse_pos = pygame.mouse.get_pos()
+            mouse_pos = to_logical(pygame.mouse.get_pos())
             mouse_world_x = mouse_pos[0] + camera_x
             mouse_world_y = mouse_pos[1] + camera_y
             grid_x = (mouse_world_x // self.block_size) * self.block_size
@@ -353,38 +500,32 @@ class CollisionManagerLevel2:
             if self.remove_block(grid_x, grid_y):
                 print(f"🗑️ Bloque eliminado y guardado automáticamente")
     
+    def get_drag_cells(self):
+        """Celdas que cubre el rectángulo arrastrado"""
+        return cells_in_rect(self.drag_start_x, self.drag_start_y,
+                             self.drag_current_x, self.drag_current_y, self.block_size)
+    
     def create_block_rectangle(self):
         """Crea un rectángulo de bloques desde drag_start hasta drag_current"""
-        start_x = min(self.drag_start_x, self.drag_current_x)
-        end_x = max(self.drag_start_x, self.drag_current_x)
-        start_y = min(self.drag_start_y, self.drag_current_y)
-        end_y = max(self.drag_start_y, self.drag_current_y)
-        
-        # Alinear a la grilla
-        start_grid_x = (start_x // self.block_size) * self.block_size
-        end_grid_x = (end_x // self.block_size) * self.block_size
-        start_grid_y = (start_y // self.block_size) * self.block_size
-        end_grid_y = (end_y // self.block_size) * self.block_size
-        
-        blocks_added = 0
-        for x in range(int(start_grid_x), int(end_grid_x) + self.block_size, self.block_size):
-            for y in range(int(start_grid_y), int(end_grid_y) + self.block_size, self.block_size):
-                # Verificar si ya existe un bloque en esta posición
-                block_exists = any(block.x == x and block.y == y for block in self.blocks)
-                if not block_exists:
-                    new_block = CollisionBlock(x, y, self.block_size, self.block_size)
-                    self.blocks.append(new_block)
-                    blocks_added += 1
-        
+        blocks_added = len(self.fill_cells(self.get_drag_cells()))
         if blocks_added > 0:
             print(f"✅ {blocks_added} bloques agregados en rectángulo")
-            # Guardar automáticamente después del rectángulo completo
-            self.save_collision_data(silent=True)
+            print("💾 Rectángulo guardado automáticamente")
+    
+    def erase_block_rectangle(self):
+        """Elimina los bloques del rectángulo desde drag_start hasta drag_current"""
+        blocks_removed = len(self.erase_cells(self.get_drag_cells()))
+        if blocks_removed > 0:
+            print(f"🗑️ {blocks_removed} bloques eliminados en rectángulo")
             print("💾 Rectángulo guardado automáticamente")
     
     def auto_save(self):
-        """Método de guardado automático para compatibilidad"""
-        self.save_collision_data(silent=True)
+        """Pide la compactación del diario en segundo plano (sin bloquear el frame)"""
+        self.journal.request_compaction()
+    
+    def close(self):
+        """Detiene el hilo del diario y guarda las ediciones pendientes (al salir del nivel)"""
+        self.journal.close()
 
 
 class Nivel2:
@@ -392,11 +533,14 @@ class Nivel2:
         pygame.init()
         self.screen_width = 1920
         self.screen_height = 1080
-        self.screen = pygame.display.set_mode((self.screen_width, self.screen_height), pygame.FULLSCREEN)
+        # Ventana a la resolución interna de RENDER_SCALE; el juego dibuja en coordenadas
+        # lógicas sobre un lienzo que la llena (la pantalla misma con 1.0)
+        self.display = open_display((self.screen_width, self.screen_height), pygame.FULLSCREEN)
         pygame.display.set_caption("🍎 Nivel 2 - La Tierra de las Manzanas - EL CHAMÁN MALVADO")
+        self.screen = create_canvas(self.display)
         
         # Verificar resolución real
-        actual_size = self.screen.get_size()
+        actual_size = self.display.get_size()
         print(f"🖥️ Resolución Nivel 2: {actual_size[0]}x{actual_size[1]}")
         
         self.clock = pygame.time.Clock()
@@ -405,20 +549,23 @@ class Nivel2:
         # Carga directa sin loading screen molesto
         print("🎮 Iniciando Nivel 2 - El Chamán Malvado...")
         
-        # Cargar escenario completo del nivel 2 desde GitHub
+        # Dimensiones grandes por defecto para permitir exploración vertical (fondo de respaldo)
+        self.world_width = 1920
+        self.world_height = 3000  # Altura aumentada para exploración vertical
+        
+        # Cargar escenario completo del nivel 2 desde el almacén local
         self.background_color = (15, 25, 15)  # Fallback
-        self.github_background_url = "https://github.com/user-attachments/assets/591f8b6d-7a10-4cb5-ae8a-6997fd21ea65"
-        self.background_image = self.load_background_from_github()
+        self.background_image = self.load_background_from_store()
         
         # Configurar dimensiones del mundo completo basadas en el PNG
         if self.background_image:
             self.world_width = self.background_image.get_width()
             self.world_height = self.background_image.get_height()
             print(f"🌍 Mundo del Nivel 2: {self.world_width}x{self.world_height}")
-        else:
-            # Dimensiones grandes por defecto para permitir exploración vertical
-            self.world_width = 1920
-            self.world_height = 3000  # Altura aumentada para exploración vertical
+        self.background_renderer = ChunkedBackground(self.background_image) if self.background_image else None
+        
+        # Decodificar en paralelo las animaciones del nivel (al venir del Nivel 1 ya están en caché)
+        AssetPreloader(level_2_requests()).run()
         
         # Cargar personajes con transferencia de estadísticas del nivel 1 o stats base
         
@@ -463,6 +610,10 @@ class Nivel2:
         # Cargar sistemas de ataque mejorados
         self.juan_attack = JuanAttack(self.juan)
         self.adan_attack = AdanAttack(self.adan)
+        
+        # Movimiento y ataques de cada personaje en un solo atlas (el mismo del Nivel 1)
+        self.juan.pack_atlas(self.juan_attack)
+        self.adan.pack_atlas(self.adan_attack)
         self.juan.attacks = self.juan_attack
         self.adan.attacks = self.adan_attack
         
@@ -488,6 +639,8 @@ class Nivel2:
         self.chaman = ChamanMalvado(self.screen_width//2, self.screen_height//4)
         # Escalar chamán 30% más pequeño para mejor jugabilidad
         self.scale_chaman_sprites(0.7)
+        # Atlas del chamán y sus variantes de dibujo a la escala elegida
+        self.chaman.character.pack_atlas(self.chaman.attack_system)
         
         # Cargar gusanos adicionales para mayor dificultad
         self.worm_spawner = WormSpawner(max_worms=15)  # 15 gusanos como solicitado
@@ -508,7 +661,7 @@ class Nivel2:
         print(f"   Click simple: Colocar bloque individual")
         print(f"   Backspace: Eliminar bloque en cursor del mouse")
         print(f"   💾 GUARDADO AUTOMÁTICO: Cada bloque se guarda instantáneamente")
-        print(f"   📁 Archivo: collision_data_nivel2.txt")
+        print(f"   📁 Archivo: collision_data_nivel2.bin")
             
         self.keys_last_frame = list(pygame.key.get_pressed())  # Para detectar pulsaciones
         self.game_paused = False  # Sistema de pausa para editor
@@ -552,35 +705,24 @@ class Nivel2:
         print(f"🎮 Nivel 2 iniciado - Personaje activo: {self.active_character.name}")
         print(f"🤖 IA controlando: {self.inactive_character.name}")
         print(f"👹 Chamán Malvado despertado con {self.chaman.health} HP")
+        get_sprite_cache().report()
+        
+        # Rectángulos sucios: la escena se dibuja aparte y solo se envía lo que cambia
+        # (con resolución interna reducida se presenta el frame completo, que escala SDL)
+        self.dirty_renderer = None
+        if DIRTY_RECT_RENDERING and self.camera_fixed and self.screen is self.display:
+            self.dirty_renderer = DirtyRectRenderer(self.display, self.draw_background)
+            self.screen = self.dirty_renderer.scene
     
-    def load_background_from_github(self):
-        """Carga el fondo completo del Nivel 2 desde GitHub"""
-        try:
-            print("📥 Descargando fondo completo del Nivel 2 desde GitHub...")
-            response = requests.get(self.github_background_url, timeout=15)
-            response.raise_for_status()
-            
-            image_data = BytesIO(response.content)
-            pil_image = Image.open(image_data)
-            
-            # Información de la imagen original
-            original_width, original_height = pil_image.size
-            print(f"📐 Dimensiones del PNG completo: {original_width}x{original_height}")
-            
-            # Convertir a formato pygame manteniendo dimensiones originales
-            pil_image = pil_image.convert('RGB')
-            image_data = pil_image.tobytes()
-            
-            background = pygame.image.fromstring(image_data, pil_image.size, 'RGB')
-            background = background.convert()
-            
-            print(f"✅ Fondo completo del Nivel 2 cargado: {original_width}x{original_height}")
-            return background
-            
-        except Exception as e:
-            print(f"❌ Error cargando fondo desde GitHub: {e}")
+    def load_background_from_store(self):
+        """Carga el fondo completo del Nivel 2 desde el almacén local (sin red)"""
+        background = get_asset_store().image("backgrounds/nivel2", alpha=False)
+        if background is None:
             print("🎨 Usando fondo de respaldo...")
             return self.create_fallback_background()
+        
+        print(f"✅ Fondo completo del Nivel 2 cargado: {background.get_width()}x{background.get_height()}")
+        return background
     
     def create_fallback_background(self):
         """Crea un fondo de respaldo para el Nivel 2"""
@@ -605,65 +747,45 @@ class Nivel2:
     
     def load_background_from_local(self, file_path):
         """Carga el fondo desde archivo local - IGUAL QUE NIVEL 1"""
-        try:
-            print(f"📥 Cargando fondo del nivel 2 desde archivo local: {file_path}")
-            
-            # Cargar imagen local usando PIL
-            pil_image = Image.open(file_path)
-            
-            # Información de la imagen original
-            original_width, original_height = pil_image.size
-            print(f"📐 Dimensiones originales del fondo nivel 2: {original_width}x{original_height}")
-            
+        print(f"📥 Cargando fondo del nivel 2 desde archivo local: {file_path}")
+        
+        # Decodificación directa al formato de la pantalla
+        background = load_background(file_path)
+        if background:
             # RESPETAR DIMENSIONES ORIGINALES - No redimensionar
-            self.world_width = original_width
-            self.world_height = original_height
+            self.world_width, self.world_height = background.get_size()
             print(f"✅ Usando dimensiones originales del nivel 2: {self.world_width}x{self.world_height}")
-            
-            # Convertir a formato pygame
-            pil_image = pil_image.convert('RGB')
-            image_data = pil_image.tobytes()
-            
-            background = pygame.image.fromstring(image_data, pil_image.size, 'RGB')
-            background = background.convert()
-            
-            print(f"✅ Fondo nivel 2 cargado exitosamente: {original_width}x{original_height}")
             return background
-            
-        except Exception as e:
-            print(f"❌ Error cargando fondo nivel 2: {e}")
-            print("🎨 Creando fondo de respaldo para nivel 2...")
-            
-            # Crear fondo de respaldo más oscuro y siniestro para el nivel 2
-            fallback = pygame.Surface((1920, 1080))
-            
-            # Gradiente oscuro para el nivel del Chamán
-            for y in range(1080):
-                darkness_intensity = 20 + (y * 40) // 1080
-                color = (darkness_intensity // 3, darkness_intensity // 2, darkness_intensity // 3)  # Verdoso oscuro
-                pygame.draw.line(fallback, color, (0, y), (1920, y))
-            
-            # Añadir elementos decorativos siniestros
-            import random
-            for _ in range(80):
-                x = random.randint(0, 1920)
-                y = random.randint(0, 1080)
-                size = random.randint(3, 8)
-                darkness = random.randint(5, 15)
-                pygame.draw.circle(fallback, (darkness, darkness//2, darkness), (x, y), size)
-            
-            print("✅ Fondo de respaldo del nivel 2 creado")
-            return fallback
+        
+        print("🎨 Creando fondo de respaldo para nivel 2...")
+        
+        # Crear fondo de respaldo más oscuro y siniestro para el nivel 2
+        fallback = pygame.Surface((1920, 1080))
+        
+        # Gradiente oscuro para el nivel del Chamán
+        for y in range(1080):
+            darkness_intensity = 20 + (y * 40) // 1080
+            color = (darkness_intensity // 3, darkness_intensity // 2, darkness_intensity // 3)  # Verdoso oscuro
+            pygame.draw.line(fallback, color, (0, y), (1920, y))
+        
+        # Añadir elementos decorativos siniestros
+        import random
+        for _ in range(80):
+            x = random.randint(0, 1920)
+            y = random.randint(0, 1080)
+            size = random.randint(3, 8)
+            darkness = random.randint(5, 15)
+            pygame.draw.circle(fallback, (darkness, darkness//2, darkness), (x, y), size)
+        
+        print("✅ Fondo de respaldo del nivel 2 creado")
+        return fallback
 
     def scale_character_sprites(self, character, scale_factor):
         """Escala todos los sprites de un personaje"""
         try:
-            # Escalar animaciones de movimiento
-            for direction in character.animations:
-                for i, frame in enumerate(character.animations[direction]):
-                    original_size = frame.get_size()
-                    new_size = (int(original_size[0] * scale_factor), int(original_size[1] * scale_factor))
-                    character.animations[direction][i] = pygame.transform.scale(frame, new_size)
+            # Pedir la variante escalada al dibujar: los frames originales se comparten
+            # (caché de sprites, atlas y Nivel 1) y no se modifican
+            character.sprite_scale = getattr(character, 'sprite_scale', 1.0) * scale_factor
             
             # Actualizar tamaño del personaje
             character.width = int(character.width * scale_factor)
@@ -676,21 +798,10 @@ class Nivel2:
     def scale_chaman_sprites(self, scale_factor):
         """Escala sprites del chamán para mejor jugabilidad"""
         try:
-            # Escalar character del chamán
+            # Escalar character del chamán (su draw aplica la misma escala a los frames de ataque)
             if hasattr(self.chaman, 'character'):
                 self.scale_character_sprites(self.chaman.character, scale_factor)
             
-            # Escalar sprites de ataques del chamán si existen
-            if hasattr(self.chaman, 'attack_system') and hasattr(self.chaman.attack_system, 'attack_frames'):
-                try:
-                    for direction in self.chaman.attack_system.attack_frames:
-                        for i, frame in enumerate(self.chaman.attack_system.attack_frames[direction]):
-                            original_size = frame.get_size()
-                            new_size = (int(original_size[0] * scale_factor), int(original_size[1] * scale_factor))
-                            self.chaman.attack_system.attack_frames[direction][i] = pygame.transform.scale(frame, new_size)
-                except (AttributeError, KeyError):
-                    pass  # Si no tiene attack_frames o falla, continuar
-            
             print(f"✅ Chamán escalado {scale_factor}x para mejor jugabilidad")
         except Exception as e:
             print(f"⚠️ Error escalando chamán: {e}")
@@ -766,11 +877,7 @@ class Nivel2:
             item_rect = pygame.Rect(x, y, 20, 20)  # Tamaño del item
             
             # Revisar colisión con bloques invisibles
-            collision_found = False
-            for block in self.collision_manager.blocks:
-                if item_rect.colliderect(block.rect):
-                    collision_found = True
-                    break
+            collision_found = self.collision_manager.check_collision(item_rect)
             
             # Verificar que no esté muy cerca de otros items existentes
             too_close = False
@@ -860,7 +967,7 @@ class Nivel2:
                     if self.collision_manager.editor_mode:
                         print("🔄 GUARDADO AUTOMÁTICO ACTIVADO")
                         print("✨ Todos los bloques se guardan instantáneamente")
-                        print("📁 Archivo: collision_data_nivel2.txt")
+                        print("📁 Archivo: collision_data_nivel2.bin")
                     else:
                         # Guardado final al salir del editor
                         try:
@@ -1084,40 +1191,30 @@ class Nivel2:
         
         keys_pressed = pygame.key.get_pressed()
         
-        # Actualizar personaje activo con sistema de colisiones
+        # Nuevo tick: las líneas de visión memorizadas se recalculan
+        self.collision_manager.begin_tick()
+        
+        # Posiciones de partida de todos los cuerpos (las colisiones se resuelven juntas al final)
+        movement_start = self.get_moving_bodies()
+        
+        # Actualizar personaje activo (colisiones resueltas al final del tick)
         if not self.active_attack_system.is_character_attacking() and not self.collision_manager.editor_mode:
-            old_x, old_y = self.active_character.x, self.active_character.y
             self.active_character.update(keys_pressed)
             
-            # Verificar colisiones y revertir movimiento si es necesario
-            if not self.collision_manager.can_move_to(self.active_character, 
-                                                     self.active_character.x, 
-                                                     self.active_character.y):
-                self.active_character.x, self.active_character.y = old_x, old_y
-            
             # Aplicar límites del mundo
             self.enforce_boundaries(self.active_character)
         
         # Actualizar IA del personaje inactivo contra TODOS los enemigos
         if (self.inactive_character.health > 0 or self.inactive_ai.is_being_revived) and not self.collision_manager.editor_mode:
-            old_x, old_y = self.inactive_character.x, self.inactive_character.y
-            
             # Obtener todos los enemigos para que la IA pueda atacar a cualquiera
             worms = self.worm_spawner.get_worms()
             all_enemies_for_ai = [self.chaman] + worms  # Incluir Chamán y todos los gusanos
             
             # La IA ahora puede atacar tanto al chamán como a los gusanos
-            self.inactive_ai.update(all_enemies_for_ai)
+            self.inactive_ai.update(all_enemies_for_ai, self.collision_manager)
             
             ai_animation_state = self.inactive_ai.get_animation_state()
             self.inactive_character.update(keys_pressed=None, ai_controlled=True, ai_direction=ai_animation_state)
-            
-            # Verificar colisiones para IA también
-            if not self.collision_manager.can_move_to(self.inactive_character,
-                                                     self.inactive_character.x,
-                                                     self.inactive_character.y):
-                self.inactive_character.x, self.inactive_character.y = old_x, old_y
-            
             self.enforce_boundaries(self.inactive_character)
         
         # Sistema de ataques automáticos de IA (IGUAL QUE NIVEL 1)
@@ -1165,14 +1262,17 @@ class Nivel2:
         
         # Actualizar chamán (IA vs personaje activo)
         players = [self.active_character, self.inactive_character]
-        self.chaman.update(players)
+        self.chaman.update(players, self.collision_manager)
         
         # Actualizar gusanos adicionales del nivel 2
-        self.worm_spawner.update(players)
+        self.worm_spawner.update(players, self.collision_manager)
         
         # Aplicar límites del mundo a los gusanos también
         self.enforce_boundaries_worms()
         
+        # Resolver colisiones de los personajes en una sola llamada (deslizamiento por ejes)
+        self.collision_manager.resolve_movements(movement_start)
+        
         # Comprobar impactos de proyectiles del chamán en ambos personajes
         self.chaman.check_projectile_collisions(players)
         
@@ -1195,7 +1295,7 @@ class Nivel2:
         all_enemies = [self.chaman] + worms  # Incluir Chamán y todos los gusanos
         
         self.juan_attack.update(all_enemies)
-        self.adan_attack.update(all_enemies)
+        self.adan_attack.update(all_enemies, self.collision_manager)
         
         # Spawn automático de items distribuidos (igual que nivel 1)
         self.spawn_random_item_level2()
@@ -1362,6 +1462,14 @@ class Nivel2:
             if current_time - item['drop_time'] > 45000:
                 self.dropped_items.remove(item)
     
+    def get_moving_bodies(self):
+        """
+        Personajes que se mueven en este tick: (cuerpo, x, y, ancho, alto) al inicio del tick.
+        El chamán, los gusanos y los proyectiles se resuelven en lote dentro de sus propios sistemas.
+        """
+        bodies = [(self.active_character, 100, 100), (self.inactive_character, 100, 100)]  # 64 * 1.56 = 100
+        return [(body, body.x, body.y, width, height) for body, width, height in bodies]
+    
     def enforce_boundaries(self, character):
         """LÍMITES ESTRICTOS - NO PUEDE SALIR DEL PNG (5940x1080)"""
         # Límites estrictos basados en las dimensiones REALES del PNG
@@ -1446,13 +1554,33 @@ class Nivel2:
     
     def draw(self):
         """Dibuja todo el nivel"""
-        # Fondo del nivel
-        self.screen.fill(self.background_color)
-        
-        # Si hay imagen de fondo, dibujarla
-        if self.background_image:
-            self.screen.blit(self.background_image, (-self.camera_x, -self.camera_y))
+        if self.dirty_renderer:
+            # Cámara fija: solo se borra y se envía lo que cambió desde el frame anterior
+            self.dirty_renderer.begin_frame((self.camera_x, self.camera_y))
+            try:
+                self.draw_scene()
+            finally:
+                self.dirty_renderer.end_frame()
+            return
         
+        self.draw_background(self.screen, self.screen.get_rect())
+        self.draw_scene()
+        present(self.screen)
+    
+    def draw_background(self, surface, rect):
+        """Dibuja el fondo del nivel en una región de la pantalla"""
+        # El color solo hace falta si la imagen no tapa la región
+        renderer = self.background_renderer
+        if not renderer or not renderer.covers(self.camera_x + rect.x, self.camera_y + rect.y,
+                                               rect.width, rect.height):
+            surface.fill(self.background_color, rect)
+        
+        # Si hay imagen de fondo, dibujar solo los bloques visibles
+        if renderer:
+            renderer.draw_area(surface, self.camera_x, self.camera_y, rect)
+    
+    def draw_scene(self):
+        """Dibuja todo lo que va sobre el fondo"""
         # Dibujar personajes (inactivo primero para orden de capas)
         if self.inactive_character.health > 0:
             if not self.inactive_attack_system.is_character_attacking():
@@ -1505,18 +1633,15 @@ class Nivel2:
             self.draw_victory()
         elif self.game_paused and not self.collision_manager.editor_mode:
             self.draw_pause_menu()
-        
-        pygame.display.flip()
     
     def draw_shield_effect(self, character):
         """Dibuja efecto visual de escudo"""
-        # Círculo pulsante alrededor del personaje
-        shield_alpha = int(100 + 50 * math.sin(pygame.time.get_ticks() * 0.01))
-        shield_surface = pygame.Surface((character.width + 40, character.height + 40), pygame.SRCALPHA)
-        
-        pygame.draw.circle(shield_surface, (0, 150, 255, shield_alpha), 
-                         (character.width//2 + 20, character.height//2 + 20), 
-                         character.width//2 + 15)
+        # Círculo pulsante alrededor del personaje (frames del pulso pre-renderizados)
+        shield_alpha = pulse_alpha(pygame.time.get_ticks() * 0.01, 100, 50)
+        shield_surface = get_effect_cache().circles(
+            (character.width + 40, character.height + 40),
+            (character.width//2 + 20, character.height//2 + 20),
+            ((character.width//2 + 15, (0, 150, 255), shield_alpha),))
         
         self.screen.blit(shield_surface, 
                         (character.x - self.camera_x - 20, character.y - self.camera_y - 20))
@@ -1562,7 +1687,7 @@ class Nivel2:
                 y = character.y - self.camera_y - 50
                 
                 # Fondo
-                pygame.draw.rect(self.screen, (100, 100, 100), (x, y, bar_width, bar_height))
+                canvas_draw.rect(self.screen, (100, 100, 100), (x, y, bar_width, bar_height))
                 
                 # Vida
                 if health_ratio > 0.7:
@@ -1572,10 +1697,10 @@ class Nivel2:
                 else:
                     color = (255, 0, 0)
                     
-                pygame.draw.rect(self.screen, color, (x, y, int(bar_width * health_ratio), bar_height))
+                canvas_draw.rect(self.screen, color, (x, y, int(bar_width * health_ratio), bar_height))
                 
                 # Borde
-                pygame.draw.rect(self.screen, (255, 255, 255), (x, y, bar_width, bar_height), 2)
+                canvas_draw.rect(self.screen, (255, 255, 255), (x, y, bar_width, bar_height), 2)
         
         # Barra de salud del chamán
         self.chaman.draw_health_bar(self.screen, self.camera_x, self.camera_y)
@@ -1622,7 +1747,7 @@ class Nivel2:
                 name_y = screen_y + name_offset
                 
                 # Nombre del personaje
-                font = pygame.font.Font(None, 24)
+                font = get_font(24)
                 name_text = font.render(name, True, name_color)
                 name_rect = name_text.get_rect(center=(name_x, name_y))
                 
@@ -1653,13 +1778,13 @@ class Nivel2:
                 # Dibujar barra de vida
                 current_width = int(bar_width * health_ratio)
                 if current_width > 0:
-                    pygame.draw.rect(self.screen, health_color, (bar_x, bar_y, current_width, bar_height))
+                    canvas_draw.rect(self.screen, health_color, (bar_x, bar_y, current_width, bar_height))
                 
                 # Borde de la barra
-                pygame.draw.rect(self.screen, (255, 255, 255), (bar_x, bar_y, bar_width, bar_height), 2)
+                canvas_draw.rect(self.screen, (255, 255, 255), (bar_x, bar_y, bar_width, bar_height), 2)
                 
                 # Texto de vida (números)
-                health_font = pygame.font.Font(None, 20)
+                health_font = get_font(20)
                 health_text = f"{character.health}/{character.max_health}"
                 health_surface = health_font.render(health_text, True, (255, 255, 255))
                 health_rect = health_surface.get_rect(center=(bar_x + bar_width // 2, bar_y + bar_height // 2))
@@ -1668,14 +1793,14 @@ class Nivel2:
                 # Indicador de escudo si está activo
                 if hasattr(character, 'shield_active') and character.shield_active:
                     shield_text = "🛡️"
-                    shield_font = pygame.font.Font(None, 24)
+                    shield_font = get_font(24)
                     shield_surface = shield_font.render(shield_text, True, (100, 200, 255))
                     shield_rect = shield_surface.get_rect(center=(bar_x + bar_width + 15, bar_y + bar_height // 2))
                     self.screen.blit(shield_surface, shield_rect)
     
     def draw_revival_prompt(self):
         """Dibuja prompt para revivir"""
-        font = pygame.font.Font(None, 48)
+        font = get_font(48)
         text = f"Presiona E para revivir a {self.inactive_character.name}"
         revival_text = font.render(text, True, (255, 255, 100))
         revival_rect = revival_text.get_rect(center=(self.screen_width//2, self.screen_height - 100))
@@ -1700,17 +1825,17 @@ class Nivel2:
         y = self.screen_height // 2
         
         # Fondo
-        pygame.draw.rect(self.screen, (100, 0, 0), (x, y, bar_width, bar_height))
+        canvas_draw.rect(self.screen, (100, 0, 0), (x, y, bar_width, bar_height))
         
         # Progreso
         progress_width = int(bar_width * progress)
-        pygame.draw.rect(self.screen, (0, 255, 100), (x + 2, y + 2, progress_width - 4, bar_height - 4))
+        canvas_draw.rect(self.screen, (0, 255, 100), (x + 2, y + 2, progress_width - 4, bar_height - 4))
         
         # Borde
-        pygame.draw.rect(self.screen, (255, 255, 255), (x, y, bar_width, bar_height), 2)
+        canvas_draw.rect(self.screen, (255, 255, 255), (x, y, bar_width, bar_height), 2)
         
         # Texto
-        font = pygame.font.Font(None, 36)
+        font = get_font(36)
         text = f"Reviviendo... {int(progress * 100)}%"
         revival_text = font.render(text, True, (255, 255, 255))
         text_rect = revival_text.get_rect(center=(x + bar_width//2, y - 30))
@@ -1729,8 +1854,8 @@ class Nivel2:
         pygame.draw.rect(menu_surface, (255, 215, 0), (0, 0, menu_width, menu_height), 4)
         
         # Título
-        font_title = pygame.font.Font(None, 72)
-        font_option = pygame.font.Font(None, 48)
+        font_title = get_font(72)
+        font_option = get_font(48)
         
         title_text = font_title.render("🍎 MEJORA OBTENIDA 🍎", True, (255, 215, 0))
         title_rect = title_text.get_rect(center=(menu_width//2, 50))
@@ -1757,9 +1882,9 @@ class Nivel2:
     
     def draw_ui(self):
         """Dibuja interfaz de usuario idéntica al nivel 1"""
-        font = pygame.font.Font(None, 72)
-        font_small = pygame.font.Font(None, 48)
-        font_large = pygame.font.Font(None, 96)  # Para contador de enemigos
+        font = get_font(72)
+        font_small = get_font(48)
+        font_large = get_font(96)  # Para contador de enemigos
         
         # UI normal del juego
         # Personaje activo con icono
@@ -1799,7 +1924,7 @@ class Nivel2:
                 self.screen.blit(shield_text, (600 + i * 200, 160))
         
         # Controles - Simplificados
-        font_small_controls = pygame.font.Font(None, 36)
+        font_small_controls = get_font(36)
         controls = [
             "🎮 CONTROLES NIVEL 2:",
             "WASD - Mover | ESPACIO - Ataque",
@@ -1816,9 +1941,9 @@ class Nivel2:
         # Fondo sólido negro para coherencia visual
         self.screen.fill((0, 0, 0))
         
-        font_huge = pygame.font.Font(None, 180)
-        font_large = pygame.font.Font(None, 96)
-        font_medium = pygame.font.Font(None, 72)
+        font_huge = get_font(180)
+        font_large = get_font(96)
+        font_medium = get_font(72)
         
         # Título principal con efecto
         title = font_huge.render("💀 GAME OVER 💀", True, (255, 100, 100))
@@ -1851,10 +1976,10 @@ class Nivel2:
         overlay.fill((255, 215, 0, 40))  # Dorado translúcido
         self.screen.blit(overlay, (0, 0))
         
-        font_huge = pygame.font.Font(None, 180)
-        font_large = pygame.font.Font(None, 96)
-        font_medium = pygame.font.Font(None, 72)
-        font_small = pygame.font.Font(None, 48)
+        font_huge = get_font(180)
+        font_large = get_font(96)
+        font_medium = get_font(72)
+        font_small = get_font(48)
         
         # Título principal épico
         title = font_huge.render("🏆 ¡VICTORIA ÉPICA! 🏆", True, (255, 215, 0))
@@ -1932,9 +2057,9 @@ class Nivel2:
         overlay.fill((0, 0, 0, 150))
         self.screen.blit(overlay, (0, 0))
         
-        font_huge = pygame.font.Font(None, 150)
-        font_large = pygame.font.Font(None, 84)
-        font_medium = pygame.font.Font(None, 72)
+        font_huge = get_font(150)
+        font_large = get_font(84)
+        font_medium = get_font(72)
         
         # Título del menú
         title = font_huge.render("⏸️ JUEGO PAUSADO", True, (255, 255, 255))
@@ -1986,6 +2111,11 @@ class Nivel2:
             self.draw()
             self.clock.tick(self.fps)
         
+        self.collision_manager.close()
+        if self.dirty_renderer:
+            self.dirty_renderer.report()
+        get_text_cache().report()
+        get_effect_cache().report()
         print("👋 Saliendo del Nivel 2...")
 
 # Solo ejecutar si se llama directamente
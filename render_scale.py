@@ -0,0 +1,254 @@
+#!/usr/bin/env python3
+"""
+RENDER SCALE - La Tierra de las Manzanas
+Resolución interna de dibujo configurable (RENDER_SCALE = 0.5, 0.75, 1.0):
+- open_display() abre la ventana a la resolución interna con pygame.SCALED:
+  SDL la lleva a pantalla completa con un único escalado en la GPU (sin
+  volcar un frame de resolución completa en software) y entrega el mouse
+  en coordenadas internas
+- La intro ya adapta su diseño al tamaño de la pantalla: dibuja directo en
+  la ventana interna
+- Los niveles trabajan en coordenadas lógicas (1920x1080): ScaledCanvas
+  recibe blit/fill en esas coordenadas y dibuja en la ventana interna, y
+  canvas_draw es pygame.draw para el lienzo (y para la escena de
+  dirty_rects, donde anota cada rectángulo dibujado). Cada sprite, bloque
+  del fondo, texto o efecto se escala una sola vez y se reutiliza mientras
+  exista
+- to_logical() lleva las posiciones del mouse a coordenadas lógicas
+Con RENDER_SCALE = 1.0 no hay lienzo: se dibuja en la pantalla como siempre.
+Si SDL no puede abrir la ventana SCALED, se dibuja en una superficie
+interna y present() la escala a la ventana con transform.scale/smoothscale.
+"""
+
+import math
+import os
+import types
+import weakref
+import pygame
+from typing import Tuple
+from config import *
+from dirty_rects import SceneSurface
+
+# pygame.draw: tipo de cada argumento (posicional después de superficie y color, o por nombre)
+DRAW_SPECS = {
+    "rect": ("rect", "length", "length", "length", "length", "length", "length"),
+    "circle": ("point", "length", "length"),
+    "ellipse": ("rect", "length"),
+    "line": ("point", "point", "length"),
+    "lines": (None, "points", "length"),
+    "polygon": ("points", "length"),
+    "arc": ("rect", None, None, "length"),
+    "aaline": ("point", "point"),
+    "aalines": (None, "points"),
+}
+DRAW_KEYWORDS = {
+    "rect": "rect", "center": "point", "start_pos": "point", "end_pos": "point", "points": "points",
+    "radius": "length", "width": "length", "border_radius": "length",
+    "border_top_left_radius": "length", "border_top_right_radius": "length",
+    "border_bottom_left_radius": "length", "border_bottom_right_radius": "length",
+}
+
+# Estado de la ventana abierta por open_display: tamaño lógico, ventana a la
+# que present() escala el frame (solo sin SCALED) y escala del mouse
+_logical_size = None
+_window = None
+_smooth = False
+_mouse_scale = 1.0
+
+
+def internal_size(size: Tuple[int, int], scale: float = RENDER_SCALE) -> Tuple[int, int]:
+    """Tamaño de dibujo para un tamaño lógico"""
+    return max(1, round(size[0] * scale)), max(1, round(size[1] * scale))
+
+
+def open_display(size: Tuple[int, int], flags: int = 0, scale: float = RENDER_SCALE,
+                 smooth: bool = RENDER_SCALE_SMOOTH) -> pygame.Surface:
+    """
+    Abre la ventana del juego para dibujar a la resolución interna.
+
+    Args:
+        size: Tamaño lógico de la pantalla
+        flags: Flags de pygame.display.set_mode (p. ej. FULLSCREEN)
+        scale: Fracción de la resolución lógica con la que se dibuja
+        smooth: Escalado lineal en lugar de vecino más cercano
+
+    Returns:
+        Superficie de tamaño interno donde se dibuja (la ventana misma con
+        SCALED, o la ventana normal con 1.0)
+    """
+    global _logical_size, _window, _smooth, _mouse_scale
+    _window = None
+    _smooth = smooth
+    _mouse_scale = 1.0
+    if scale >= 1.0:
+        display = pygame.display.set_mode(size, flags)
+        _logical_size = display.get_size()
+        return display
+
+    if smooth:
+        # pygame pide "nearest" para SCALED con prioridad por defecto: la variable de entorno manda
+        os.environ.setdefault("SDL_RENDER_SCALE_QUALITY", "linear")
+    size_internal = internal_size(size, scale)
+    try:
+        display = pygame.display.set_mode(size_internal, flags | pygame.SCALED)
+        _logical_size = tuple(size)
+        _mouse_scale = scale
+        print(f"🔍 Resolución interna {size_internal[0]}x{size_internal[1]} (escala {scale}), escalada por SDL")
+        return display
+    except pygame.error as e:
+        print(f"⚠️ Sin ventana SCALED ({e}): se escala el frame en software")
+
+    _window = pygame.display.set_mode(size, flags)
+    _logical_size = _window.get_size()
+    return pygame.Surface(internal_size(_logical_size, scale), 0, _window)
+
+
+def to_logical(pos) -> Tuple[int, int]:
+    """Posición del mouse (en la ventana) -> coordenadas lógicas del juego"""
+    if _mouse_scale == 1.0:
+        return pos[0], pos[1]
+    return int(pos[0] / _mouse_scale), int(pos[1] / _mouse_scale)
+
+
+class ScaledCanvas:
+    """Lienzo de resolución interna que recibe coordenadas lógicas (no es una Surface)"""
+
+    def __init__(self, surface: pygame.Surface, logical_size: Tuple[int, int]):
+        """
+        Args:
+            surface: Superficie real donde se dibuja (la ventana interna)
+            logical_size: Tamaño de pantalla con el que trabaja el juego
+        """
+        self.surface = surface
+        self.logical_size = (int(logical_size[0]), int(logical_size[1]))
+        self.internal_size = surface.get_size()
+        self.scale = self.internal_size[0] / self.logical_size[0]
+        # Fuente -> (estado al escalar, versión escalada); se libera junto con la fuente
+        self._scaled = weakref.WeakKeyDictionary()
+
+    # --- Tamaño lógico (el que ve el juego) ---
+
+    def get_size(self) -> Tuple[int, int]:
+        return self.logical_size
+
+    def get_width(self) -> int:
+        return self.logical_size[0]
+
+    def get_height(self) -> int:
+        return self.logical_size[1]
+
+    def get_rect(self, **kwargs) -> pygame.Rect:
+        rect = pygame.Rect((0, 0), self.logical_size)
+        for name, value in kwargs.items():
+            setattr(rect, name, value)
+        return rect
+
+    # --- Conversión de coordenadas ---
+
+    def to_internal_rect(self, rect) -> pygame.Rect:
+        """Rectángulo lógico -> interno (cubriendo todos los píxeles que toca)"""
+        rect = pygame.Rect(rect)
+        scale = self.scale
+        left, top = math.floor(rect.x * scale), math.floor(rect.y * scale)
+        return pygame.Rect(left, top, math.ceil(rect.right * scale) - left, math.ceil(rect.bottom * scale) - top)
+
+    def to_logical_rect(self, rect: pygame.Rect) -> pygame.Rect:
+        """Rectángulo interno -> lógico"""
+        scale = self.scale
+        left, top = math.floor(rect.x / scale), math.floor(rect.y / scale)
+        return pygame.Rect(left, top, math.ceil(rect.right / scale) - left, math.ceil(rect.bottom / scale) - top)
+
+    def scaled_source(self, source: pygame.Surface) -> pygame.Surface:
+        """Versión escalada de una superficie (se escala una vez mientras no cambie su tamaño, alfa o colorkey)"""
+        state = (source.get_size(), source.get_alpha(), source.get_colorkey())
+        entry = self._scaled.get(source)
+        if entry is not None and entry[0] == state:
+            return entry[1]
+        width, height = state[0]
+        scaled = pygame.transform.scale(source, (max(1, round(width * self.scale)),
+                                                 max(1, round(height * self.scale))))
+        self._scaled[source] = (state, scaled)
+        return scaled
+
+    def forget(self, source: pygame.Surface) -> None:
+        """Descarta la versión escalada de una superficie que se modificó"""
+        self._scaled.pop(source, None)
+
+    # --- Dibujo ---
+
+    def blit(self, source, dest, area=None, special_flags=0):
+        scale = self.scale
+        scaled = self.scaled_source(source)
+        if area is not None:
+            area = self.to_internal_rect(area).clip(scaled.get_rect())
+        rect = self.surface.blit(scaled, (math.floor(dest[0] * scale), math.floor(dest[1] * scale)),
+                                 area, special_flags)
+        return self.to_logical_rect(rect)
+
+    def blits(self, blit_sequence, doreturn=1):
+        rects = [self.blit(*item) for item in blit_sequence]
+        return rects if doreturn else None
+
+    def fill(self, color, rect=None, special_flags=0):
+        if rect is not None:
+            rect = self.to_internal_rect(rect)
+        return self.to_logical_rect(self.surface.fill(color, rect, special_flags))
+
+    def _scale_argument(self, kind, value):
+        """Escala un argumento de pygame.draw según su tipo"""
+        scale = self.scale
+        if kind == "rect":
+            return self.to_internal_rect(value)
+        if kind == "point":
+            return (math.floor(value[0] * scale), math.floor(value[1] * scale))
+        if kind == "points":
+            return [(math.floor(x * scale), math.floor(y * scale)) for x, y in value]
+        if kind == "length" and value > 0:
+            return max(1, round(value * scale))
+        return value
+
+    def draw(self, function, spec, color, args, kwargs) -> pygame.Rect:
+        """Llama a una función de pygame.draw con los argumentos llevados a la resolución interna"""
+        args = [self._scale_argument(spec[i] if i < len(spec) else None, value) for i, value in enumerate(args)]
+        kwargs = {key: self._scale_argument(DRAW_KEYWORDS.get(key), value) for key, value in kwargs.items()}
+        return self.to_logical_rect(function(self.surface, color, *args, **kwargs))
+
+
+def _canvas_draw_function(name: str, spec: tuple):
+    """Versión de pygame.draw.<name> que acepta también un ScaledCanvas y anota en la escena"""
+    original = getattr(pygame.draw, name)
+
+    def draw(surface, color, *args, **kwargs):
+        if type(surface) is ScaledCanvas:
+            return surface.draw(original, spec, color, args, kwargs)
+        rect = original(surface, color, *args, **kwargs)
+        if type(surface) is SceneSurface:
+            # Rectángulos sucios: lo dibujado se restaura y se envía como un blit
+            surface.record(rect)
+        return rect
+
+    draw.__name__ = name
+    draw.__doc__ = f"pygame.draw.{name} sobre una superficie o un ScaledCanvas (coordenadas lógicas)"
+    return draw
+
+
+# canvas_draw.rect(screen, ...), canvas_draw.circle(screen, ...): para dibujar en la pantalla de un nivel
+canvas_draw = types.SimpleNamespace(**{name: _canvas_draw_function(name, spec) for name, spec in DRAW_SPECS.items()})
+
+
+def create_canvas(display: pygame.Surface):
+    """Pantalla en coordenadas lógicas para lo que abrió open_display: la ventana misma con 1.0, o un lienzo"""
+    if _logical_size is None or display.get_size() == _logical_size:
+        return display
+    return ScaledCanvas(display, _logical_size)
+
+
+def present(screen) -> None:
+    """Muestra el frame dibujado en screen (la ventana SCALED lo escala; si no, se escala aquí)"""
+    if _window is not None:
+        surface = screen.surface if type(screen) is ScaledCanvas else screen
+        if _smooth:
+            pygame.transform.smoothscale(surface, _window.get_size(), _window)
+        else:
+            pygame.transform.scale(surface, _window.get_size(), _window)
+    pygame.display.flip()
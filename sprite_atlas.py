@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+SPRITE ATLAS - La Tierra de las Manzanas
+Empaqueta los frames de un personaje (movimiento, ataques) o de un enemigo
+en una o pocas superficies grandes:
+- Empaquetado por estantes, páginas de ATLAS_PAGE_SIZE como máximo
+- Tabla de rectángulos (grupo, dirección, índice) -> (página, Rect) para
+  dibujar con blit(página, destino, rect)
+- Los frames se sirven como subsuperficies, así el código de dibujo no cambia
+- Un mismo conjunto de frames (por identidad) comparte un único atlas:
+  todos los gusanos usan el mismo y Nivel 2 reutiliza el de Nivel 1
+- Las animaciones diferidas que aún no se cargaron quedan fuera del atlas
+"""
+
+import pygame
+from typing import Dict, List, Optional, Tuple
+from config import *
+from lazy_animations import is_ready
+
+AnimationSet = Dict[str, List[pygame.Surface]]
+
+
+def layout_frames(sizes: List[Tuple[int, int]], page_size: int = ATLAS_PAGE_SIZE,
+                  padding: int = ATLAS_PADDING) -> Tuple[List[Tuple[int, int, int]], List[Tuple[int, int]]]:
+    """
+    Ubica los frames en estantes, del más alto al más bajo.
+
+    Returns:
+        (página, x, y) de cada frame y el tamaño usado de cada página
+    """
+    order = sorted(range(len(sizes)), key=lambda i: (-sizes[i][1], -sizes[i][0]))
+    positions: List[Tuple[int, int, int]] = [(0, 0, 0)] * len(sizes)
+    page_sizes: List[Tuple[int, int]] = [(0, 0)]
+    shelf_x = shelf_y = shelf_height = 0
+    for i in order:
+        width, height = sizes[i]
+        if shelf_x and shelf_x + width > page_size:
+            # Estante lleno: abrir uno nuevo debajo
+            shelf_y += shelf_height + padding
+            shelf_x = shelf_height = 0
+        if shelf_y and shelf_y + height > page_size:
+            # Página llena: abrir una nueva
+            page_sizes.append((0, 0))
+            shelf_x = shelf_y = shelf_height = 0
+        page = len(page_sizes) - 1
+        positions[i] = (page, shelf_x, shelf_y)
+        used_width, used_height = page_sizes[page]
+        page_sizes[page] = (max(used_width, shelf_x + width), max(used_height, shelf_y + height))
+        shelf_x += width + padding
+        shelf_height = max(shelf_height, height)
+    return positions, page_sizes
+
+
+class SpriteAtlas:
+    """Páginas con los frames empaquetados y su tabla de rectángulos"""
+
+    def __init__(self, name: str, page_size: int = ATLAS_PAGE_SIZE, padding: int = ATLAS_PADDING):
+        """
+        Crea un atlas vacío.
+
+        Args:
+            name: Nombre para los mensajes (personaje o enemigo)
+            page_size: Ancho y alto máximo de cada página
+            padding: Píxeles libres entre frames (evita que se mezclen al escalar)
+        """
+        self.name = name
+        self.page_size = page_size
+        self.padding = padding
+        self.pages: List[pygame.Surface] = []
+        self.rects: Dict[Tuple[str, str, int], Tuple[int, pygame.Rect]] = {}
+        self.sources: List[pygame.Surface] = []  # Mantiene vivos los frames de origen
+        self._packed: Dict[int, Tuple[int, pygame.Rect, pygame.Surface]] = {}
+
+    def pack(self, frames: List[pygame.Surface]) -> None:
+        """Copia los frames (sin repetir) en las páginas del atlas"""
+        unique: Dict[int, pygame.Surface] = {}
+        for frame in frames:
+            unique.setdefault(id(frame), frame)
+        self.sources = list(unique.values())
+
+        positions, page_sizes = layout_frames([frame.get_size() for frame in self.sources],
+                                              self.page_size, self.padding)
+        self.pages = []
+        for width, height in page_sizes:
+            page = pygame.Surface((max(1, width), max(1, height)), pygame.SRCALPHA)
+            if pygame.display.get_surface() is not None:
+                page = page.convert_alpha()
+            page.fill((0, 0, 0, 0))
+            self.pages.append(page)
+
+        self._packed.clear()
+        for frame, (page_index, x, y) in zip(self.sources, positions):
+            # BLEND_RGBA_MAX sobre la página vacía copia los píxeles tal cual (sin mezclar el alfa)
+            self.pages[page_index].blit(frame, (x, y), special_flags=pygame.BLEND_RGBA_MAX)
+            rect = pygame.Rect(x, y, *frame.get_size())
+            subsurface = self.pages[page_index].subsurface(rect)
+            self._packed[id(frame)] = (page_index, rect, subsurface)
+            # Listas compartidas entre direcciones pueden llegar ya empaquetadas
+            self._packed[id(subsurface)] = (page_index, rect, subsurface)
+
+    def apply(self, groups: Dict[str, AnimationSet]) -> None:
+        """
+        Reemplaza cada frame por su subsuperficie del atlas y completa la tabla de rectángulos.
+
+        Args:
+            groups: {grupo: {dirección: [frames]}}; las listas se modifican en el lugar
+        """
+        for group, animations in groups.items():
+            for direction, frames in animations.items():
+                if not is_ready(frames):
+                    continue
+                for index, frame in enumerate(frames):
+                    packed = self._packed.get(id(frame))
+                    if packed is None:
+                        continue  # Frame agregado después de empaquetar: se deja como está
+                    page_index, rect, subsurface = packed
+                    self.rects[(group, direction, index)] = (page_index, rect)
+                    frames[index] = subsurface
+
+    def blit_frame(self, screen: pygame.Surface, key: Tuple[str, str, int], position: Tuple[int, int]) -> None:
+        """Dibuja un frame directamente desde su página (sin pasar por la subsuperficie)"""
+        page_index, rect = self.rects[key]
+        screen.blit(self.pages[page_index], position, rect)
+
+    def describe(self) -> str:
+        """Resumen para la consola"""
+        sizes = ", ".join(f"{page.get_width()}x{page.get_height()}" for page in self.pages)
+        return f"🧩 Atlas {self.name}: {len(self.sources)} frames → {len(self.pages)} página(s) ({sizes})"
+
+
+# Atlas ya construidos, por nombre e identidad de los frames de origen
+_atlases: Dict[Tuple, SpriteAtlas] = {}
+
+
+def pack_animations(name: str, groups: Dict[str, AnimationSet]) -> Optional[SpriteAtlas]:
+    """
+    Empaqueta varios juegos de animaciones en un atlas (o reutiliza uno igual).
+
+    Args:
+        name: Nombre del personaje o enemigo
+        groups: {grupo: {dirección: [frames]}}; las listas se modifican en el lugar
+
+    Returns:
+        El atlas usado, o None si el atlas está desactivado o falló
+    """
+    if not SPRITE_ATLAS:
+        return None
+    frames = [frame for animations in groups.values() for frame_list in animations.values()
+              if is_ready(frame_list) for frame in frame_list if frame is not None]
+    if not frames:
+        return None
+
+    key = (name, tuple(id(frame) for frame in frames))
+    atlas = _atlases.get(key)
+    try:
+        if atlas is None:
+            atlas = SpriteAtlas(name)
+            atlas.pack(frames)
+            _atlases[key] = atlas
+            print(atlas.describe())
+        atlas.apply(groups)
+    except (pygame.error, ValueError) as e:
+        print(f"⚠️ No se pudo crear el atlas de {name}: {e}")
+        return None
+    return atlas
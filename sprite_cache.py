@@ -0,0 +1,388 @@
+#!/usr/bin/env python3
+"""
+SPRITE CACHE - La Tierra de las Manzanas
+Caché de frames decodificados compartida por todo el proceso:
+- Cada GIF se decodifica, recorta, escala y voltea una sola vez por
+  combinación de parámetros (ruta, escala, tamaño, volteo, recorte, colorkey)
+- Todos los gusanos comparten las mismas superficies y Nivel 2 reutiliza
+  los frames que ya cargó Nivel 1
+- Contadores de aciertos/fallos y bytes ocupados
+- Si hay un paquete de assets compilado (asset_bundle), los frames salen de él
+- DiskFrameCache: los frames ya procesados se guardan en disco (RGBA crudo)
+  y en los arranques siguientes se cargan directamente, sin PIL; una entrada
+  se invalida si cambia el archivo de origen o los parámetros de procesamiento
+- La decodificación se divide en dos etapas: decode_gif_buffers (PIL y
+  recorte sobre búferes crudos, apta para hilos) y surfaces_from_buffers
+  (creación de superficies, siempre en el hilo principal)
+Las superficies compartidas no se modifican: quien necesite un efecto
+(daño, transparencia) trabaja sobre una copia.
+"""
+
+import hashlib
+import os
+import struct
+import pygame
+from PIL import Image
+from typing import Dict, List, NamedTuple, Optional, Tuple
+from config import *
+from asset_bundle import get_asset_bundle
+from sprite_keying import KeyRule, key_rgba_bytes, key_surface
+
+
+FRAME_CACHE_MAGIC = b"MZSF"
+FRAME_CACHE_VERSION = 1  # Subir si cambia el procesamiento de frames
+FRAME_CACHE_HEADER = struct.Struct("<4sHqQ20sH")  # magic, versión, mtime, tamaño y sha1 del origen, frames
+FRAME_CACHE_FRAME = struct.Struct("<HH")  # ancho, alto (seguido de ancho * alto * 4 bytes RGBA)
+
+# Frame decodificado en crudo: (ancho, alto), bytes RGBA, ya recortado
+FrameBuffer = Tuple[Tuple[int, int], bytes, bool]
+
+
+class FrameRequest(NamedTuple):
+    """Animación pedida a load_gif_frames, con los mismos parámetros"""
+    path: str
+    rule: Optional[KeyRule] = None
+    scale: float = 1.0
+    size: Optional[Tuple[int, int]] = None
+    flip: bool = False
+    colorkey: Optional[Tuple[int, int, int]] = None
+
+    @property
+    def key(self) -> Tuple:
+        """Clave de la caché de sprites"""
+        return tuple(self)
+
+    @property
+    def decode_key(self) -> Tuple:
+        """Parámetros que afectan la decodificación (escala, volteo y colorkey son posteriores)"""
+        return (self.path, self.rule, self.size)
+
+
+def surface_bytes(surface: pygame.Surface) -> int:
+    """Bytes de píxeles que ocupa una superficie"""
+    if surface.get_parent() is not None:
+        # Subsuperficie (paquete de assets, atlas): solo su región, no la fila completa del padre
+        return surface.get_width() * surface.get_height() * surface.get_bytesize()
+    return surface.get_pitch() * surface.get_height()
+
+
+class SpriteCache:
+    """Frames ya procesados, indexados por archivo y parámetros de procesamiento"""
+
+    def __init__(self):
+        self._frames: Dict[Tuple, List[pygame.Surface]] = {}
+        self.hits = 0
+        self.misses = 0
+        self.bytes_held = 0
+
+    def has(self, key: Tuple) -> bool:
+        """Indica si la clave ya está en caché (sin contar acierto ni fallo)"""
+        return key in self._frames
+
+    def get(self, key: Tuple) -> Optional[List[pygame.Surface]]:
+        """Devuelve una copia de la lista de frames o None si no está en caché"""
+        frames = self._frames.get(key)
+        if frames is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return list(frames)
+
+    def put(self, key: Tuple, frames: List[pygame.Surface]) -> None:
+        """Guarda los frames procesados de una clave"""
+        previous = self._frames.get(key)
+        if previous is not None:
+            self.bytes_held -= sum(surface_bytes(frame) for frame in previous)
+        self._frames[key] = list(frames)
+        self.bytes_held += sum(surface_bytes(frame) for frame in frames)
+
+    def clear(self) -> None:
+        """Vacía la caché (los contadores se conservan)"""
+        self._frames.clear()
+        self.bytes_held = 0
+
+    def stats(self) -> Dict[str, int]:
+        """Estadísticas de uso de la caché"""
+        return {
+            "entries": len(self._frames),
+            "frames": sum(len(frames) for frames in self._frames.values()),
+            "hits": self.hits,
+            "misses": self.misses,
+            "bytes": self.bytes_held,
+        }
+
+    def report(self) -> None:
+        """Muestra las estadísticas en consola"""
+        stats = self.stats()
+        print(f"🗃️ Caché de sprites: {stats['entries']} animaciones, {stats['frames']} frames, "
+              f"{stats['bytes'] / (1024 * 1024):.1f} MB | aciertos {stats['hits']}, fallos {stats['misses']}")
+        disk_cache = get_disk_frame_cache()
+        if disk_cache:
+            print(f"💾 Caché de sprites en disco: aciertos {disk_cache.hits}, fallos {disk_cache.misses}, "
+                  f"escrituras {disk_cache.writes}")
+
+
+class DiskFrameCache:
+    """Frames procesados guardados en disco entre ejecuciones"""
+
+    def __init__(self, cache_dir: str = SPRITE_CACHE_DIR):
+        self.cache_dir = cache_dir
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+
+    def _entry_path(self, key: Tuple) -> str:
+        """Archivo de una combinación de origen + parámetros"""
+        digest = hashlib.sha1(repr((FRAME_CACHE_VERSION, key)).encode("utf-8")).hexdigest()
+        return os.path.join(self.cache_dir, f"{digest}.frames")
+
+    @staticmethod
+    def _source_digest(source_path: str) -> bytes:
+        """Hash del contenido del archivo de origen"""
+        with open(source_path, "rb") as f:
+            return hashlib.sha1(f.read()).digest()
+
+    def load(self, source_path: str, key: Tuple,
+             colorkey: Optional[Tuple[int, int, int]] = None) -> Optional[List[pygame.Surface]]:
+        """
+        Carga los frames de una entrada si sigue siendo válida.
+
+        Returns:
+            Lista de superficies o None si no hay entrada válida
+        """
+        entry_path = self._entry_path(key)
+        try:
+            with open(entry_path, "rb") as f:
+                data = f.read()
+            magic, version, mtime_ns, size, digest, count = FRAME_CACHE_HEADER.unpack_from(data, 0)
+            if magic != FRAME_CACHE_MAGIC or version != FRAME_CACHE_VERSION:
+                raise ValueError("entrada de otra versión")
+
+            # Validación rápida por fecha y tamaño; si no coinciden se compara el contenido
+            stat = os.stat(source_path)
+            touched = (stat.st_mtime_ns, stat.st_size) != (mtime_ns, size)
+            if touched and self._source_digest(source_path) != digest:
+                self.misses += 1
+                return None
+
+            frames = []
+            offset = FRAME_CACHE_HEADER.size
+            for _ in range(count):
+                width, height = FRAME_CACHE_FRAME.unpack_from(data, offset)
+                offset += FRAME_CACHE_FRAME.size
+                length = width * height * 4
+                if offset + length > len(data):
+                    raise ValueError("entrada incompleta")
+                surface = pygame.image.frombuffer(data[offset:offset + length], (width, height), "RGBA").convert_alpha()
+                if colorkey:
+                    surface.set_colorkey(colorkey)
+                frames.append(surface)
+                offset += length
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+        except (OSError, ValueError, struct.error) as e:
+            print(f"⚠️ Entrada de caché de sprites inválida, se regenera: {e}")
+            self.misses += 1
+            return None
+
+        if touched:
+            # Mismo contenido con otra fecha (checkout, copia): se anota para no volver a hashear
+            try:
+                self._write_entry(entry_path, [FRAME_CACHE_HEADER.pack(
+                    magic, version, stat.st_mtime_ns, stat.st_size, digest, count),
+                    data[FRAME_CACHE_HEADER.size:]])
+            except OSError as e:
+                print(f"⚠️ No se pudo actualizar la fecha de la caché de sprites: {e}")
+
+        self.hits += 1
+        return frames
+
+    def store(self, source_path: str, key: Tuple, frames: List[pygame.Surface]) -> bool:
+        """Guarda los frames procesados de forma atómica"""
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            stat = os.stat(source_path)
+            chunks = [FRAME_CACHE_HEADER.pack(FRAME_CACHE_MAGIC, FRAME_CACHE_VERSION, stat.st_mtime_ns,
+                                              stat.st_size, self._source_digest(source_path), len(frames))]
+            for frame in frames:
+                # tobytes reemplaza el alfa por píxel si hay colorkey: se lee sin él
+                # (el colorkey forma parte de la clave y se vuelve a aplicar al cargar)
+                colorkey = frame.get_colorkey()
+                frame.set_colorkey(None)
+                chunks.append(FRAME_CACHE_FRAME.pack(*frame.get_size()))
+                chunks.append(pygame.image.tobytes(frame, "RGBA"))
+                frame.set_colorkey(colorkey)
+
+            self._write_entry(self._entry_path(key), chunks)
+            self.writes += 1
+            return True
+        except Exception as e:
+            print(f"⚠️ No se pudo guardar la caché de sprites: {e}")
+            return False
+
+    @staticmethod
+    def _write_entry(entry_path: str, chunks: List[bytes]) -> None:
+        """Escribe una entrada de forma atómica (archivo temporal + replace)"""
+        temp_path = entry_path + ".tmp"
+        with open(temp_path, "wb") as f:
+            f.write(b"".join(chunks))
+        os.replace(temp_path, entry_path)
+
+    def clear(self) -> None:
+        """Borra todas las entradas guardadas"""
+        if not os.path.isdir(self.cache_dir):
+            return
+        for name in os.listdir(self.cache_dir):
+            if name.endswith(".frames"):
+                os.remove(os.path.join(self.cache_dir, name))
+
+
+# Instancia global de la caché de sprites
+_sprite_cache = None
+_disk_frame_cache = None
+
+def get_sprite_cache() -> SpriteCache:
+    """Obtiene la instancia global de la caché de sprites"""
+    global _sprite_cache
+    if _sprite_cache is None:
+        _sprite_cache = SpriteCache()
+    return _sprite_cache
+
+def get_disk_frame_cache() -> Optional[DiskFrameCache]:
+    """Obtiene la instancia global de la caché en disco (None si está desactivada)"""
+    global _disk_frame_cache
+    if not SPRITE_DISK_CACHE:
+        return None
+    if _disk_frame_cache is None:
+        _disk_frame_cache = DiskFrameCache()
+    return _disk_frame_cache
+
+
+def decode_gif_buffers(path: str, rule: Optional[KeyRule] = None,
+                       size: Optional[Tuple[int, int]] = None) -> List[FrameBuffer]:
+    """
+    Decodifica todos los frames de un GIF a búferes RGBA crudos.
+
+    No crea superficies de Pygame, así que puede ejecutarse en hilos de
+    carga (PIL y NumPy liberan el GIL en el trabajo pesado).
+
+    Args:
+        path: Ruta del GIF
+        rule: Regla de recorte de fondo (None para no recortar)
+        size: Tamaño al que se redimensiona cada frame con LANCZOS antes del recorte
+
+    Returns:
+        Lista de (tamaño, bytes RGBA, ya recortado)
+    """
+    buffers = []
+    with Image.open(path) as gif:
+        for frame_num in range(getattr(gif, "n_frames", 1)):
+            gif.seek(frame_num)
+            frame = gif.copy().convert("RGBA")
+            if size:
+                frame = frame.resize(size, Image.LANCZOS)
+            data = frame.tobytes()
+            keyed = key_rgba_bytes(data, frame.size, rule) if rule else None
+            buffers.append((frame.size, keyed if keyed is not None else data, keyed is not None))
+    return buffers
+
+
+def surfaces_from_buffers(buffers: List[FrameBuffer], rule: Optional[KeyRule] = None, scale: float = 1.0,
+                          flip: bool = False,
+                          colorkey: Optional[Tuple[int, int, int]] = None) -> List[pygame.Surface]:
+    """
+    Crea las superficies de los búferes decodificados (solo en el hilo principal).
+
+    Args:
+        buffers: Resultado de decode_gif_buffers
+        rule: Regla de recorte (se aplica aquí si el búfer no venía recortado)
+        scale: Factor de escala aplicado tras el recorte
+        flip: Voltear horizontalmente
+        colorkey: Color clave adicional
+
+    Returns:
+        Lista de superficies con alfa por píxel
+    """
+    frames = []
+    for size, data, keyed in buffers:
+        surface = pygame.image.fromstring(data, size, "RGBA").convert_alpha()
+        if rule and not keyed:
+            key_surface(surface, rule)
+        if colorkey:
+            surface.set_colorkey(colorkey)
+        if scale != 1.0:
+            width, height = surface.get_size()
+            surface = pygame.transform.scale(surface, (int(width * scale), int(height * scale)))
+        if flip:
+            surface = pygame.transform.flip(surface, True, False)
+        frames.append(surface)
+    return frames
+
+
+def decode_gif_frames(path: str, rule: Optional[KeyRule] = None, scale: float = 1.0,
+                      size: Optional[Tuple[int, int]] = None, flip: bool = False,
+                      colorkey: Optional[Tuple[int, int, int]] = None) -> List[pygame.Surface]:
+    """
+    Decodifica y procesa todos los frames de un GIF (sin caché).
+
+    Args:
+        path: Ruta del GIF
+        rule: Regla de recorte de fondo (None para no recortar)
+        scale: Factor de escala aplicado tras el recorte
+        size: Tamaño al que se redimensiona cada frame con LANCZOS antes del recorte
+        flip: Voltear horizontalmente
+        colorkey: Color clave adicional
+
+    Returns:
+        Lista de superficies con alfa por píxel
+    """
+    return surfaces_from_buffers(decode_gif_buffers(path, rule, size), rule, scale, flip, colorkey)
+
+
+def load_gif_frames(path: str, rule: Optional[KeyRule] = None, scale: float = 1.0,
+                    size: Optional[Tuple[int, int]] = None, flip: bool = False,
+                    colorkey: Optional[Tuple[int, int, int]] = None) -> List[pygame.Surface]:
+    """
+    Obtiene los frames procesados de un GIF, decodificándolo solo la primera vez.
+
+    Busca primero en memoria, después en la caché en disco y solo si ambas
+    fallan procesa el GIF completo. Los argumentos son los de
+    decode_gif_frames. Los errores de lectura se propagan para que cada
+    cargador use su frame de respaldo.
+    """
+    request = FrameRequest(path, rule, scale, size, flip, colorkey)
+    frames = cached_gif_frames(request)
+    if frames is None:
+        frames = decode_gif_frames(*request)
+        store_gif_frames(request, frames)
+    return frames
+
+
+def cached_gif_frames(request: FrameRequest) -> Optional[List[pygame.Surface]]:
+    """
+    Busca los frames de una animación en memoria, en el paquete de assets
+    compilado y después en la caché en disco, sin decodificar.
+
+    Returns:
+        Copia de la lista de frames o None si hay que decodificar el GIF
+    """
+    cache = get_sprite_cache()
+    frames = cache.get(request.key)
+    if frames is None:
+        bundle = get_asset_bundle()
+        frames = bundle.frames(request.key, request.path) if bundle else None
+        if frames is None:
+            disk_cache = get_disk_frame_cache()
+            frames = disk_cache.load(request.path, request.key, request.colorkey) if disk_cache else None
+        if frames is not None:
+            cache.put(request.key, frames)
+    return frames
+
+
+def store_gif_frames(request: FrameRequest, frames: List[pygame.Surface]) -> None:
+    """Guarda los frames recién decodificados en memoria y en disco"""
+    disk_cache = get_disk_frame_cache()
+    if disk_cache:
+        disk_cache.store(request.path, request.key, frames)
+    get_sprite_cache().put(request.key, frames)
@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+SPRITE KEYING - La Tierra de las Manzanas
+Eliminación de fondos claros de los sprites en una sola etapa compartida:
+- KeyRule: umbrales de cada cargador (blanco estricto, blanco + grises claros)
+- key_surface: aplica la regla a un frame completo de una vez con
+  pygame.surfarray + NumPy (sin recorrer píxel por píxel)
+- key_rgba_bytes: la misma regla sobre un búfer RGBA crudo (para hilos de carga)
+- frame_to_surface: convierte un frame de PIL a superficie de Pygame ya recortada
+Si NumPy no está instalado se usa el recorrido píxel por píxel de siempre.
+"""
+
+import pygame
+from typing import NamedTuple, Optional
+from config import *
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    np = None
+    NUMPY_AVAILABLE = False
+
+
+class KeyRule(NamedTuple):
+    """Regla para decidir qué píxeles son fondo"""
+    white_threshold: int  # Fondo si R, G y B superan este valor
+    gray_tolerance: Optional[int] = None  # Gris claro si los canales difieren menos que esto...
+    gray_min_red: Optional[int] = None  # ...y el rojo supera este valor
+    clear_rgb: bool = False  # Además de la transparencia, poner el color en negro
+
+
+# Personajes (CharacterBase): solo blanco casi puro
+KEY_CHARACTER = KeyRule(white_threshold=250, clear_rgb=True)
+# Ataques de Juan y Adán: blancos y grises claros
+KEY_ATTACK = KeyRule(white_threshold=200, gray_tolerance=30, gray_min_red=180)
+# Chamán (movimiento y ataques): blanco o casi blanco
+KEY_CHAMAN = KeyRule(white_threshold=240)
+
+
+def key_surface(surface: pygame.Surface, rule: KeyRule) -> pygame.Surface:
+    """
+    Vuelve transparentes los píxeles de fondo de un frame (modifica la superficie).
+
+    Args:
+        surface: Superficie con alfa por píxel (convert_alpha o SRCALPHA)
+        rule: Regla de recorte
+
+    Returns:
+        La misma superficie, para encadenar llamadas
+    """
+    if NUMPY_AVAILABLE:
+        _key_surface_numpy(surface, rule)
+    else:
+        _key_surface_pixels(surface, rule)
+    return surface
+
+
+def _key_surface_numpy(surface: pygame.Surface, rule: KeyRule) -> None:
+    """Recorte vectorizado sobre el frame completo"""
+    rgb = pygame.surfarray.pixels3d(surface)
+    alpha = pygame.surfarray.pixels_alpha(surface)
+    try:
+        mask = _background_mask(rgb, rule)
+        alpha[mask] = 0
+        if rule.clear_rgb:
+            rgb[mask] = 0
+    finally:
+        # Las vistas bloquean la superficie hasta que se liberan
+        del rgb, alpha
+
+
+def _background_mask(rgb, rule: KeyRule):
+    """Máscara booleana de los píxeles de fondo (último eje = canales R, G, B)"""
+    r = rgb[..., 0].astype(np.int16)
+    g = rgb[..., 1].astype(np.int16)
+    b = rgb[..., 2].astype(np.int16)
+    threshold = rule.white_threshold
+    mask = (r > threshold) & (g > threshold) & (b > threshold)
+    if rule.gray_tolerance is not None:
+        tolerance = rule.gray_tolerance
+        mask |= ((np.abs(r - g) < tolerance) & (np.abs(r - b) < tolerance) &
+                 (np.abs(g - b) < tolerance) & (r > rule.gray_min_red))
+    return mask
+
+
+def key_rgba_bytes(data: bytes, size, rule: KeyRule) -> Optional[bytes]:
+    """
+    Aplica la regla sobre un búfer RGBA crudo, sin crear superficies.
+
+    No toca Pygame, así que puede ejecutarse en hilos de carga.
+
+    Args:
+        data: Píxeles RGBA (ancho * alto * 4 bytes)
+        size: (ancho, alto)
+        rule: Regla de recorte
+
+    Returns:
+        El búfer recortado, o None si NumPy no está disponible
+        (en ese caso el recorte se hace después con key_surface)
+    """
+    if not NUMPY_AVAILABLE:
+        return None
+    width, height = size
+    pixels = np.frombuffer(data, dtype=np.uint8).reshape(height, width, 4).copy()
+    mask = _background_mask(pixels, rule)
+    pixels[mask, 3] = 0
+    if rule.clear_rgb:
+        pixels[mask, :3] = 0
+    return pixels.tobytes()
+
+
+def _key_surface_pixels(surface: pygame.Surface, rule: KeyRule) -> None:
+    """Recorte píxel por píxel (respaldo sin NumPy)"""
+    threshold = rule.white_threshold
+    tolerance = rule.gray_tolerance
+    width, height = surface.get_size()
+    for x in range(width):
+        for y in range(height):
+            r, g, b, a = surface.get_at((x, y))
+            is_background = r > threshold and g > threshold and b > threshold
+            if not is_background and tolerance is not None:
+                is_background = (abs(r - g) < tolerance and abs(r - b) < tolerance and
+                                 abs(g - b) < tolerance and r > rule.gray_min_red)
+            if is_background:
+                surface.set_at((x, y), (0, 0, 0, 0) if rule.clear_rgb else (r, g, b, 0))
+
+
+def frame_to_surface(frame, rule: KeyRule) -> pygame.Surface:
+    """
+    Convierte un frame RGBA de PIL en una superficie de Pygame sin fondo.
+
+    Args:
+        frame: Imagen de PIL en modo RGBA
+        rule: Regla de recorte
+
+    Returns:
+        Superficie con alfa por píxel
+    """
+    surface = pygame.image.fromstring(frame.tobytes(), frame.size, "RGBA").convert_alpha()
+    return key_surface(surface, rule)
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+SPRITE VARIANTS - La Tierra de las Manzanas
+Variantes de dibujo de un frame (escalado, volteado, semitransparente):
+- Cada combinación (frame, escala, volteo, alfa) se genera una sola vez y se
+  reutiliza, así el dibujo de cada frame es un blit directo
+- Se pueden generar de antemano al cargar (prepare) o en el primer uso (get)
+- Los frames de origen no se modifican (son compartidos por la caché de
+  sprites y los atlas)
+"""
+
+import pygame
+from typing import Dict, Iterable, Optional, Tuple
+from config import *
+
+
+class FrameVariants:
+    """Variantes memorizadas por frame de origen y transformación"""
+
+    def __init__(self):
+        # (id del frame, escala, volteo, alfa) -> (frame de origen, variante)
+        # Se guarda el origen para que su id no se reutilice mientras exista la variante
+        self._variants: Dict[Tuple, Tuple[pygame.Surface, pygame.Surface]] = {}
+        self.hits = 0
+        self.created = 0
+
+    def get(self, frame: pygame.Surface, scale: float = 1.0, flip: bool = False,
+            alpha: Optional[int] = None) -> pygame.Surface:
+        """
+        Obtiene la variante de un frame, creándola solo la primera vez.
+
+        Args:
+            frame: Frame de origen
+            scale: Factor de escala
+            flip: Voltear horizontalmente
+            alpha: Transparencia de toda la superficie (None = sin cambio)
+
+        Returns:
+            La superficie lista para blit (el propio frame si no hay transformación)
+        """
+        if scale == 1.0 and not flip and alpha is None:
+            return frame
+
+        key = (id(frame), scale, flip, alpha)
+        entry = self._variants.get(key)
+        if entry is not None:
+            self.hits += 1
+            return entry[1]
+
+        if alpha is not None:
+            # La variante semitransparente parte de la opaca ya escalada/volteada
+            variant = self.get(frame, scale, flip).copy()
+            variant.set_alpha(alpha)
+        else:
+            variant = frame
+            if scale != 1.0:
+                width, height = frame.get_size()
+                variant = pygame.transform.scale(variant, (int(width * scale), int(height * scale)))
+            if flip:
+                variant = pygame.transform.flip(variant, True, False)
+
+        self._variants[key] = (frame, variant)
+        self.created += 1
+        return variant
+
+    def prepare(self, frames: Iterable[pygame.Surface], scale: float = 1.0, flip: bool = False,
+                alpha: Optional[int] = None) -> None:
+        """Genera de antemano la variante de varios frames (p. ej. al cargar)"""
+        for frame in frames:
+            if frame is not None:
+                self.get(frame, scale, flip, alpha)
+
+    def clear(self) -> None:
+        """Descarta todas las variantes"""
+        self._variants.clear()
+
+    def __len__(self) -> int:
+        return len(self._variants)
+
+
+# Instancia global de las variantes de frames
+_frame_variants = None
+
+def get_frame_variants() -> FrameVariants:
+    """Obtiene la instancia global de variantes de frames"""
+    global _frame_variants
+    if _frame_variants is None:
+        _frame_variants = FrameVariants()
+    return _frame_variants
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+TEXT CACHE - La Tierra de las Manzanas
+Servicio de textos para HUD, menús y editor:
+- Un único pygame.font.Font por tamaño (crear la fuente por defecto pasa por
+  pkg_resources y se hacía en cada frame)
+- Caché LRU de textos ya renderizados por (texto, tamaño, color, antialias,
+  fondo), con tope de TEXT_CACHE_SIZE entradas
+- get_font(size) devuelve una fuente compartida cuyo render() pasa por la
+  caché, así que el código de dibujo solo cambia cómo obtiene la fuente
+- Contadores de aciertos/fallos y porcentaje de aciertos
+Los textos devueltos son compartidos: no se modifican (quien necesite un
+efecto trabaja sobre una copia).
+"""
+
+import pygame
+from collections import OrderedDict
+from typing import Dict
+from config import *
+from sprite_cache import surface_bytes
+
+
+class CachedFont:
+    """Fuente compartida de un tamaño; render() usa la caché de textos"""
+
+    def __init__(self, cache: "TextCache", size: int, font: pygame.font.Font):
+        self.cache = cache
+        self.size_px = size
+        self.font = font
+
+    def render(self, text, antialias, color, background=None) -> pygame.Surface:
+        return self.cache.render(text, self.size_px, color, antialias, background)
+
+    def __getattr__(self, name):
+        # size(), get_linesize(), get_height()... de la fuente real
+        return getattr(self.font, name)
+
+
+class TextCache:
+    """Fuentes por tamaño y textos renderizados con descarte LRU"""
+
+    def __init__(self, max_entries: int = TEXT_CACHE_SIZE):
+        self.max_entries = max_entries
+        self._fonts: Dict[int, CachedFont] = {}
+        self._texts: "OrderedDict[tuple, pygame.Surface]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.bytes_held = 0
+
+    def font(self, size: int) -> CachedFont:
+        """Fuente por defecto de un tamaño (se crea una sola vez)"""
+        font = self._fonts.get(size)
+        if font is None:
+            font = CachedFont(self, size, pygame.font.Font(None, size))
+            self._fonts[size] = font
+        return font
+
+    def render(self, text: str, size: int, color, antialias: bool = True,
+               background=None) -> pygame.Surface:
+        """Texto renderizado (compartido, no modificar)"""
+        key = (text, size, _color_key(color), bool(antialias), _color_key(background))
+        surface = self._texts.get(key)
+        if surface is not None:
+            self.hits += 1
+            self._texts.move_to_end(key)
+            return surface
+
+        self.misses += 1
+        surface = self.font(size).font.render(text, antialias, color, background)
+        self._texts[key] = surface
+        self.bytes_held += surface_bytes(surface)
+        while len(self._texts) > self.max_entries:
+            _, evicted = self._texts.popitem(last=False)
+            self.bytes_held -= surface_bytes(evicted)
+            self.evictions += 1
+        return surface
+
+    @property
+    def hit_rate(self) -> float:
+        """Porcentaje de textos servidos desde la caché"""
+        total = self.hits + self.misses
+        return self.hits * 100.0 / total if total else 0.0
+
+    def clear(self) -> None:
+        """Vacía los textos (las fuentes y los contadores se conservan)"""
+        self._texts.clear()
+        self.bytes_held = 0
+
+    def stats(self) -> Dict[str, int]:
+        """Estadísticas de uso de la caché"""
+        return {
+            "fonts": len(self._fonts),
+            "entries": len(self._texts),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "bytes": self.bytes_held,
+        }
+
+    def report(self) -> None:
+        """Muestra las estadísticas en consola"""
+        stats = self.stats()
+        print(f"🔤 Caché de textos: {stats['fonts']} fuentes, {stats['entries']} textos, "
+              f"{stats['bytes'] / (1024 * 1024):.1f} MB | aciertos {stats['hits']}, fallos {stats['misses']} "
+              f"({self.hit_rate:.1f}%), descartes {stats['evictions']}")
+
+
+def _color_key(color):
+    """Color como clave hashable (tuplas, listas y pygame.Color dan la misma)"""
+    if color is None or isinstance(color, str):
+        return color
+    return tuple(color)
+
+
+# Instancia global de la caché de textos
+_text_cache = None
+
+def get_text_cache() -> TextCache:
+    """Obtiene la instancia global de la caché de textos"""
+    global _text_cache
+    if _text_cache is None:
+        _text_cache = TextCache()
+    return _text_cache
+
+
+def get_font(size: int) -> CachedFont:
+    """Fuente por defecto de un tamaño con render() en caché"""
+    return get_text_cache().font(size)
+
@@ -7,6 +7,9 @@ import pygame
 import math
 from typing import Tuple, List, Optional
 from config import *
+from collision_grid import CollisionIndex
+from render_scale import canvas_draw
+from text_cache import get_font
 
 def load_image(path: str, size: Optional[Tuple[int, int]] = None) -> pygame.Surface:
     """
@@ -150,16 +153,16 @@ def draw_health_bar(surface: pygame.Surface, pos: Tuple[int, int],
     """
     # Barra de fondo (roja)
     bg_rect = pygame.Rect(pos[0], pos[1], width, height)
-    pygame.draw.rect(surface, RED, bg_rect)
+    canvas_draw.rect(surface, RED, bg_rect)
     
     # Barra de salud (verde)
     if current_health > 0:
         health_width = int((current_health / max_health) * width)
         health_rect = pygame.Rect(pos[0], pos[1], health_width, height)
-        pygame.draw.rect(surface, GREEN, health_rect)
+        canvas_draw.rect(surface, GREEN, health_rect)
     
     # Borde
-    pygame.draw.rect(surface, WHITE, bg_rect, 2)
+    canvas_draw.rect(surface, WHITE, bg_rect, 2)
 
 def format_time(milliseconds: int) -> str:
     """
@@ -273,7 +276,7 @@ class CollisionBlock:
             screen.blit(block_surface, (screen_x, screen_y))
             
             # Borde blanco
-            pygame.draw.rect(screen, WHITE, 
+            canvas_draw.rect(screen, WHITE, 
                            (screen_x, screen_y, self.width, self.height), 2)
 
 class CollisionManager:
@@ -290,35 +293,33 @@ class CollisionManager:
         self.mouse_pressed = False
         self.drag_start_x = 0
         self.drag_start_y = 0
+        
+        # Índice de colisiones (hash espacial / mapa de ocupación) según COLLISION_ENGINE
+        self.collision_index = CollisionIndex(self.world_width, self.world_height,
+                                              block_factory=CollisionBlock)
     
     def add_block(self, x, y, width=None, height=None):
         """Añade un bloque de colisión"""
         block = CollisionBlock(x, y, width, height)
         self.blocks.append(block)
+        self.collision_index.insert(block)
         return block
     
     def remove_block_at(self, x, y):
         """Elimina un bloque en la posición especificada"""
-        for block in self.blocks[:]:
-            if block.rect.collidepoint(x, y):
-                self.blocks.remove(block)
-                return True
+        for block in self.collision_index.query_point(x, y):
+            self.blocks.remove(block)
+            self.collision_index.remove(block)
+            return True
         return False
     
     def check_collision(self, rect):
         """Verifica colisión con cualquier bloque"""
-        for block in self.blocks:
-            if rect.colliderect(block.rect):
-                return True
-        return False
+        return self.collision_index.collides(rect)
     
     def get_collision_blocks(self, rect):
         """Obtiene todos los bloques que colisionan con el rectángulo"""
-        colliding_blocks = []
-        for block in self.blocks:
-            if rect.colliderect(block.rect):
-                colliding_blocks.append(block)
-        return colliding_blocks
+        return self.collision_index.query_rect(rect)
     
     def can_move_to(self, character, new_x, new_y):
         """Verifica si un personaje puede moverse a una nueva posición"""
@@ -358,13 +359,13 @@ class CollisionManager:
         grid_y = (y // self.block_size) * self.block_size
         
         # Verificar si ya existe un bloque en esta posición
-        for block in self.blocks:
-            if block.rect.x == grid_x and block.rect.y == grid_y:
-                return  # Ya existe un bloque aquí
+        if self.collision_index.find_block_at(grid_x, grid_y):
+            return  # Ya existe un bloque aquí
         
         # Crear nuevo bloque
         new_block = CollisionBlock(grid_x, grid_y, self.block_size, self.block_size)
         self.blocks.append(new_block)
+        self.collision_index.insert(new_block)
         print(f"✅ Bloque añadido en ({grid_x}, {grid_y})")
     
     def draw_editor_mode(self, screen, camera_x, camera_y):
@@ -372,8 +373,8 @@ class CollisionManager:
         if not self.editor_mode:
             return
         
-        # Dibujar todos los bloques en modo editor
-        for block in self.blocks:
+        # Dibujar todos los bloques en modo editor (fusionados en rectángulos)
+        for block in self.collision_index.merged_blocks:
             screen_x = block.rect.x - camera_x
             screen_y = block.rect.y - camera_y
             
@@ -386,7 +387,7 @@ class CollisionManager:
                 screen.blit(block_surface, (screen_x, screen_y))
                 
                 # Borde del bloque
-                pygame.draw.rect(screen, (255, 0, 0), 
+                canvas_draw.rect(screen, (255, 0, 0), 
                                (screen_x, screen_y, block.rect.width, block.rect.height), 2)
         
         # Dibujar cursor del editor
@@ -394,9 +395,9 @@ class CollisionManager:
         cursor_screen_y = self.editor_cursor_y - camera_y
         
         # Verificar si ya existe un bloque en esta posición
-        block_exists = any(block.rect.x == (self.editor_cursor_x // self.block_size) * self.block_size and 
-                          block.rect.y == (self.editor_cursor_y // self.block_size) * self.block_size 
-                          for block in self.blocks)
+        block_exists = self.collision_index.find_block_at(
+            (self.editor_cursor_x // self.block_size) * self.block_size,
+            (self.editor_cursor_y // self.block_size) * self.block_size) is not None
         
         # Color del cursor
         cursor_color = (255, 100, 100) if block_exists else (100, 255, 100)
@@ -408,11 +409,11 @@ class CollisionManager:
         screen.blit(cursor_surface, (cursor_screen_x, cursor_screen_y))
         
         # Borde del cursor
-        pygame.draw.rect(screen, border_color, 
+        canvas_draw.rect(screen, border_color, 
                         (cursor_screen_x, cursor_screen_y, self.block_size, self.block_size), 3)
         
         # Información del editor
-        font = pygame.font.Font(None, 48)
+        font = get_font(48)
         editor_info = [
             "🛠️ MODO EDITOR DE COLISIONES",
             "F1: Salir del editor | Flechas: Mover cursor",
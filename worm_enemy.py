@@ -1,8 +1,11 @@
 import pygame
 import math
 import random
-from PIL import Image
 import os
+from config import WORM_SCALE
+from render_scale import canvas_draw
+from sprite_atlas import pack_animations
+from sprite_cache import load_gif_frames
 
 class WormEnemy:
     def __init__(self, x, y):
@@ -17,7 +20,7 @@ class WormEnemy:
         self.last_attack_time = 0
         
         # Escalado de tamaño (56% más grande)
-        self.scale_factor = 1.56
+        self.scale_factor = WORM_SCALE
         self.width = int(64 * self.scale_factor)
         self.height = int(64 * self.scale_factor)
         
@@ -45,6 +48,7 @@ class WormEnemy:
         
         # Diccionario para almacenar los frames de animación
         self.animations = {}
+        self.atlas = None
         self.load_worm_animation()
         
         # Movimiento
@@ -68,39 +72,14 @@ class WormEnemy:
         try:
             print(f"📥 Cargando GIF del gusano desde archivo local...")
             
-            # Descargar el GIF desde archivo local
-            # Cargar desde archivo local
-            gif = Image.open(self.worm_gif_url)
-            frames = []
+            # Frames compartidos por todos los gusanos (se decodifican solo una vez)
+            # Fondo blanco transparente y escalado según el factor de escalado
+            scale = getattr(self, 'scale_factor', 1.0)
+            frames = load_gif_frames(self.worm_gif_url, scale=scale, colorkey=(255, 255, 255))
             
-            # Extraer todos los frames del GIF
-            for frame_num in range(gif.n_frames):
-                gif.seek(frame_num)
-                frame = gif.copy().convert("RGBA")
-                
-                # Convertir PIL image a superficie de Pygame
-                frame_data = frame.tobytes()
-                pygame_surface = pygame.image.fromstring(frame_data, frame.size, "RGBA")
-                
-                # Hacer transparente el fondo blanco
-                pygame_surface = pygame_surface.convert_alpha()
-                pygame_surface.set_colorkey((255, 255, 255))
-                
-                # Escalar el frame según el factor de escalado
-                if hasattr(self, 'scale_factor') and self.scale_factor != 1.0:
-                    original_size = pygame_surface.get_size()
-                    new_size = (int(original_size[0] * self.scale_factor), 
-                              int(original_size[1] * self.scale_factor))
-                    pygame_surface = pygame.transform.scale(pygame_surface, new_size)
-                
-                frames.append(pygame_surface)
-            
-            # Crear frames para diferentes direcciones
-            flipped_frames = []
-            for frame in frames:
-                # Voltear horizontalmente los frames para la dirección derecha
-                flipped_frame = pygame.transform.flip(frame, True, False)
-                flipped_frames.append(flipped_frame)
+            # Frames volteados horizontalmente para la dirección derecha
+            flipped_frames = load_gif_frames(self.worm_gif_url, scale=scale, flip=True,
+                                             colorkey=(255, 255, 255))
             
             self.animations = {
                 "up": frames,
@@ -109,6 +88,8 @@ class WormEnemy:
                 "right": flipped_frames, # Frames volteados para la derecha
                 "idle": [frames[0]] if frames else []  # Primer frame para estado idle
             }
+            # Todos los gusanos comparten el mismo atlas
+            self.atlas = pack_animations("Gusano", {"movimiento": self.animations})
             print(f"✅ Cargada animación del gusano: {len(frames)} frames")
             
         except Exception as e:
@@ -145,7 +126,13 @@ class WormEnemy:
         
         return nearest, min_distance
     
-    def update_ai(self, players):
+    def can_see(self, target, collision_manager=None):
+        """Indica si hay línea de visión hacia el objetivo (sin collision manager siempre la hay)"""
+        if collision_manager is None or target is None:
+            return True
+        return collision_manager.has_line_of_sight((self.x + 32, self.y + 32), (target.x + 32, target.y + 32))
+    
+    def update_ai(self, players, collision_manager=None):
         """Actualiza la inteligencia artificial del gusano"""
         if not self.alive:
             return
@@ -154,7 +141,8 @@ class WormEnemy:
         
         # Máquina de estados de IA
         if self.state == "patrol":
-            if distance < self.detection_range:
+            # Solo detecta jugadores que no estén detrás de una pared
+            if distance < self.detection_range and self.can_see(nearest_player, collision_manager):
                 self.state = "chase"
                 self.target = nearest_player
                 print(f"🐛 Gusano detectó jugador a {distance:.1f} unidades")
@@ -349,13 +337,13 @@ class WormEnemy:
         self.pending_drops = []
         return drops
     
-    def update(self, players):
+    def update(self, players, collision_manager=None):
         """Actualiza el gusano"""
         if not self.alive:
             return
         
         # Actualizar IA
-        self.update_ai(players)
+        self.update_ai(players, collision_manager)
         
         # Detectar si se está moviendo
         prev_moving = self.moving
@@ -429,7 +417,7 @@ class WormEnemy:
                 segment_y = screen_y
                 segment_color = tuple(max(0, c - i * 20) for c in color)
                 
-                pygame.draw.circle(screen, segment_color, 
+                canvas_draw.circle(screen, segment_color, 
                                  (segment_x, segment_y + segment_size), segment_size - i * 2)
         
         # Dibujar barra de vida
@@ -440,12 +428,12 @@ class WormEnemy:
             bar_y = screen_y - 10
             
             # Fondo de la barra
-            pygame.draw.rect(screen, (100, 0, 0), 
+            canvas_draw.rect(screen, (100, 0, 0), 
                            (bar_x, bar_y, bar_width, bar_height))
             
             # Vida actual
             health_width = int((self.health / self.max_health) * bar_width)
-            pygame.draw.rect(screen, (0, 255, 0), 
+            canvas_draw.rect(screen, (0, 255, 0), 
                            (bar_x, bar_y, health_width, bar_height))
         
         # Indicador de estado eliminado para mejor apariencia visual
@@ -524,13 +512,7 @@ class WormSpawner:
             # Verificar que no esté bloqueado por bloques de colisión
             if collision_manager:
                 worm_rect = pygame.Rect(spawn_x - 40, spawn_y - 40, 83, 83)  # Área del gusano
-                collision_found = False
-                for block in collision_manager.blocks:
-                    if worm_rect.colliderect(block.rect):
-                        collision_found = True
-                        break
-                
-                if collision_found:
+                if collision_manager.check_collision(worm_rect):
                     continue  # Intentar otra posición
             
             # Verificar que no esté muy cerca de otros gusanos
@@ -564,12 +546,26 @@ class WormSpawner:
         # Intentar generar nuevos gusanos gradualmente
         self.spawn_worm(players, collision_manager)
         
-        # Actualizar gusanos existentes
-        for worm in self.worms[:]:
-            if worm.alive:
-                worm.update(players)
-            else:
-                self.worms.remove(worm)
+        # Actualizar gusanos existentes (los muertos se descartan)
+        self.worms = [worm for worm in self.worms if worm.alive]
+        start_positions = [(worm.x, worm.y) for worm in self.worms]
+        for worm in self.worms:
+            worm.update(players, collision_manager)
+        
+        # Resolver colisiones de todos los gusanos contra el mapa en una sola pasada
+        if collision_manager is not None and self.worms:
+            self.resolve_collisions(start_positions, collision_manager)
+    
+    def resolve_collisions(self, start_positions, collision_manager):
+        """Ajusta el movimiento de este tick de todos los gusanos contra los bloques de colisión"""
+        velocities = [(worm.x - x, worm.y - y) for worm, (x, y) in zip(self.worms, start_positions)]
+        resolved, hits = collision_manager.move_aabbs(start_positions, (83, 83), velocities)  # 64 * 1.3 = 83
+        for worm, (x, y), (hit_x, hit_y) in zip(self.worms, resolved, hits):
+            worm.x, worm.y = float(x), float(y)
+            if hit_x:
+                worm.vel_x = 0
+            if hit_y:
+                worm.vel_y = 0
     
     def draw(self, screen, camera_x, camera_y):
         """Dibuja todos los gusanos"""